@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Historical backfill for SF6 Analysis project
+Re-runs the spiders' parsing stages over archived pages in a process pool, with no browser or network
+"""
+
+import argparse
+import csv
+import glob
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from fixtures import ARCHIVE_DIRNAME, FixtureStore
+from row_sink import clean_month_label
+
+DATASETS = ('fighting_stats', 'usage_stats')
+
+# Spider instances reused by every job in one worker process
+_worker_spiders = {}
+
+
+def _init_worker():
+    # Per-page parser logging would dominate the run
+    logging.disable(logging.INFO)
+
+
+def _spider(dataset):
+    if dataset not in _worker_spiders:
+        if dataset == 'fighting_stats':
+            from spiders.fighting_stats_spider import FightingStatsSpider
+            _worker_spiders[dataset] = FightingStatsSpider()
+        else:
+            from spiders.street_fighter_spider import StreetFighterSpider
+            _worker_spiders[dataset] = StreetFighterSpider()
+    return _worker_spiders[dataset]
+
+
+def parse_archived_page(job):
+    """Parse one archived page the way the spider that captured it would; returns its rows"""
+    page_source = FixtureStore.load(job['path'])
+
+    spider = _spider(job['dataset'])
+    if job['dataset'] == 'fighting_stats':
+        return spider.extract_table_data_html(page_source, job['month'], job['league'])
+
+    from scrapy.http import HtmlResponse
+    from spiders.next_data import load_next_data, parse_usage_payload
+    response = HtmlResponse(url=job.get('url') or spider.stats_url, body=page_source.encode('utf-8'), encoding='utf-8')
+    rows = spider.parse_usage_response(response, job['month'])
+    return rows or parse_usage_payload(load_next_data(response), job['month'])
+
+
+def find_archived_runs(base_output_dir):
+    """Timestamped output folders holding a page archive, oldest first"""
+    index_paths = glob.glob(os.path.join(base_output_dir, 'master_data*', ARCHIVE_DIRNAME, 'index.json'))
+    runs = [os.path.dirname(os.path.dirname(path)) for path in index_paths]
+    return sorted(runs, key=os.path.getmtime)
+
+
+def month_csv_path(output_dir, file_prefix, month):
+    return os.path.join(output_dir, f"{file_prefix}_{clean_month_label(month)}.csv")
+
+
+def combined_csv_path(output_dir, file_prefix):
+    return os.path.join(output_dir, f"{file_prefix}_all_months.csv")
+
+
+def read_carried_over_rows(dataset, combined_path, reparsed_months):
+    """Rows of months a run carried over from earlier runs, which the archive doesn't cover
+
+    They come from the run's combined CSV, or from the manifest's files when the run wrote none
+    (as StreamingRowSink.commit does when nothing changed).
+    """
+    if os.path.exists(combined_path):
+        with open(combined_path, 'r', newline='', encoding='utf-8') as f:
+            return [row for row in csv.DictReader(f) if row.get('month') not in reparsed_months]
+    from manifest import get_manifest
+    return list(get_manifest().iter_previous_rows(dataset, reparsed_months))
+
+
+def write_dataset_csvs(output_dir, file_prefix, fieldnames, rows, carried_over=()):
+    """Write per-month and combined CSVs in the spiders' layout, replacing files atomically
+
+    carried_over rows are appended to the combined file only.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    by_month = defaultdict(list)
+    for row in rows:
+        by_month[row.get('month', 'unknown')].append(row)
+
+    outputs = [(month_csv_path(output_dir, file_prefix, month), month_rows) for month, month_rows in by_month.items()]
+    outputs.append((combined_csv_path(output_dir, file_prefix), list(rows) + list(carried_over)))
+
+    for path, path_rows in outputs:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='raise')
+            writer.writeheader()
+            writer.writerows(path_rows)
+        os.replace(tmp_path, path)
+    return [path for path, _ in outputs]
+
+
+def rerecord_manifest(dataset, output_dir, file_prefix, league_field, rows):
+    """Update the manifest hashes of partitions whose recorded file was just rewritten in place
+
+    Partitions the manifest attributes to another run's files are left alone.
+    """
+    from manifest import get_manifest
+    manifest = get_manifest()
+    partitions = defaultdict(list)
+    for row in rows:
+        partitions[(row.get('month', 'unknown'), str(row.get(league_field)))].append(row)
+
+    updated = 0
+    for (month, league), partition_rows in partitions.items():
+        entry = manifest.get(dataset, month, league)
+        path = month_csv_path(output_dir, file_prefix, month)
+        if entry and os.path.abspath(entry['path']) == os.path.abspath(path):
+            manifest.record(dataset, month, league, partition_rows, entry['path'])
+            updated += 1
+    manifest.save()
+    logging.info(f"Re-recorded {updated} {dataset} partitions in the manifest")
+
+
+def backfill_run(run_dir, datasets, executor, workers, in_place=False):
+    """Reparse every archived page of one run and write its CSVs; returns (pages, rows)"""
+    from config_manager import get_config
+    from spiders.fighting_stats_spider import FIGHTING_STATS_FIELDS
+    from spiders.street_fighter_spider import USAGE_STATS_FIELDS
+    fields = {'fighting_stats': FIGHTING_STATS_FIELDS, 'usage_stats': USAGE_STATS_FIELDS}
+    league_fields = {'fighting_stats': 'league', 'usage_stats': 'rank_name'}
+    default_prefixes = {'fighting_stats': 'fighting_stats', 'usage_stats': 'master_usage_stats'}
+    file_prefixes = get_config().get('output', 'file_prefix', {})
+
+    store = FixtureStore(os.path.join(run_dir, ARCHIVE_DIRNAME))
+    output_dir = run_dir if in_place else os.path.join(run_dir, 'reprocessed')
+    total_pages = total_rows = 0
+
+    for dataset in datasets:
+        jobs = store.fixtures(dataset)
+        if not jobs:
+            continue
+        rows = []
+        chunksize = max(1, len(jobs) // (workers * 4))
+        for page_rows in executor.map(parse_archived_page, jobs, chunksize=chunksize):
+            rows.extend(page_rows)
+
+        file_prefix = file_prefixes.get(dataset, default_prefixes[dataset])
+        # In place, the combined file keeps months the run carried over and the manifest follows the new content
+        carried_over = []
+        if in_place:
+            reparsed_months = {row.get('month', 'unknown') for row in rows}
+            carried_over = read_carried_over_rows(dataset, combined_csv_path(output_dir, file_prefix), reparsed_months)
+            logging.info(f"{run_dir}: keeping {len(carried_over)} carried-over {dataset} rows in the combined file")
+        write_dataset_csvs(output_dir, file_prefix, fields[dataset], rows, carried_over=carried_over)
+        if in_place:
+            rerecord_manifest(dataset, output_dir, file_prefix, league_fields[dataset], rows)
+        logging.info(f"{run_dir}: reparsed {len(jobs)} {dataset} pages into {len(rows)} rows in {output_dir}")
+        total_pages += len(jobs)
+        total_rows += len(rows)
+    return total_pages, total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprocess archived pages into CSVs without a browser")
+    parser.add_argument('runs', nargs='*', help="Timestamped output folders (default: every folder with a page archive)")
+    parser.add_argument('--dataset', choices=DATASETS, action='append', help="Only reprocess this dataset (repeatable)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Parser processes")
+    parser.add_argument('--in-place', action='store_true', help="Replace the run's CSVs and update their manifest entries instead of writing to <run>/reprocessed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from config_manager import get_config
+    runs = args.runs or find_archived_runs(get_config().get_output_dir())
+    if not runs:
+        logging.error("No archived pages found; enable the 'archive' config section (or SF6_ARCHIVE_PAGES=1) when scraping")
+        return 1
+
+    start = time.perf_counter()
+    total_pages = total_rows = 0
+    workers = max(1, args.workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for run_dir in runs:
+            pages, rows = backfill_run(run_dir, args.dataset or DATASETS, executor, workers, in_place=args.in_place)
+            total_pages += pages
+            total_rows += rows
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Backfill finished: {total_pages} pages, {total_rows} rows from {len(runs)} runs in {elapsed:.1f}s "
+                 f"({total_pages / elapsed:.0f} pages/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Offline parser benchmark for SF6 Analysis project
+Replays recorded page fixtures through the spiders' parsers and compares against a stored baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class StageTimer:
+    """Collects wall-clock samples per named stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+
+    def total(self, names):
+        return sum(sum(self.samples[name]) for name in names)
+
+    def summary(self):
+        return {
+            name: {
+                'calls': len(samples),
+                'mean_ms': round(statistics.mean(samples) * 1000, 3),
+                'p50_ms': round(percentile(samples, 50) * 1000, 3),
+                'p95_ms': round(percentile(samples, 95) * 1000, 3),
+                'total_s': round(sum(samples), 4)
+            }
+            for name, samples in sorted(self.samples.items())
+        }
+
+
+def run_usage_stats(store, fixtures, timer):
+    """Replay usage stats pages through scrape_current_month_data and parse_character_ranking_data"""
+    from scrapy.http import HtmlResponse
+    from fixtures import ReplayDriver
+    from spiders.street_fighter_spider import StreetFighterSpider
+
+    spider = StreetFighterSpider()
+    rows = 0
+    for fixture in fixtures:
+        with timer.stage('load'):
+            page_source = store.load(fixture['path'])
+
+        spider.driver = ReplayDriver(page_source, fixture.get('url') or spider.stats_url)
+        with timer.stage('usage_scrape'):
+            month_rows = spider.scrape_current_month_data(fixture['month'])
+        rows += len(month_rows)
+
+        # The row parser on its own, fed with pre-selected li elements
+        response = HtmlResponse(url=spider.stats_url, body=page_source.encode('utf-8'), encoding='utf-8')
+        for div_num in range(1, 5):
+            character_lis = response.xpath(spider.usage_list_xpath.format(div_num=div_num))
+            with timer.stage('usage_rank_parse'):
+                spider.parse_character_ranking_data(character_lis, div_index=div_num, month=fixture['month'])
+    return rows
+
+
+def run_fighting_stats(store, fixtures, timer):
+    """Replay fighting stats pages through the offline table extraction"""
+    from spiders.fighting_stats_spider import FightingStatsSpider, table_grid_from_html
+
+    spider = FightingStatsSpider()
+    rows = 0
+    for fixture in fixtures:
+        with timer.stage('load'):
+            page_source = store.load(fixture['path'])
+        with timer.stage('fighting_grid'):
+            grid = table_grid_from_html(page_source, spider.table_xpath)
+        with timer.stage('fighting_rows'):
+            league_rows = spider.parse_table_grid(grid, fixture['month'], fixture['league'])
+        rows += len(league_rows)
+    return rows
+
+
+DATASETS = {
+    'usage_stats': (run_usage_stats, ['usage_scrape']),
+    'fighting_stats': (run_fighting_stats, ['fighting_grid', 'fighting_rows']),
+}
+
+
+def run_benchmark(store, repeat):
+    """Run every dataset with fixtures `repeat` times, then once more under tracemalloc"""
+    timer = StageTimer()
+    result = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'repeat': repeat,
+        'datasets': {},
+    }
+
+    for dataset, (runner, parse_stages) in DATASETS.items():
+        fixtures = store.fixtures(dataset)
+        if not fixtures:
+            logging.warning(f"No {dataset} fixtures in {store.root}, skipping")
+            continue
+
+        dataset_timer = StageTimer()
+        rows = 0
+        for _ in range(repeat):
+            rows = runner(store, fixtures, dataset_timer)
+        for name, samples in dataset_timer.samples.items():
+            timer.samples[name].extend(samples)
+
+        # Memory is measured in its own pass because tracemalloc slows everything down
+        tracemalloc.start()
+        runner(store, fixtures, StageTimer())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        seconds = dataset_timer.total(parse_stages)
+        result['datasets'][dataset] = {
+            'fixtures': len(fixtures),
+            'rows': rows,
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(rows * repeat / seconds, 1) if seconds else None,
+            'peak_memory_kb': round(peak / 1024, 1)
+        }
+
+    result['stages'] = timer.summary()
+    return result
+
+
+def compare(result, baseline, tolerance):
+    """List metrics that got worse than the baseline by more than tolerance (a fraction)"""
+    regressions = []
+
+    def check(label, current, previous, higher_is_better):
+        if current is None or not previous:
+            return
+        change = (current - previous) / previous
+        worse = change < -tolerance if higher_is_better else change > tolerance
+        print(f"  {label:<40} {previous:>12} -> {current:>12} ({change:+.1%}){'  REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(label)
+
+    print(f"Comparison with baseline from {baseline.get('created_at', 'unknown')} (tolerance {tolerance:.0%}):")
+    for dataset, stats in result['datasets'].items():
+        previous = baseline.get('datasets', {}).get(dataset, {})
+        check(f"{dataset} rows/sec", stats['rows_per_sec'], previous.get('rows_per_sec'), True)
+        check(f"{dataset} peak memory KB", stats['peak_memory_kb'], previous.get('peak_memory_kb'), False)
+    for stage, stats in result['stages'].items():
+        previous = baseline.get('stages', {}).get(stage, {})
+        check(f"{stage} mean ms", stats['mean_ms'], previous.get('mean_ms'), False)
+    return regressions
+
+
+def print_report(result):
+    for dataset, stats in result['datasets'].items():
+        print(f"{dataset}: {stats['rows']} rows from {stats['fixtures']} fixtures, "
+              f"{stats['rows_per_sec']} rows/sec, peak {stats['peak_memory_kb']} KB")
+    print(f"  {'stage':<20} {'calls':>7} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:<20} {stats['calls']:>7} {stats['mean_ms']:>10} {stats['p50_ms']:>10} {stats['p95_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SF6 parsers against recorded page fixtures")
+    parser.add_argument('--fixtures-dir', help="Fixture directory (default: fixtures.directory from config)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes over every fixture")
+    parser.add_argument('--baseline', help="Baseline JSON (default: <fixtures-dir>/benchmark_baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression")
+    parser.add_argument('--output', help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    from config_manager import get_config
+    from fixtures import FixtureStore, get_fixture_store
+    config = get_config()
+    # Replaying must never re-record the fixtures it reads
+    config.config.setdefault('fixtures', {})['record'] = False
+    store = FixtureStore(args.fixtures_dir) if args.fixtures_dir else get_fixture_store()
+    baseline_path = args.baseline or os.path.join(store.root, 'benchmark_baseline.json')
+
+    # Parser logging would dominate the timings
+    logging.disable(logging.INFO)
+    result = run_benchmark(store, max(1, args.repeat))
+    logging.disable(logging.NOTSET)
+
+    if not result['datasets']:
+        print(f"No fixtures found in {store.root}; record some with fixtures.record=true (or SF6_RECORD_FIXTURES=1)")
+        return 1
+
+    print_report(result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    regressions = []
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+    else:
+        print(f"No baseline at {baseline_path}")
+
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved baseline to {baseline_path}")
+
+    if regressions:
+        print(f"{len(regressions)} metrics regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
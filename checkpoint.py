@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Checkpoint and resume support for SF6 scrape runs
+Records completed scrape units and streamed file sizes in the timestamped output directory
+"""
+
+import glob
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class RunCheckpoint:
+    """Completed units (e.g. 'MM/YYYY|League') and file sizes for one dataset's run
+
+    File sizes let a resumed run truncate partial CSVs back to the last completed unit,
+    so rows from a unit that was interrupted mid-write are never duplicated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.units = {}
+        self.file_sizes = {}
+        self.month_counts = {}
+        self.partitions = {}
+        self._load()
+
+    @staticmethod
+    def path_for(output_dir: str, dataset: str) -> str:
+        return os.path.join(output_dir, f"checkpoint_{dataset}.json")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.units = data.get('units', {})
+            self.file_sizes = data.get('file_sizes', {})
+            self.month_counts = data.get('month_counts', {})
+            self.partitions = data.get('partitions', {})
+            logging.info(f"Loaded checkpoint {self.path}: {len(self.units)} completed units")
+        except Exception as e:
+            logging.warning(f"Could not load checkpoint {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the checkpoint atomically"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+                'units': self.units,
+                'file_sizes': self.file_sizes,
+                'month_counts': self.month_counts,
+                'partitions': self.partitions
+            }, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, unit_key: str) -> bool:
+        return unit_key in self.units
+
+    def mark_done(self, unit_key: str, row_count: int, file_sizes: Dict[str, int], month_counts: Dict[str, int],
+                  partitions: Dict[str, str] = None) -> None:
+        """Record a completed unit together with the current size of every streamed file"""
+        self.units[unit_key] = row_count
+        self.file_sizes.update(file_sizes)
+        self.month_counts = dict(month_counts)
+        if partitions is not None:
+            self.partitions = dict(partitions)
+        self.save()
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the run has been committed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def find_resumable_dir(dataset: str) -> Optional[str]:
+    """Find the most recently updated timestamped output directory holding a checkpoint for dataset"""
+    from config_manager import get_config
+    base_output_dir = get_config().get_output_dir()
+    candidates = glob.glob(os.path.join(base_output_dir, 'master_data*', f"checkpoint_{dataset}.json"))
+    if not candidates:
+        return None
+    latest = max(candidates, key=os.path.getmtime)
+    return os.path.dirname(latest)
+
+
+def load_checkpoint(dataset: str, resume: bool) -> Dict[str, Any]:
+    """Get the output directory and checkpoint for a run, resuming the latest one if asked
+
+    Returns {'output_dir': ..., 'checkpoint': RunCheckpoint, 'resumed': bool}.
+    """
+    from config_manager import get_config
+    output_dir = None
+    if resume:
+        output_dir = find_resumable_dir(dataset)
+        if output_dir:
+            logging.info(f"Resuming {dataset} run in {output_dir}")
+        else:
+            logging.info(f"No {dataset} checkpoint found, starting a fresh run")
+
+    resumed = output_dir is not None
+    output_dir = output_dir or get_config().get_timestamped_output_dir()
+    checkpoint_path = RunCheckpoint.path_for(output_dir, dataset)
+    if not resumed and os.path.exists(checkpoint_path):
+        # A fresh run replaces whatever an earlier interrupted run left behind
+        os.remove(checkpoint_path)
+    return {'output_dir': output_dir, 'checkpoint': RunCheckpoint(checkpoint_path), 'resumed': resumed}
@@ -15,15 +15,14 @@ COMMON_SPIDER_SETTINGS = {
         'spiders.middlewares.RetryChangeProxyMiddleware': 540,
         'spiders.middlewares.RandomUserAgentMiddleware': 400,
         'scrapy.downloadermiddlewares.httpcache.HttpCacheMiddleware': 300,
+        'spiders.middlewares.RateControlMiddleware': 350,  # After the cache, so cache hits aren't paced
     },
     'HTTPCACHE_ENABLED': True,
-    'HTTPCACHE_EXPIRATION_SECS': 0,  # Set to 0 to never expire
-    'HTTPCACHE_DIR': 'httpcache',
-    'HTTPCACHE_IGNORE_HTTP_CODES': [],  # HTTP codes not to cache
-    'HTTPCACHE_STORAGE': 'scrapy.extensions.httpcache.FilesystemCacheStorage',
-    'DOWNLOAD_DELAY': 1.0,  # Increased delay for more respectful scraping
+    'HTTPCACHE_POLICY': 'spiders.http_cache.MonthAwareCachePolicy',  # Expiry per month URL (http_cache in config.json)
+    'HTTPCACHE_STORAGE': 'spiders.http_cache.SqliteCacheStorage',  # Compressed, size-bounded single file
+    'DOWNLOAD_DELAY': 0,  # Pacing is done per host by RateControlMiddleware (rate_limit in config.json)
     'CONCURRENT_REQUESTS': 1,  # Single request for stats page
-    'AUTOTHROTTLE_ENABLED': True,  # Enable AutoThrottle to automatically adjust concurrency and delay
+    'AUTOTHROTTLE_ENABLED': False,  # Replaced by RateControlMiddleware, which also backs off on 429/403
     'AUTOTHROTTLE_START_DELAY': 1.0,  # Increased initial download delay
     'AUTOTHROTTLE_MAX_DELAY': 60,  # The maximum download delay to be set in case of high latencies
     'AUTOTHROTTLE_TARGET_CONCURRENCY': 1.0,  # Single concurrent request to each remote server
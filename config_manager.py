@@ -58,10 +58,12 @@ class ConfigManager:
                 "base_delay": 1.0,
                 "max_delay": 3.0,
                 "concurrent_requests": 1,
+                "fetch_mode": "selenium",
                 "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0"
             },
             "output": {
                 "data_directory": "./output",
+                "backends": ["csv"],
                 "file_prefix": {
                     "fighting_stats": "fighting_stats",
                     "usage_stats": "master_usage_stats"
@@ -71,7 +73,86 @@ class ConfigManager:
                 "window_width": 1920,
                 "window_height": 1080,
                 "page_load_timeout": 20,
-                "element_wait_timeout": 10
+                "element_wait_timeout": 10,
+                "content_change_timeout": 10,
+                "option_change_timeout": 3,
+                "poll_interval": 0.25,
+                "stable_checks": 2,
+                "reuse_sessions": True,
+                "max_idle_drivers": 2
+            },
+            "browser_profile": {
+                "lean": True,
+                "headless": True,
+                "block_images": True,
+                "block_media": True,
+                "block_fonts": True,
+                "tracking_protection": True,
+                "blocked_hosts": [
+                    "google-analytics.com",
+                    "googletagmanager.com",
+                    "doubleclick.net",
+                    "facebook.net",
+                    "analytics.twitter.com",
+                    "bat.bing.com",
+                    "hotjar.com",
+                    "clarity.ms"
+                ],
+                "cache": True,
+                "page_load_strategy": "eager"
+            },
+            "scraping": {
+                "table_extraction": "script"
+            },
+            "incremental": {
+                "enabled": True,
+                "reverify_days": 0,
+                "skip_unchanged": True,
+                "on_change_command": ""
+            },
+            "fixtures": {
+                "record": False,
+                "directory": "./fixtures"
+            },
+            "archive": {
+                "enabled": False
+            },
+            "timeseries": {
+                "enabled": False
+            },
+            "scheduler": {
+                "mode": "second_friday",
+                "poll_minutes": 60,
+                "max_days_between_exports": 35
+            },
+            "metrics": {
+                "enabled": False,
+                "port": 0
+            },
+            "rate_limit": {
+                "initial_rate": 1.0,
+                "min_rate": 0.05,
+                "max_rate": 5.0,
+                "burst": 1,
+                "increase_step": 0.1,
+                "decrease_factor": 0.5,
+                "target_latency": 2.0,
+                "browser_target_latency": 10.0
+            },
+            "http_cache": {
+                "path": "./httpcache/sf6_page_cache.sqlite",
+                "max_size_mb": 256,
+                "mutable_months": 2,
+                "current_month_ttl": 3600,
+                "index_ttl": 600,
+                "past_month_ttl": 0,
+                "refresh": False,
+                "cache_rendered_pages": True
+            },
+            "worker_pool": {
+                "workers": 1,
+                "per_host_limit": 2,
+                "headless": True
             },
             "urls": {
                 "fighting_stats_base": "https://www.streetfighter.com/6/buckler/stats/dia_master",
@@ -87,7 +168,23 @@ class ConfigManager:
             'SF6_MAX_DELAY': ('spider_settings', 'max_delay'),
             'SF6_WINDOW_WIDTH': ('selenium', 'window_width'),
             'SF6_WINDOW_HEIGHT': ('selenium', 'window_height'),
-            'SF6_USER_AGENT': ('spider_settings', 'user_agent')
+            'SF6_USER_AGENT': ('spider_settings', 'user_agent'),
+            'SF6_WORKERS': ('worker_pool', 'workers'),
+            'SF6_FETCH_MODE': ('spider_settings', 'fetch_mode'),
+            'SF6_OUTPUT_BACKENDS': ('output', 'backends'),
+            'SF6_LEAN_BROWSER': ('browser_profile', 'lean'),
+            'SF6_HEADLESS': ('browser_profile', 'headless'),
+            'SF6_RECORD_FIXTURES': ('fixtures', 'record'),
+            'SF6_ARCHIVE_PAGES': ('archive', 'enabled'),
+            'SF6_TIMESERIES': ('timeseries', 'enabled'),
+            'SF6_SCHEDULER_MODE': ('scheduler', 'mode'),
+            'SF6_METRICS': ('metrics', 'enabled'),
+            'SF6_METRICS_PORT': ('metrics', 'port'),
+            'SF6_MAX_RATE': ('rate_limit', 'max_rate'),
+            'SF6_HTTP_CACHE_PATH': ('http_cache', 'path'),
+            'SF6_HTTP_CACHE_REFRESH': ('http_cache', 'refresh'),
+            'SF6_FIGHTING_STATS_URL': ('urls', 'fighting_stats_base'),
+            'SF6_USAGE_STATS_URL': ('urls', 'usage_stats_base')
         }
         
         for env_var, (section, key) in env_mappings.items():
@@ -97,10 +194,12 @@ class ConfigManager:
                     config[section] = {}
                 # Try to convert to appropriate type
                 try:
-                    if key in ['base_delay', 'max_delay']:
+                    if key in ['base_delay', 'max_delay', 'max_rate']:
                         config[section][key] = float(value)
-                    elif key in ['window_width', 'window_height', 'concurrent_requests']:
+                    elif key in ['window_width', 'window_height', 'concurrent_requests', 'workers', 'port']:
                         config[section][key] = int(value)
+                    elif key in ['lean', 'headless', 'record', 'enabled', 'refresh']:
+                        config[section][key] = value.lower() in ('1', 'true', 'yes')
                     else:
                         config[section][key] = value
                 except ValueError:
@@ -118,6 +217,22 @@ class ConfigManager:
         os.makedirs(output_dir, exist_ok=True)
         return output_dir
     
+    def get_output_backends(self) -> List[str]:
+        """Get enabled output backends (CSV is always written; 'parquet', 'arrow' and 'sqlite' are optional)"""
+        backends = self.get('output', 'backends', ['csv'])
+        if isinstance(backends, str):
+            backends = [b.strip() for b in backends.split(',') if b.strip()]
+        return backends
+    
+    def get_columnar_output_dir(self) -> str:
+        """Get the persistent directory for partitioned Parquet/Arrow datasets (default: <output dir>/columnar)"""
+        return self.get('output', 'columnar_directory', os.path.join(self.get_output_dir(), 'columnar'))
+    
+    def get_sqlite_output_path(self) -> str:
+        """Get the persistent SQLite database written by the 'sqlite' output backend"""
+        base_output_dir = self.get('output', 'data_directory', './output')
+        return self.get('output', 'sqlite_path', os.path.join(base_output_dir, 'sf6_stats.sqlite'))
+    
     def get_timestamped_output_dir(self) -> str:
         """Get timestamped output directory with format master_dataDDMonYYYY"""
         now = datetime.now()
@@ -129,6 +244,146 @@ class ConfigManager:
         os.makedirs(timestamped_dir, exist_ok=True)
         return timestamped_dir
     
+    def get_wait_settings(self) -> Dict[str, float]:
+        """Get readiness wait ceilings (seconds) and polling settings"""
+        return {
+            'page_ready_timeout': float(self.get('selenium', 'page_load_timeout', 20)),
+            'element_wait_timeout': float(self.get('selenium', 'element_wait_timeout', 10)),
+            'content_change_timeout': float(self.get('selenium', 'content_change_timeout', 10)),
+            # A click on the option already shown changes nothing; no longer than the fixed sleep it replaced
+            'option_change_timeout': float(self.get('selenium', 'option_change_timeout', 3)),
+            'poll_interval': float(self.get('selenium', 'poll_interval', 0.25)),
+            'stable_checks': int(self.get('selenium', 'stable_checks', 2)),
+            # With the eager page-load strategy, a parsed DOM is enough; element waits cover the data
+            'document_ready_states': ('interactive', 'complete') if self.get_browser_profile()['page_load_strategy'] == 'eager' else ('complete',)
+        }
+    
+    def get_driver_settings(self) -> Dict[str, Any]:
+        """Get Firefox window size and warm session reuse settings"""
+        return {
+            'window_width': int(self.get('selenium', 'window_width', 1920)),
+            'window_height': int(self.get('selenium', 'window_height', 1080)),
+            'reuse_sessions': bool(self.get('selenium', 'reuse_sessions', True)),
+            'max_idle_drivers': int(self.get('selenium', 'max_idle_drivers', 2))
+        }
+    
+    def get_browser_profile(self) -> Dict[str, Any]:
+        """Get the Firefox profile settings; lean=False restores a full, headed browser"""
+        lean = bool(self.get('browser_profile', 'lean', True))
+        return {
+            'lean': lean,
+            'headless': lean and bool(self.get('browser_profile', 'headless', True)),
+            'block_images': lean and bool(self.get('browser_profile', 'block_images', True)),
+            'block_media': lean and bool(self.get('browser_profile', 'block_media', True)),
+            'block_fonts': lean and bool(self.get('browser_profile', 'block_fonts', True)),
+            'tracking_protection': lean and bool(self.get('browser_profile', 'tracking_protection', True)),
+            'blocked_hosts': self.get('browser_profile', 'blocked_hosts',
+                                      self._get_default_config()['browser_profile']['blocked_hosts']) if lean else [],
+            'cache': bool(self.get('browser_profile', 'cache', True)),
+            'page_load_strategy': self.get('browser_profile', 'page_load_strategy', 'eager') if lean else 'normal'
+        }
+    
+    def get_urls(self) -> Dict[str, str]:
+        """Get the stats page base URLs (point them at stub_server.py for offline load tests)"""
+        return {
+            'fighting_stats_base': self.get('urls', 'fighting_stats_base', 'https://www.streetfighter.com/6/buckler/stats/dia_master'),
+            'usage_stats_base': self.get('urls', 'usage_stats_base', 'https://www.streetfighter.com/6/buckler/stats/usagerate_master')
+        }
+    
+    def get_fetch_mode(self) -> str:
+        """Get usage stats fetch mode ('selenium' or 'http' with Selenium fallback)"""
+        return self.get('spider_settings', 'fetch_mode', 'selenium')
+    
+    def get_worker_pool_settings(self) -> Dict[str, Any]:
+        """Get browser worker pool settings (workers=1 means serial scraping)"""
+        return {
+            'workers': int(self.get('worker_pool', 'workers', 1)),
+            'per_host_limit': int(self.get('worker_pool', 'per_host_limit', 2)),
+            'headless': bool(self.get('worker_pool', 'headless', True))
+        }
+    
+    def get_rate_limit_settings(self) -> Dict[str, float]:
+        """Get adaptive rate limiter settings (rates in requests/second per host, latencies in seconds)"""
+        return {
+            'initial_rate': float(self.get('rate_limit', 'initial_rate', 1.0)),
+            'min_rate': float(self.get('rate_limit', 'min_rate', 0.05)),
+            'max_rate': float(self.get('rate_limit', 'max_rate', 5.0)),
+            'burst': float(self.get('rate_limit', 'burst', 1)),
+            'increase_step': float(self.get('rate_limit', 'increase_step', 0.1)),
+            'decrease_factor': float(self.get('rate_limit', 'decrease_factor', 0.5)),
+            'target_latency': float(self.get('rate_limit', 'target_latency', 2.0)),
+            'browser_target_latency': float(self.get('rate_limit', 'browser_target_latency', 10.0))
+        }
+    
+    def get_http_cache_settings(self) -> Dict[str, Any]:
+        """Get page cache settings (TTLs in seconds; past_month_ttl=0 keeps finished months forever)
+
+        The last mutable_months calendar months count as still changing and use current_month_ttl.
+        refresh=True refetches those and the index pages regardless of their TTLs.
+        """
+        return {
+            'path': self.get('http_cache', 'path', './httpcache/sf6_page_cache.sqlite'),
+            'max_size_mb': float(self.get('http_cache', 'max_size_mb', 256)),
+            'mutable_months': int(self.get('http_cache', 'mutable_months', 2)),
+            'current_month_ttl': float(self.get('http_cache', 'current_month_ttl', 3600)),
+            'index_ttl': float(self.get('http_cache', 'index_ttl', 600)),
+            'past_month_ttl': float(self.get('http_cache', 'past_month_ttl', 0)),
+            'refresh': bool(self.get('http_cache', 'refresh', False)),
+            'cache_rendered_pages': bool(self.get('http_cache', 'cache_rendered_pages', True))
+        }
+    
+    def get_fixture_settings(self) -> Dict[str, Any]:
+        """Get page fixture recording settings (record=True captures rendered pages while scraping)"""
+        return {
+            'record': bool(self.get('fixtures', 'record', False)),
+            'directory': self.get('fixtures', 'directory', './fixtures')
+        }
+    
+    def get_archive_settings(self) -> Dict[str, Any]:
+        """Get page archive settings (enabled=True keeps compressed parsed pages next to the CSVs)"""
+        return {
+            'enabled': bool(self.get('archive', 'enabled', False))
+        }
+    
+    def get_timeseries_settings(self) -> Dict[str, Any]:
+        """Get the consolidated, versioned SQLite store settings"""
+        base_output_dir = self.get('output', 'data_directory', './output')
+        return {
+            'enabled': bool(self.get('timeseries', 'enabled', False)),
+            'path': self.get('timeseries', 'path', os.path.join(base_output_dir, 'sf6_timeseries.sqlite'))
+        }
+    
+    def get_scheduler_settings(self) -> Dict[str, Any]:
+        """Get scheduler settings ('second_friday' fires monthly, 'poll' probes for new data every poll_minutes)"""
+        base_output_dir = self.get('output', 'data_directory', './output')
+        return {
+            'mode': self.get('scheduler', 'mode', 'second_friday'),
+            'poll_minutes': int(self.get('scheduler', 'poll_minutes', 60)),
+            'max_days_between_exports': float(self.get('scheduler', 'max_days_between_exports', 35)),
+            'state_file': self.get('scheduler', 'state_file', os.path.join(base_output_dir, 'scheduler_state.json'))
+        }
+    
+    def get_metrics_settings(self) -> Dict[str, Any]:
+        """Get Prometheus exporter settings (port=0 writes textfiles only)"""
+        base_output_dir = self.get('output', 'data_directory', './output')
+        return {
+            'enabled': bool(self.get('metrics', 'enabled', False)),
+            'textfile_directory': self.get('metrics', 'textfile_directory', os.path.join(base_output_dir, 'metrics')),
+            'port': int(self.get('metrics', 'port', 0))
+        }
+    
+    def get_incremental_settings(self) -> Dict[str, Any]:
+        """Get incremental scraping settings (reverify_days=0 never re-checks final months)
+
+        on_change_command runs after a scheduled export only when some partition changed.
+        """
+        return {
+            'enabled': bool(self.get('incremental', 'enabled', True)),
+            'reverify_days': int(self.get('incremental', 'reverify_days', 0)),
+            'skip_unchanged': bool(self.get('incremental', 'skip_unchanged', True)),
+            'on_change_command': self.get('incremental', 'on_change_command', '')
+        }
+    
     def get_months_to_scrape(self) -> List[Tuple[str, str]]:
         """Get list of months to scrape"""
         months_config = self.get('scraping', 'months_to_scrape')
@@ -144,6 +399,10 @@ class ConfigManager:
             ("202506", "062025")
         ]
     
+    def get_table_extraction_mode(self) -> str:
+        """Get fighting stats table extraction mode ('script' or 'two_pass')"""
+        return self.get('scraping', 'table_extraction', 'script')
+    
     def get_leagues_to_scrape(self) -> List[Tuple[int, str]]:
         """Get list of leagues to scrape"""
         leagues_config = self.get('scraping', 'leagues')
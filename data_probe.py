@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+New-data probe for SF6 Analysis project
+Cheaply checks which month the site publishes last and whether its data changed, with persistent scheduler state
+"""
+
+import json
+import logging
+import os
+import sys
+import urllib.request
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class SchedulerState:
+    """Last probe result and last completed export, persisted as JSON between scheduler restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Could not load scheduler state {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def record_probe(self, probe: Dict[str, Any]) -> None:
+        self.data['last_probe'] = {**probe, 'probed_at': datetime.now().isoformat(timespec='seconds')}
+        self.save()
+
+    def record_export(self, probe: Optional[Dict[str, Any]]) -> None:
+        """Remember the probe an export was triggered by, so the same data doesn't trigger it again"""
+        self.data['last_export_at'] = datetime.now().isoformat(timespec='seconds')
+        if probe:
+            self.data['exported_month'] = probe.get('month_code')
+            self.data['exported_hash'] = probe.get('content_hash')
+        self.save()
+
+    def days_since_export(self) -> Optional[float]:
+        last_export = self.get('last_export_at')
+        if not last_export:
+            return None
+        return (datetime.now() - datetime.fromisoformat(last_export)).total_seconds() / 86400
+
+    def export_reason(self, probe: Optional[Dict[str, Any]], max_days_between_exports: float) -> Optional[str]:
+        """Why an export is due ('new_month', 'changed', 'catch_up', 'first_run'), or None"""
+        days = self.days_since_export()
+        if days is None:
+            return 'first_run'
+        if probe:
+            if probe['month_code'] > (self.get('exported_month') or ''):
+                return 'new_month'
+            if probe.get('content_hash') and probe['content_hash'] != self.get('exported_hash'):
+                return 'changed'
+        # Missed or failed runs are caught up once the newest data is older than expected
+        if max_days_between_exports and days >= max_days_between_exports:
+            return 'catch_up'
+        return None
+
+
+def _fetch(url: str, user_agent: str, timeout: float) -> bytes:
+    """GET url through the shared rate controller, so probes also back off when the site pushes back"""
+    import time
+    import urllib.error
+    from spiders.rate_controller import get_rate_controller
+    controller = get_rate_controller()
+    controller.acquire(url)
+    request = urllib.request.Request(url, headers={'User-Agent': user_agent})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+    except urllib.error.HTTPError as e:
+        controller.record(url, latency=time.perf_counter() - start, status=e.code)
+        raise
+    except OSError:
+        controller.record(url, error=True)
+        raise
+    controller.record(url, latency=time.perf_counter() - start, status=200)
+    return body
+
+
+def probe_http(timeout: float = 20) -> Optional[Dict[str, Any]]:
+    """Newest month and a content hash of its usage rates, from two plain HTTP requests (no browser)"""
+    from scrapy.http import HtmlResponse
+    from config_manager import get_config
+    from manifest import content_hash
+    from spiders.next_data import discover_months, load_next_data, parse_usage_payload
+
+    config = get_config()
+    index_url = config.get_urls()['usage_stats_base']
+    user_agent = config.get('spider_settings', 'user_agent', 'Mozilla/5.0')
+    index = HtmlResponse(url=index_url, body=_fetch(index_url, user_agent, timeout), encoding='utf-8')
+    months = discover_months(index)
+    if not months:
+        return None
+
+    month_id, month_display = months[0]
+    month_url = f"{index_url}/{month_id}"
+    page = HtmlResponse(url=month_url, body=_fetch(month_url, user_agent, timeout), encoding='utf-8')
+
+    from spiders.street_fighter_spider import StreetFighterSpider
+    spider = StreetFighterSpider()
+    rows = spider.parse_usage_response(page, month_display) or parse_usage_payload(load_next_data(page), month_display)
+    return {
+        'method': 'http',
+        'month_code': month_id,
+        'month': month_display,
+        'content_hash': content_hash(rows) if rows else None,
+        'rows': len(rows)
+    }
+
+
+def probe_selenium() -> Optional[Dict[str, Any]]:
+    """Newest month from the aside[1] month selector in a headless browser (no content hash)"""
+    from spiders.fighting_stats_spider import FightingStatsSpider
+    from spiders import rate_controller, readiness
+    spider = FightingStatsSpider()
+    try:
+        spider.driver = spider.create_driver(headless=True)
+        rate_controller.navigate(spider.driver, spider.base_url)
+        readiness.wait_for_document_ready(spider.driver)
+        month_ids = []
+        for month in spider.discover_available_months():
+            month_parts = month['text'].split('/')
+            if len(month_parts) == 2 and all(part.isdigit() for part in month_parts):
+                month_ids.append(f"{month_parts[1]}{month_parts[0]}")
+    finally:
+        spider.close_driver()
+    if not month_ids:
+        return None
+    newest = max(month_ids)
+    return {'method': 'selenium', 'month_code': newest, 'month': f"{newest[4:]}/{newest[:4]}",
+            'content_hash': None, 'rows': 0}
+
+
+def probe_latest_data() -> Optional[Dict[str, Any]]:
+    """Probe over HTTP first and fall back to the browser; returns None if both fail"""
+    from metrics import get_registry
+    registry = get_registry()
+    for method, probe in (('http', probe_http), ('selenium', probe_selenium)):
+        try:
+            result = probe()
+        except Exception as e:
+            logging.warning(f"{method} probe failed: {e}")
+            result = None
+        registry.inc('probes', help_text="New-data probes by method and result", method=method,
+                     result='ok' if result else 'failed')
+        if result:
+            registry.set('probe_newest_month', int(result['month_code']), "Newest month (YYYYMM) published on the site")
+            logging.info(f"Probe ({method}): newest month {result['month']}, hash {str(result['content_hash'])[:12]}")
+            return result
+    return None
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    print(json.dumps(probe_latest_data(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Page fixture recording, archiving and replay for SF6 Analysis project
+Captures rendered page_source snapshots per (month, league) so parsers can run offline
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from manifest import month_code
+
+
+def league_slug(league: str) -> str:
+    return str(league).lower().replace(' ', '_')
+
+
+class FixtureStore:
+    """Gzipped page snapshots laid out as <root>/<dataset>/<YYYYMM>/<league_slug>.html.gz
+
+    index.json in the root maps each fixture back to its month label, league and source URL.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.json')
+        self._lock = threading.Lock()
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('fixtures', {})
+        except Exception as e:
+            logging.warning(f"Could not load fixture index {self.index_path}: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'fixtures': self.index}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def path_for(self, dataset: str, month: str, league: str) -> str:
+        return os.path.join(self.root, dataset, month_code(month), f"{league_slug(league)}.html.gz")
+
+    def save(self, dataset: str, month: str, league: str, page_source: str, url: str = None) -> str:
+        """Store one rendered page, replacing an earlier capture of the same (month, league)"""
+        path = self.path_for(dataset, month, league)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(page_source)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.index[os.path.relpath(path, self.root)] = {
+                'dataset': dataset,
+                'month': month,
+                'league': league,
+                'url': url,
+                'bytes': len(page_source.encode('utf-8')),
+                'captured_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self._save_index()
+        logging.info(f"Saved {dataset} page for {month} {league} to {path}")
+        return path
+
+    @staticmethod
+    def load(path: str) -> str:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def fixtures(self, dataset: str) -> List[Dict[str, Any]]:
+        """List recorded fixtures of a dataset, oldest month first"""
+        entries = []
+        for rel_path, entry in sorted(self.index.items()):
+            path = os.path.join(self.root, rel_path)
+            if entry['dataset'] == dataset and os.path.exists(path):
+                entries.append({**entry, 'path': path})
+        return entries
+
+
+class ReplayDriver:
+    """Stands in for a WebDriver with a recorded page loaded, for parsers that read page_source"""
+
+    def __init__(self, page_source: str, url: str = ''):
+        self.page_source = page_source
+        self.current_url = url
+
+    def quit(self) -> None:
+        pass
+
+
+# Directory name of the page archive inside a timestamped output folder
+ARCHIVE_DIRNAME = 'pages'
+
+# Global fixture store instance, plus one archive store per output folder
+_store_instance = None
+_archive_stores = {}
+_archive_lock = threading.Lock()
+
+def get_fixture_store() -> FixtureStore:
+    """Get global fixture store rooted at the configured fixtures directory"""
+    global _store_instance
+    if _store_instance is None:
+        from config_manager import get_config
+        _store_instance = FixtureStore(get_config().get_fixture_settings()['directory'])
+    return _store_instance
+
+
+def get_recording_store() -> Optional[FixtureStore]:
+    """Get the fixture store when recording is enabled, otherwise None"""
+    from config_manager import get_config
+    if not get_config().get_fixture_settings()['record']:
+        return None
+    return get_fixture_store()
+
+
+def get_archive_store(output_dir: Optional[str]) -> Optional[FixtureStore]:
+    """Get the page archive next to a run's CSVs when archiving is enabled, otherwise None"""
+    from config_manager import get_config
+    if not output_dir or not get_config().get_archive_settings()['enabled']:
+        return None
+    with _archive_lock:
+        if output_dir not in _archive_stores:
+            _archive_stores[output_dir] = FixtureStore(os.path.join(output_dir, ARCHIVE_DIRNAME))
+        return _archive_stores[output_dir]
+
+
+def snapshot_page(dataset: str, month: str, league: str, page_source, url: str = None,
+                  output_dir: str = None) -> None:
+    """Save a parsed page as a fixture and/or to the run's archive, depending on config
+
+    page_source may be a callable so the page is only serialized when something stores it.
+    """
+    stores = [store for store in (get_recording_store(), get_archive_store(output_dir)) if store]
+    if not stores:
+        return
+    if callable(page_source):
+        page_source = page_source()
+    for store in stores:
+        try:
+            store.save(dataset, month, league, page_source, url)
+        except Exception as e:
+            logging.warning(f"Could not save {dataset} page for {month} {league} to {store.root}: {e}")
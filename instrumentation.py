@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation for SF6 Analysis project
+Per-stage timers and counters for every scrape unit, saved as a JSON report at the end of a run
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# Unit of stages that happen outside any (month, league), e.g. the first driver start
+RUN_UNIT = 'run'
+
+
+def unit_key(month: str, league: str = None) -> str:
+    """Report key of a scrape unit, matching the spiders' checkpoint keys ('MM/YYYY|League' or 'MM/YYYY')"""
+    return f"{month}|{league}" if league else str(month)
+
+
+class RunReport:
+    """Stage timings and counters of one dataset's run, grouped by scrape unit
+
+    unit() sets the current unit for the calling thread, so stages timed deep inside the spiders
+    (including pool worker threads) are attributed to it without passing it around.
+    Every stage and counter is also fed to the process-wide Prometheus registry.
+    """
+
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # unit -> stage -> [calls, seconds], and unit -> counter -> value
+        self.timings = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+        self.counts = defaultdict(lambda: defaultdict(int))
+        from metrics import get_registry
+        self.metrics = get_registry()
+
+    @contextmanager
+    def unit(self, month: str, league: str = None):
+        previous = getattr(self._local, 'unit', None)
+        self._local.unit = unit_key(month, league)
+        try:
+            yield
+        finally:
+            self._local.unit = previous
+
+    def current_unit(self) -> str:
+        return getattr(self._local, 'unit', None) or RUN_UNIT
+
+    @contextmanager
+    def stage(self, name: str, unit: str = None):
+        """Time a block; unit defaults to the thread's current unit"""
+        unit = unit or self.current_unit()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                timing = self.timings[unit][name]
+                timing[0] += 1
+                timing[1] += elapsed
+            self.metrics.observe('stage_duration_seconds', elapsed, "Time spent per scrape stage",
+                                 dataset=self.dataset, stage=name)
+
+    def count(self, name: str, value: int = 1, unit: str = None) -> None:
+        unit = unit or self.current_unit()
+        with self._lock:
+            self.counts[unit][name] += value
+        self.metrics.inc(name, value, dataset=self.dataset)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stage_totals = defaultdict(lambda: [0, 0.0])
+            count_totals = defaultdict(int)
+            units = {}
+            for unit in sorted(set(self.timings) | set(self.counts)):
+                for name, (calls, seconds) in self.timings[unit].items():
+                    stage_totals[name][0] += calls
+                    stage_totals[name][1] += seconds
+                for name, value in self.counts[unit].items():
+                    count_totals[name] += value
+                units[unit] = {
+                    'stages': {name: round(seconds, 4) for name, (_, seconds) in sorted(self.timings[unit].items())},
+                    'counts': dict(sorted(self.counts[unit].items()))
+                }
+
+        duration = time.perf_counter() - self._start
+        return {
+            'dataset': self.dataset,
+            'started_at': self.started_at,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'duration_s': round(duration, 3),
+            # Slowest stage first; share is of wall time, so overlapping pool workers can exceed 1
+            'stages': {
+                name: {'calls': calls, 'total_s': round(seconds, 4), 'share': round(seconds / duration, 4) if duration else 0}
+                for name, (calls, seconds) in sorted(stage_totals.items(), key=lambda item: -item[1][1])
+            },
+            'counts': dict(sorted(count_totals.items())),
+            'units': units
+        }
+
+    def save(self, output_dir: str, history_path: str = None) -> str:
+        """Write run_report_<dataset>.json to output_dir and append a one-line summary to history_path"""
+        report = self.to_dict()
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"run_report_{self.dataset}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+
+        if history_path:
+            summary = {key: report[key] for key in ('dataset', 'started_at', 'finished_at', 'duration_s', 'counts')}
+            summary['stages'] = {name: stage['total_s'] for name, stage in report['stages'].items()}
+            summary['output_dir'] = output_dir
+            with open(history_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(summary) + '\n')
+
+        slowest = next(iter(report['stages'].items()), None)
+        logging.info(f"Run report for {self.dataset} saved to {path} ({report['duration_s']:.1f}s"
+                     + (f", slowest stage {slowest[0]} {slowest[1]['total_s']:.1f}s)" if slowest else ")"))
+        return path
+
+
+# Current report per dataset
+_reports = {}
+_reports_lock = threading.Lock()
+
+def get_run_report(dataset: str) -> RunReport:
+    """Get the current run report of a dataset, starting one if needed"""
+    with _reports_lock:
+        if dataset not in _reports:
+            _reports[dataset] = RunReport(dataset)
+        return _reports[dataset]
+
+
+def start_run_report(dataset: str) -> RunReport:
+    """Start a fresh run report, discarding one left over from an earlier run in this process"""
+    with _reports_lock:
+        _reports[dataset] = RunReport(dataset)
+        return _reports[dataset]
+
+
+def finish_run_report(dataset: str, output_dir: str, status: str = 'success') -> Optional[str]:
+    """Save and close the current run report of a dataset; also appends to <output>/run_history.jsonl
+
+    Run duration and status go to the Prometheus registry, which is then exported if enabled.
+    """
+    with _reports_lock:
+        report = _reports.pop(dataset, None)
+    if report is None:
+        return None
+
+    from metrics import get_registry, export_metrics
+    registry = get_registry()
+    registry.inc('runs', help_text="Finished spider runs by status", dataset=dataset, status=status)
+    registry.set('last_run_duration_seconds', time.perf_counter() - report._start, dataset=dataset)
+    registry.set('last_run_timestamp_seconds', time.time(), dataset=dataset)
+    if status == 'success':
+        registry.set('last_success_timestamp_seconds', time.time(), "Unix time of the last successful run", dataset=dataset)
+
+    path = None
+    try:
+        from config_manager import get_config
+        history_path = os.path.join(get_config().get_output_dir(), 'run_history.jsonl')
+        path = report.save(output_dir, history_path=history_path)
+    except Exception as e:
+        logging.error(f"Could not save {dataset} run report: {e}")
+    export_metrics()
+    return path
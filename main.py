@@ -1,13 +1,23 @@
-from scrapy.crawler import CrawlerProcess
-from spiders.street_fighter_spider import StreetFighterSpider
-from spiders.middlewares import RetryChangeProxyMiddleware, RandomUserAgentMiddleware
+import argparse
+import sys
 
 import logging
 from config import LOGGING_CONFIG
 
-logging.basicConfig(**LOGGING_CONFIG)
 
-# Create a CrawlerProcess and configure it with settings
-process = CrawlerProcess(settings=StreetFighterSpider.custom_settings)
-process.crawl(StreetFighterSpider)
-process.start()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Street Fighter usage stats spider")
+    parser.add_argument('--resume', action='store_true',
+                        help="Resume the latest interrupted run, skipping months recorded in its checkpoint")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    # Crawl through the unified runner (see runner.py to run both spiders together)
+    from runner import run_crawl
+    status = run_crawl(['usage_stats'], resume=args.resume)
+    return 0 if status['status'] == 'success' else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
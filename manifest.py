@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Partition manifest for incremental scraping
+Tracks which (dataset, month, league) partitions are already collected, with content hashes
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple, Iterable, Iterator
+
+# Fields that describe how a row was extracted rather than what it contains
+VOLATILE_FIELDS = ('source',)
+
+
+def month_code(month: str) -> str:
+    """Convert an MM/YYYY month label to YYYYMM (other labels are returned unchanged)"""
+    parts = month.split('/')
+    if len(parts) == 2 and all(p.isdigit() for p in parts):
+        return f"{parts[1]}{parts[0]}"
+    return month
+
+
+def content_hash(rows: Iterable[Dict[str, Any]]) -> str:
+    """Order-independent SHA-256 of row contents, ignoring volatile fields"""
+    canonical = sorted(
+        json.dumps({k: str(v) for k, v in row.items() if k not in VOLATILE_FIELDS}, sort_keys=True)
+        for row in rows
+    )
+    digest = hashlib.sha256()
+    for line in canonical:
+        digest.update(line.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class PartitionManifest:
+    """Persistent record of collected partitions stored as JSON in the output directory
+
+    Both datasets' sinks share one instance when their spiders run in the same process,
+    so updates and saves are serialised by a lock.
+    """
+
+    def __init__(self, path: str, reverify_days: int = 0, enabled: bool = True, mutable_months: int = 2):
+        self.path = path
+        self.reverify_days = reverify_days
+        self.mutable_months = mutable_months
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self.partitions = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('partitions', {})
+        except Exception as e:
+            logging.warning(f"Could not load manifest {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'partitions': self.partitions}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def key(dataset: str, month: str, league: str) -> str:
+        return f"{dataset}|{month}|{league}"
+
+    def get(self, dataset: str, month: str, league: str) -> Dict[str, Any]:
+        return self.partitions.get(self.key(dataset, month, league))
+
+    def final_since(self, month: str) -> datetime:
+        """When an MM/YYYY month stops changing, by the page cache's mutable_months rule"""
+        code = month_code(month)
+        if len(code) != 6 or not code.isdigit():
+            return datetime.max
+        from page_cache import month_final_since
+        return month_final_since(code, self.mutable_months)
+
+    def record(self, dataset: str, month: str, league: str, rows: List[Dict[str, Any]], path: str) -> bool:
+        """Record a scraped partition; returns True if its content changed"""
+        now = datetime.now().isoformat(timespec='seconds')
+        new_hash = content_hash(rows)
+        with self._lock:
+            previous = self.get(dataset, month, league)
+            changed = previous is None or previous['hash'] != new_hash
+
+            if previous and changed and previous.get('final'):
+                logging.warning(f"Final partition {dataset} {month} {league} changed content since {previous['scraped_at']}")
+
+            self.partitions[self.key(dataset, month, league)] = {
+                'hash': new_hash,
+                'row_count': len(rows),
+                'path': path,
+                'scraped_at': now if changed else previous['scraped_at'],
+                'verified_at': now,
+                'final': datetime.now() >= self.final_since(month)
+            }
+        return changed
+
+    def is_unchanged(self, dataset: str, month: str, league: str, rows: List[Dict[str, Any]]) -> bool:
+        """Check whether rows match the recorded partition and its file is still on disk"""
+        entry = self.get(dataset, month, league)
+        return bool(entry) and entry['hash'] == content_hash(rows) and os.path.exists(entry['path'])
+
+    def verify(self, dataset: str, month: str, league: str) -> None:
+        """Mark an unchanged partition as re-checked without touching its file"""
+        with self._lock:
+            self.get(dataset, month, league)['verified_at'] = datetime.now().isoformat(timespec='seconds')
+
+    def move(self, dataset: str, month: str, league: str, path: str) -> None:
+        """Point a partition at the file that now holds its rows"""
+        with self._lock:
+            self.get(dataset, month, league)['path'] = path
+
+    def iter_partition_rows(self, dataset: str, month: str, league: str, league_field: str) -> Iterator[Dict[str, Any]]:
+        """Stream one recorded partition's rows from its CSV file"""
+        entry = self.get(dataset, month, league)
+        with open(entry['path'], 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('month') == month and row.get(league_field) == league:
+                    yield row
+
+    def _is_complete(self, dataset: str, month: str, leagues: List[str]) -> bool:
+        cutoff = datetime.now() - timedelta(days=self.reverify_days)
+        for league in leagues:
+            entry = self.get(dataset, month, league)
+            # Checked against verified_at too, so entries frozen under an earlier rule are scraped once more
+            if (not entry or not entry.get('final') or not os.path.exists(entry['path'])
+                    or datetime.fromisoformat(entry['verified_at']) < self.final_since(month)):
+                return False
+            if self.reverify_days and datetime.fromisoformat(entry['verified_at']) < cutoff:
+                return False
+        return True
+
+    def months_to_scrape(self, dataset: str, months: List[Tuple[str, str]], leagues: List[str]) -> List[Tuple[str, str]]:
+        """Filter (YYYYMM, MM/YYYY) months down to new, still-changing or due-for-reverify ones
+
+        The newest month is always kept because its data is still changing.
+        """
+        if not self.enabled or not months:
+            return months
+
+        newest = max(code for code, _ in months)
+        selected = []
+        for code, name in months:
+            if code != newest and self._is_complete(dataset, name, leagues):
+                logging.info(f"Skipping {dataset} {name}: all leagues already final in manifest")
+                continue
+            selected.append((code, name))
+
+        logging.info(f"Incremental scrape for {dataset}: {len(selected)} of {len(months)} months selected")
+        return selected
+
+    def iter_previous_rows(self, dataset: str, exclude_months: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Stream rows of recorded months not in exclude_months from their CSV files"""
+        exclude = set(exclude_months)
+        paths = []
+        with self._lock:
+            entries = sorted(self.partitions.items())
+        for key, entry in entries:
+            entry_dataset, month, _ = key.split('|', 2)
+            if entry_dataset == dataset and month not in exclude and entry['path'] not in paths:
+                paths.append(entry['path'])
+
+        for path in paths:
+            if not os.path.exists(path):
+                logging.warning(f"Manifest file {path} is missing, its months are not in the combined output")
+                continue
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                yield from csv.DictReader(f)
+
+
+# Global manifest instance
+_manifest_instance = None
+_manifest_lock = threading.Lock()
+
+def get_manifest() -> PartitionManifest:
+    """Get global partition manifest stored in the base output directory"""
+    global _manifest_instance
+    with _manifest_lock:
+        if _manifest_instance is None:
+            from config_manager import get_config
+            config = get_config()
+            settings = config.get_incremental_settings()
+            _manifest_instance = PartitionManifest(
+                os.path.join(config.get_output_dir(), 'manifest.json'),
+                reverify_days=settings['reverify_days'],
+                enabled=settings['enabled'],
+                mutable_months=config.get_http_cache_settings()['mutable_months']
+            )
+    return _manifest_instance
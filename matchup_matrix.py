@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Dense matchup matrix for SF6 fighting stats
+Holds every (month, league) table as one float32 array with vectorized analytics, saved as .npz/.npy
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Dict, Any, Iterable, List, Tuple
+
+import numpy as np
+
+from manifest import month_code
+from output_backends import parse_number
+
+TIER_LABELS = ('S', 'A', 'B', 'C', 'D')
+
+
+def _index(values: List[str]) -> Dict[str, int]:
+    return {value: index for index, value in enumerate(values)}
+
+
+class MatchupMatrix:
+    """values[month, league, character, opponent] plus totals[month, league, character]
+
+    Cells are float32 with NaN for missing or mirror ('-') entries. Characters keep the
+    table's row order; months are sorted oldest first.
+    """
+
+    def __init__(self, values: np.ndarray, totals: np.ndarray, months: List[str], leagues: List[str], characters: List[str]):
+        self.values = values
+        self.totals = totals
+        self.months = list(months)
+        self.leagues = list(leagues)
+        self.characters = list(characters)
+        self.month_index = _index(self.months)
+        self.league_index = _index(self.leagues)
+        self.character_index = _index(self.characters)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'MatchupMatrix':
+        """Build from fighting stats row dicts (CSV rows or FightingStatsSpider output)"""
+        months, leagues, characters = {}, {}, {}
+        cells = []
+        for row in rows:
+            month = row['month']
+            months.setdefault(month, month_code(month))
+            league = leagues.setdefault(row['league'], len(leagues))
+            character = characters.setdefault(row['row_type'].upper(), len(characters))
+            opponent_name = row['character_name'].upper()
+            opponent = -1 if opponent_name == 'TOTAL' else characters.setdefault(opponent_name, len(characters))
+            cells.append((month, league, character, opponent, parse_number(row['value'])))
+
+        month_names = sorted(months, key=months.get)
+        month_positions = _index(month_names)
+        shape = (len(month_names), len(leagues), len(characters))
+        values = np.full(shape + (len(characters),), np.nan, dtype=np.float32)
+        totals = np.full(shape, np.nan, dtype=np.float32)
+
+        if cells:
+            month_ids, league_ids, character_ids, opponent_ids, cell_values = zip(*cells)
+            month_ids = np.fromiter((month_positions[m] for m in month_ids), dtype=np.intp, count=len(cells))
+            league_ids = np.asarray(league_ids, dtype=np.intp)
+            character_ids = np.asarray(character_ids, dtype=np.intp)
+            opponent_ids = np.asarray(opponent_ids, dtype=np.intp)
+            cell_values = np.asarray([np.nan if v is None else v for v in cell_values], dtype=np.float32)
+
+            is_total = opponent_ids < 0
+            totals[month_ids[is_total], league_ids[is_total], character_ids[is_total]] = cell_values[is_total]
+            matchup = ~is_total
+            values[month_ids[matchup], league_ids[matchup], character_ids[matchup], opponent_ids[matchup]] = cell_values[matchup]
+
+        return cls(values, totals, month_names, list(leagues), list(characters))
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'MatchupMatrix':
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            return cls.from_rows(csv.DictReader(f))
+
+    def save(self, path: str) -> str:
+        """Save as .npz (arrays and axes together) or .npy (values only, axes in a .json sidecar)
+
+        Returns the path written; like numpy, .npz is appended to any other path.
+        """
+        if path.endswith('.npy'):
+            np.save(path, self.values)
+            np.save(path[:-4] + '_totals.npy', self.totals)
+            with open(path[:-4] + '.json', 'w', encoding='utf-8') as f:
+                json.dump({'months': self.months, 'leagues': self.leagues, 'characters': self.characters}, f)
+            return path
+        if not path.endswith('.npz'):
+            path += '.npz'
+        np.savez_compressed(path, values=self.values, totals=self.totals, months=np.array(self.months),
+                            leagues=np.array(self.leagues), characters=np.array(self.characters))
+        return path
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> 'MatchupMatrix':
+        """Load a matrix written by save(); .npy files can be memory-mapped"""
+        if path.endswith('.npy'):
+            with open(path[:-4] + '.json', 'r', encoding='utf-8') as f:
+                axes = json.load(f)
+            mmap_mode = 'r' if mmap else None
+            return cls(np.load(path, mmap_mode=mmap_mode), np.load(path[:-4] + '_totals.npy', mmap_mode=mmap_mode),
+                       axes['months'], axes['leagues'], axes['characters'])
+        with np.load(path) as data:
+            return cls(data['values'], data['totals'], data['months'].tolist(),
+                       data['leagues'].tolist(), data['characters'].tolist())
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.totals.nbytes
+
+    def _position(self, month: str, league: str) -> Tuple[int, int]:
+        return self.month_index[month], self.league_index[league]
+
+    def average_delta(self) -> np.ndarray:
+        """Mean matchup value of every character against the field, shape (months, leagues, characters)"""
+        counts = np.sum(~np.isnan(self.values), axis=-1)
+        sums = np.nansum(self.values, axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan).astype(np.float32)
+
+    def matchup(self, character: str, opponent: str, league: str) -> List[Tuple[str, float]]:
+        """(month, value) series of character against opponent in league"""
+        series = self.values[:, self.league_index[league], self.character_index[character.upper()],
+                             self.character_index[opponent.upper()]]
+        return [(month, float(value)) for month, value in zip(self.months, series) if not np.isnan(value)]
+
+    def _ranked_matchups(self, month: str, league: str, character: str, k: int, best: bool) -> List[Tuple[str, float]]:
+        month_id, league_id = self._position(month, league)
+        row = self.values[month_id, league_id, self.character_index[character.upper()]]
+        valid = np.flatnonzero(~np.isnan(row))
+        order = valid[np.argsort(row[valid])]
+        if best:
+            order = order[::-1]
+        return [(self.characters[i], float(row[i])) for i in order[:k]]
+
+    def best_matchups(self, month: str, league: str, character: str, k: int = 3) -> List[Tuple[str, float]]:
+        return self._ranked_matchups(month, league, character, k, best=True)
+
+    def worst_matchups(self, month: str, league: str, character: str, k: int = 3) -> List[Tuple[str, float]]:
+        return self._ranked_matchups(month, league, character, k, best=False)
+
+    def month_over_month(self) -> np.ndarray:
+        """Change of every cell since the previous month, shape (months - 1, leagues, characters, characters)"""
+        return np.diff(self.values, axis=0)
+
+    def tier_ranking(self, month: str, league: str) -> List[Dict[str, Any]]:
+        """Characters ordered by average delta, split into five equal-size tiers (S to D)"""
+        month_id, league_id = self._position(month, league)
+        averages = self.average_delta()[month_id, league_id]
+        valid = np.flatnonzero(~np.isnan(averages))
+        order = valid[np.argsort(-averages[valid])]
+        tiers = np.minimum(np.arange(len(order)) * len(TIER_LABELS) // max(1, len(order)), len(TIER_LABELS) - 1)
+        return [
+            {'rank': position + 1, 'character': self.characters[i], 'average_delta': float(averages[i]),
+             'tier': TIER_LABELS[tier]}
+            for position, (i, tier) in enumerate(zip(order, tiers))
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the dense fighting stats matchup matrix")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Convert a fighting stats CSV into .npz or .npy")
+    build_parser.add_argument('csv_path')
+    build_parser.add_argument('output')
+    tiers_parser = subparsers.add_parser('tiers', help="Print the tier ranking for one month and league")
+    tiers_parser.add_argument('matrix')
+    tiers_parser.add_argument('month', help="MM/YYYY")
+    tiers_parser.add_argument('--league', default='Master')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        matrix = MatchupMatrix.from_csv(args.csv_path)
+        path = matrix.save(args.output)
+        print(f"{len(matrix.months)} months x {len(matrix.leagues)} leagues x {len(matrix.characters)} characters "
+              f"({matrix.nbytes / 1024:.1f} KB in memory, {os.path.getsize(path) / 1024:.1f} KB on disk in {path})")
+    else:
+        matrix = MatchupMatrix.load(args.matrix)
+        for entry in matrix.tier_ranking(args.month, args.league):
+            print(f"{entry['tier']}  {entry['rank']:>2}. {entry['character']:<12} {entry['average_delta']:+.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Prometheus/OpenMetrics exporter for SF6 Analysis project
+Counters, gauges and histograms in the text exposition format, as a node_exporter textfile or over HTTP
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple, Optional
+
+PREFIX = 'sf6_'
+
+# Seconds; covers a single script call up to a whole month's browser session
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _labels(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """Thread-safe metric families keyed by name and label set
+
+    Names are given without the 'sf6_' prefix; counters get a '_total' suffix when rendered.
+    const_labels are added to every sample, so textfiles of several processes don't collide.
+    """
+
+    def __init__(self, const_labels: Dict[str, str] = None):
+        self.const_labels = _labels(const_labels or {})
+        self._lock = threading.Lock()
+        self.help = {}
+        self.types = {}
+        self.values = defaultdict(dict)
+        # name -> labels -> [bucket counts..., sum, count]
+        self.histograms = defaultdict(dict)
+        self.buckets = {}
+
+    def _declare(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self.types:
+            self.types[name] = kind
+            self.help[name] = help_text or name.replace('_', ' ')
+
+    def inc(self, name: str, value: float = 1, help_text: str = None, **labels) -> None:
+        with self._lock:
+            self._declare(name, 'counter', help_text)
+            key = _labels(labels)
+            self.values[name][key] = self.values[name].get(key, 0) + value
+
+    def set(self, name: str, value: float, help_text: str = None, **labels) -> None:
+        with self._lock:
+            self._declare(name, 'gauge', help_text)
+            self.values[name][_labels(labels)] = value
+
+    def observe(self, name: str, value: float, help_text: str = None, buckets=DURATION_BUCKETS, **labels) -> None:
+        with self._lock:
+            self._declare(name, 'histogram', help_text)
+            self.buckets.setdefault(name, tuple(buckets))
+            bounds = self.buckets[name]
+            key = _labels(labels)
+            series = self.histograms[name].setdefault(key, [0] * (len(bounds) + 2))
+            # Buckets are stored non-cumulative and summed on render
+            series[bisect_left(bounds, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted(self.types):
+                kind = self.types[name]
+                full_name = f"{PREFIX}{name}_total" if kind == 'counter' else f"{PREFIX}{name}"
+                lines.append(f"# HELP {full_name} {self.help[name]}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                if kind != 'histogram':
+                    for labels, value in sorted(self.values[name].items()):
+                        lines.append(f"{full_name}{_format_labels(labels + self.const_labels)} {_format_value(value)}")
+                    continue
+                bounds = self.buckets[name] + (float('inf'),)
+                for labels, series in sorted(self.histograms[name].items()):
+                    labels += self.const_labels
+                    cumulative = 0
+                    for bound, bucket_count in zip(bounds, series):
+                        cumulative += bucket_count
+                        le = (('le', _format_value(bound) if bound == float('inf') else repr(float(bound))),)
+                        lines.append(f"{full_name}_bucket{_format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(round(series[-2], 6))}")
+                    lines.append(f"{full_name}_count{_format_labels(labels)} {series[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """Write the metrics atomically, as node_exporter's textfile collector expects"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    render = None
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"metrics: {format % args}")
+
+
+def start_metrics_server(render, host: str = '0.0.0.0', port: int = 9108) -> ThreadingHTTPServer:
+    """Serve render() at /metrics from a daemon thread"""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'render': staticmethod(render)})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def job_name() -> str:
+    """Name of this process's textfile, e.g. 'main' or 'monthly_scheduler'"""
+    return os.path.splitext(os.path.basename(sys.argv[0] or 'sf6'))[0] or 'sf6'
+
+
+def merge_textfiles(texts) -> str:
+    """Combine several exposition texts, keeping one HELP/TYPE header per metric family"""
+    families = {}
+    for text in texts:
+        family = None
+        for line in text.splitlines():
+            if line.startswith('# '):
+                family = line.split(' ', 3)[2]
+                headers = families.setdefault(family, ([], []))[0]
+                if line not in headers:
+                    headers.append(line)
+            elif line and family:
+                families[family][1].append(line)
+    return ''.join('\n'.join(headers + samples) + '\n' for headers, samples in families.values())
+
+
+def read_textfiles(directory: str, exclude: str = None) -> List[str]:
+    """Contents of every .prom file in directory (except the exclude file name), in name order"""
+    texts = []
+    for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        if name.endswith('.prom') and name != exclude:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+    return texts
+
+
+# Global registry (labelled with this process's name) and HTTP server
+_registry = MetricsRegistry(const_labels={'process': job_name()})
+_server = None
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+def export_metrics() -> Optional[str]:
+    """Write <textfile_directory>/sf6_<job>.prom when metrics are enabled; returns its path"""
+    from config_manager import get_config
+    settings = get_config().get_metrics_settings()
+    if not settings['enabled']:
+        return None
+    path = os.path.join(settings['textfile_directory'], f"sf6_{job_name()}.prom")
+    try:
+        _registry.set('last_export_timestamp_seconds', time.time(), "Unix time these metrics were written")
+        _registry.write_textfile(path)
+        return path
+    except Exception as e:
+        logging.error(f"Could not write metrics to {path}: {e}")
+        return None
+
+
+def serve_metrics() -> Optional[ThreadingHTTPServer]:
+    """Start the /metrics endpoint once when a port is configured
+
+    It serves this process's live registry merged with the other processes' textfiles,
+    so metrics of the runner.py children show up next to the scheduler's own.
+    """
+    global _server
+    from config_manager import get_config
+    settings = get_config().get_metrics_settings()
+    if settings['enabled'] and settings['port'] and _server is None:
+        directory = settings['textfile_directory']
+        own_file = f"sf6_{job_name()}.prom"
+
+        def render():
+            return merge_textfiles([_registry.render()] + read_textfiles(directory, exclude=own_file))
+
+        _server = start_metrics_server(render, port=settings['port'])
+    return _server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve SF6 .prom textfiles over HTTP for local Prometheus testing")
+    parser.add_argument('--directory', help="Textfile directory (default: metrics.textfile_directory from config)")
+    parser.add_argument('--port', type=int, default=9108)
+    parser.add_argument('--once', action='store_true', help="Print the combined metrics and exit")
+    args = parser.parse_args()
+
+    from config_manager import get_config
+    directory = args.directory or get_config().get_metrics_settings()['textfile_directory']
+
+    def render():
+        return merge_textfiles(read_textfiles(directory))
+
+    if args.once:
+        print(render(), end='')
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = start_metrics_server(render, port=args.port)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,28 @@
 #!/usr/bin/env python3
 """
 SF6 Data Export Scheduler
-Runs data exports on the 2nd Friday of every month
+Runs data exports on the 2nd Friday of every month, or whenever a probe finds new data (--mode poll)
 """
 
-import schedule
+import argparse
 import time
 import logging
 import os
 import sys
 from datetime import datetime, timedelta
-from spiders.fighting_stats_spider import FightingStatsSpider
+import json
 import subprocess
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('monthly_export_scheduler.log'),
-        logging.StreamHandler()
-    ]
-)
+def setup_logging():
+    """Log to monthly_export_scheduler.log and the console (called by entry points, not on import)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('monthly_export_scheduler.log'),
+            logging.StreamHandler()
+        ]
+    )
 
 def is_second_friday():
     """Check if today is the second Friday of the month"""
@@ -39,15 +40,25 @@ def is_second_friday():
     
     return today.date() == second_friday.date()
 
-def run_sf6_export():
-    """Run the SF6 data export"""
+def run_sf6_export(force=False, refresh=False):
+    """Run the SF6 data export; returns 'changed', 'unchanged', 'skipped' or 'failed'
+
+    force runs it on any day (used by the polling mode). refresh bypasses cached copies
+    of the index and still-changing months, so data a probe just saw is scraped live.
+    Any spider that did not report success makes the export 'failed'.
+    """
+    from metrics import get_registry, export_metrics
+    registry = get_registry()
+    export_start = time.time()
+    status = 'failed'
     try:
         logging.info("Starting SF6 monthly data export")
         
         # Check if it's actually the second Friday
-        if not is_second_friday():
+        if not force and not is_second_friday():
             logging.info("Not the second Friday of the month, skipping export")
-            return
+            status = 'skipped'
+            return status
         
         # Change to project directory
         project_dir = os.path.dirname(os.path.abspath(__file__))
@@ -58,49 +69,138 @@ def run_sf6_export():
         config = get_config()
         output_dir = config.get_timestamped_output_dir()
         logging.info(f"Using output directory: {output_dir}")
+        started_at = datetime.now().isoformat(timespec='seconds')
         
-        # Run fighting_stats spider
-        logging.info("Running fighting_stats spider...")
-        from spiders.fighting_stats_spider import FightingStatsSpider
-        spider = FightingStatsSpider()
-        spider.setup_selenium(None)
-        logging.info("fighting_stats spider completed")
-        
-        # Run street_fighter spider
-        logging.info("Running street_fighter spider...")
-        result = subprocess.run([
-            sys.executable, 
-            'main.py'
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            logging.info("street_fighter spider completed successfully")
-        else:
-            logging.error(f"street_fighter spider failed: {result.stderr}")
+        # Run both spiders concurrently in one Scrapy process. It is a child process because
+        # the Twisted reactor can't be restarted for next month's run in this long-lived loop
+        logging.info("Running fighting_stats and usage_stats spiders...")
+        status_path = os.path.join(output_dir, 'runner_status.json')
+        if os.path.exists(status_path):
+            os.remove(status_path)
+        command = [sys.executable, 'runner.py', '--status-file', status_path]
+        if refresh:
+            command.append('--refresh')
+        result = subprocess.run(command)
+        spider_statuses = {}
+        if os.path.exists(status_path):
+            with open(status_path, 'r', encoding='utf-8') as f:
+                spider_statuses = json.load(f)['spiders']
+        for dataset, spider_status in spider_statuses.items():
+            logging.info(f"{dataset} spider: {spider_status['status']} ({spider_status['rows_scraped']} rows scraped, "
+                         f"{spider_status['rows_changed']} changed, {len(spider_status['failed_units'])} failed units)")
+            if spider_status['status'] != 'success':
+                registry.inc('subprocess_failures', help_text="Failed spider subprocesses", spider=spider_status['spider'])
+        if result.returncode != 0:
+            logging.error(f"Spider runner exited with code {result.returncode}")
+        if not spider_statuses:
+            registry.inc('subprocess_failures', help_text="Failed spider subprocesses", spider='runner')
+            raise RuntimeError("Spider runner did not report a status")
         
+        # Partial data still goes downstream, but the export only counts as done if every spider succeeded
+        changed = run_downstream_refresh(config, output_dir, started_at)
+        failed = [dataset for dataset, spider_status in spider_statuses.items() if spider_status['status'] != 'success']
+        if failed:
+            logging.error(f"SF6 export incomplete, spiders did not succeed: {', '.join(failed)}")
+            return status
+        status = 'changed' if changed else 'unchanged'
         logging.info("SF6 monthly data export completed")
         
     except Exception as e:
         logging.error(f"Error during SF6 export: {str(e)}")
+    finally:
+        # Don't keep browsers open between monthly runs
+        from spiders.driver_provider import get_driver_provider
+        get_driver_provider().shutdown()
+        registry.inc('exports', help_text="Scheduled export attempts by outcome", status=status)
+        if status != 'skipped':
+            registry.set('last_export_duration_seconds', time.time() - export_start)
+        export_metrics()
+    return status
+
+def run_downstream_refresh(config, output_dir, started_at):
+    """Run the configured on_change_command, unless this export changed no partition"""
+    from row_sink import load_change_summaries
+    summaries = load_change_summaries(output_dir, since=started_at)
+    changed = sum(len(summary['changed']) for summary in summaries)
+    if summaries and not changed:
+        logging.info("No partitions changed since the last export, skipping downstream refresh")
+        return False
 
-def main():
+    logging.info(f"{changed} partitions changed" if summaries else "No change summaries found, assuming data changed")
+    command = config.get_incremental_settings()['on_change_command']
+    if command:
+        logging.info(f"Running downstream refresh: {command}")
+        result = subprocess.run(command, shell=True, capture_output=True, text=True,
+                                env={**os.environ, 'SF6_CHANGED_OUTPUT_DIR': output_dir})
+        if result.returncode != 0:
+            logging.error(f"Downstream refresh failed: {result.stderr}")
+    return True
+
+def poll_for_new_data():
+    """Probe the site and export only when a new month or changed data appeared, or a run is overdue"""
+    from config_manager import get_config
+    from data_probe import SchedulerState, probe_latest_data
+    settings = get_config().get_scheduler_settings()
+    state = SchedulerState(settings['state_file'])
+    
+    probe = probe_latest_data()
+    if probe:
+        state.record_probe(probe)
+    else:
+        logging.warning("Could not probe for new data")
+    
+    reason = state.export_reason(probe, settings['max_days_between_exports'])
+    if not reason:
+        logging.info(f"No new data (newest month {probe['month'] if probe else 'unknown'}), nothing to export")
+        return
+    
+    logging.info(f"Export triggered: {reason}")
+    status = run_sf6_export(force=True, refresh=True)
+    # Only recorded when every spider succeeded, so a failed scrape is retried for the same probe
+    if status in ('changed', 'unchanged'):
+        state.record_export(probe)
+    else:
+        logging.error(f"Export {status}, it will be retried on the next poll")
+
+def main(argv=None):
     """Main scheduler loop"""
-    logging.info("SF6 Monthly Export Scheduler started")
+    import schedule
+    from config_manager import get_config
+    settings = get_config().get_scheduler_settings()
+    parser = argparse.ArgumentParser(description="SF6 export scheduler")
+    parser.add_argument('--mode', choices=['second_friday', 'poll'], default=settings['mode'],
+                        help="Fire on the 2nd Friday of each month, or poll for new data")
+    args = parser.parse_args(argv)
     
-    # Schedule the job to run every Friday at 2:00 AM
-    # The function will check if it's the second Friday
-    schedule.every().friday.at("02:00").do(run_sf6_export)
+    setup_logging()
+    logging.info("SF6 Monthly Export Scheduler started")
     
-    # Alternative: Check daily at 2:00 AM
-    # schedule.every().day.at("02:00").do(run_sf6_export)
+    # Optional /metrics endpoint for the long-running loop
+    from metrics import serve_metrics, export_metrics
+    serve_metrics()
+    export_metrics()
     
-    logging.info("Scheduler configured - checking every Friday at 2:00 AM")
-    logging.info("Will export data on 2nd Friday of each month")
+    if args.mode == 'poll':
+        # Probe right away so missed runs are caught up on restart
+        schedule.every(settings['poll_minutes']).minutes.do(poll_for_new_data)
+        logging.info(f"Scheduler configured - probing for new data every {settings['poll_minutes']} minutes")
+        poll_for_new_data()
+    else:
+        # Schedule the job to run every Friday at 2:00 AM
+        # The function will check if it's the second Friday
+        schedule.every().friday.at("02:00").do(run_sf6_export)
+        
+        # Alternative: Check daily at 2:00 AM
+        # schedule.every().day.at("02:00").do(run_sf6_export)
+        
+        logging.info("Scheduler configured - checking every Friday at 2:00 AM")
+        logging.info("Will export data on 2nd Friday of each month")
     
     while True:
         try:
             schedule.run_pending()
-            time.sleep(3600)  # Check every hour
+            # Sleep until the next job is due, checking at least every hour
+            time.sleep(max(1, min(3600, schedule.idle_seconds() or 3600)))
         except KeyboardInterrupt:
             logging.info("Scheduler stopped by user")
             break
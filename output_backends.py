@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Pluggable output backends for SF6 Analysis project
+Writes typed, partitioned (month/league) Parquet, Arrow IPC or SQLite output alongside the CSV outputs
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Union
+
+from manifest import month_code
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Parse values like '5.855%', '+1.2%', '-0.4' into floats ('-', 'N/A' and '' become None)"""
+    if value is None:
+        return None
+    text = str(value).strip().rstrip('%').replace(',', '')
+    if text in ('', '-', 'N/A'):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_int(value: Any) -> Optional[int]:
+    number = parse_number(value)
+    return int(number) if number is not None else None
+
+
+# Column layout per dataset: (column, kind) where kind is 'category', 'float', 'int' or 'string'
+DATASET_SCHEMAS = {
+    'fighting_stats': {
+        'league_field': 'league',
+        'columns': [
+            ('character_name', 'category'),
+            ('month', 'category'),
+            ('league', 'category'),
+            ('row_type', 'category'),
+            ('value', 'float'),
+            ('row_index', 'int'),
+            ('column_index', 'int'),
+            ('source', 'category'),
+        ],
+    },
+    'usage_stats': {
+        'league_field': 'rank_name',
+        'columns': [
+            ('rank', 'int'),
+            ('character_name', 'category'),
+            ('usage_percentage', 'float'),
+            ('change_rate', 'float'),
+            ('month', 'category'),
+            ('div_index', 'int'),
+            ('rank_name', 'category'),
+            ('source', 'category'),
+        ],
+    },
+}
+
+CONVERTERS = {
+    'category': lambda v: None if v is None else str(v),
+    'string': lambda v: None if v is None else str(v),
+    'float': parse_number,
+    'int': parse_int,
+}
+
+
+class ColumnarBackend(ABC):
+    """Base class for pyarrow-backed backends writing one file per (month, league) partition
+
+    Layout: <base_dir>/<backend>/<dataset>/month_code=YYYYMM/league_slug=<league>/data.<ext>
+    """
+
+    name = None
+    extension = None
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def _arrow_types(self):
+        import pyarrow as pa
+        return {
+            'category': pa.dictionary(pa.int16(), pa.string()),
+            'string': pa.string(),
+            'float': pa.float64(),
+            'int': pa.int32(),
+        }
+
+    def build_table(self, dataset: str, rows: List[Dict[str, Any]]):
+        """Convert string row dicts into a typed, dictionary-encoded Arrow table"""
+        import pyarrow as pa
+        arrow_types = self._arrow_types()
+        columns = DATASET_SCHEMAS[dataset]['columns']
+
+        arrays = []
+        fields = []
+        for column, kind in columns:
+            convert = CONVERTERS[kind]
+            values = [convert(row.get(column)) for row in rows]
+            if kind == 'category':
+                array = pa.array(values, type=pa.string()).dictionary_encode()
+                array = array.cast(arrow_types['category'])
+            else:
+                array = pa.array(values, type=arrow_types[kind])
+            arrays.append(array)
+            fields.append(pa.field(column, arrow_types[kind]))
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+    def partition_path(self, dataset: str, month: str, league: str) -> str:
+        league_slug = league.lower().replace(' ', '_')
+        return os.path.join(
+            self.base_dir, self.name, dataset,
+            f"month_code={month_code(month)}",
+            f"league_slug={league_slug}",
+            f"data.{self.extension}"
+        )
+
+    @abstractmethod
+    def write_table(self, table, path: str) -> None:
+        """Write one partition's Arrow table to path"""
+
+    def write(self, dataset: str, rows: List[Dict[str, Any]]) -> List[str]:
+        """Write rows as one file per (month, league) partition, replacing existing partitions"""
+        league_field = DATASET_SCHEMAS[dataset]['league_field']
+        partitions = defaultdict(list)
+        for row in rows:
+            partitions[(row.get('month', 'unknown'), str(row.get(league_field, 'unknown')))].append(row)
+
+        written = []
+        for (month, league), partition_rows in sorted(partitions.items()):
+            path = self.partition_path(dataset, month, league)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            self.write_table(self.build_table(dataset, partition_rows), tmp_path)
+            os.replace(tmp_path, path)
+            written.append(path)
+
+        logging.info(f"{self.name}: written {len(rows)} {dataset} rows to {len(written)} partitions under {self.base_dir}")
+        return written
+
+
+class ParquetBackend(ColumnarBackend):
+    name = 'parquet'
+    extension = 'parquet'
+
+    def write_table(self, table, path: str) -> None:
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression='zstd')
+
+
+class ArrowIpcBackend(ColumnarBackend):
+    name = 'arrow'
+    extension = 'arrow'
+
+    def write_table(self, table, path: str) -> None:
+        import pyarrow as pa
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+SQLITE_TYPES = {
+    'category': 'TEXT',
+    'string': 'TEXT',
+    'float': 'REAL',
+    'int': 'INTEGER',
+}
+
+# Indexes for the lookups in queries.py
+SQLITE_INDEXES = {
+    'fighting_stats': [
+        ('idx_fighting_stats_matchup', ['character_name', 'row_type', 'league', 'month_code']),
+        ('idx_fighting_stats_partition', ['month_code', 'league']),
+    ],
+    'usage_stats': [
+        ('idx_usage_stats_character', ['character_name', 'rank_name', 'month_code']),
+        ('idx_usage_stats_partition', ['month_code', 'rank_name', 'rank']),
+    ],
+}
+
+
+class SqliteBackend:
+    """Typed, indexed SQLite tables (one per dataset), replacing the (month, league) partitions written
+
+    Columns follow DATASET_SCHEMAS plus a sortable month_code; see queries.py for lookups.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _ensure_table(self, conn, dataset: str) -> None:
+        columns = ', '.join(f"{column} {SQLITE_TYPES[kind]}" for column, kind in DATASET_SCHEMAS[dataset]['columns'])
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {dataset} (month_code TEXT NOT NULL, {columns})")
+        for index_name, index_columns in SQLITE_INDEXES[dataset]:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {dataset} ({', '.join(index_columns)})")
+
+    def write(self, dataset: str, rows: List[Dict[str, Any]]) -> List[str]:
+        import sqlite3
+        schema = DATASET_SCHEMAS[dataset]
+        league_field = schema['league_field']
+        column_names = ['month_code'] + [column for column, _ in schema['columns']]
+        converters = [CONVERTERS[kind] for _, kind in schema['columns']]
+
+        values = [
+            [month_code(row.get('month', 'unknown'))] + [convert(row.get(column)) for (column, _), convert in zip(schema['columns'], converters)]
+            for row in rows
+        ]
+        partitions = sorted(set((month_code(row.get('month', 'unknown')), str(row.get(league_field, 'unknown'))) for row in rows))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                self._ensure_table(conn, dataset)
+                conn.executemany(f"DELETE FROM {dataset} WHERE month_code = ? AND {league_field} = ?", partitions)
+                placeholders = ', '.join('?' for _ in column_names)
+                conn.executemany(f"INSERT INTO {dataset} ({', '.join(column_names)}) VALUES ({placeholders})", values)
+        finally:
+            conn.close()
+
+        logging.info(f"{self.name}: written {len(rows)} {dataset} rows to {len(partitions)} partitions in {self.path}")
+        return [self.path]
+
+
+BACKENDS = {
+    'parquet': ParquetBackend,
+    'arrow': ArrowIpcBackend,
+    'sqlite': SqliteBackend,
+}
+
+
+def get_output_backends() -> List[Union[ColumnarBackend, SqliteBackend]]:
+    """Build the extra (non-CSV) backends enabled in the output config"""
+    from config_manager import get_config
+    config = get_config()
+    base_dir = config.get_columnar_output_dir()
+
+    backends = []
+    for name in config.get_output_backends():
+        if name == 'csv':
+            continue
+        if name not in BACKENDS:
+            logging.warning(f"Unknown output backend '{name}', expected one of: csv, {', '.join(BACKENDS)}")
+            continue
+        if name == 'sqlite':
+            backends.append(SqliteBackend(config.get_sqlite_output_path()))
+            continue
+        backends.append(BACKENDS[name](base_dir))
+    return backends
+
+
+def write_to_backends(dataset: str, rows: List[Dict[str, Any]]) -> None:
+    """Write rows through every configured extra backend, logging (not raising) failures"""
+    if not rows:
+        return
+    for backend in get_output_backends():
+        try:
+            backend.write(dataset, rows)
+        except ImportError:
+            logging.error(f"The {backend.name} output backend requires pyarrow: pip install pyarrow")
+        except Exception as e:
+            logging.error(f"Error writing {dataset} with {backend.name} backend: {e}")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Page cache for SF6 Analysis project
+One compressed, size-bounded LRU SQLite file holding Scrapy HTTP responses and rendered Selenium pages
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER,
+    headers BLOB,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+# Stats pages of one month end in /YYYYMM; anything else (the index) shows the newest month
+MONTH_URL_PATTERN = re.compile(r'/(\d{6})/?$')
+
+# Key prefix of rendered Selenium pages, keeping them apart from Scrapy request fingerprints
+RENDERED_KEY_PREFIX = 'rendered:'
+
+# Eviction frees space down to this fraction of max_size_mb, so it doesn't run on every store
+EVICTION_TARGET = 0.9
+
+
+def url_month_code(url: str) -> Optional[str]:
+    """YYYYMM of a month page URL, or None for index and other pages"""
+    match = MONTH_URL_PATTERN.search(urlparse(url).path)
+    return match.group(1) if match else None
+
+
+def month_final_since(code: str, mutable_months: int) -> datetime:
+    """When a YYYYMM month stops changing: the start of the month mutable_months after it"""
+    year, month = divmod(int(code[:4]) * 12 + int(code[4:]) - 1 + max(1, mutable_months), 12)
+    return datetime(year, month + 1, 1)
+
+
+def is_final_copy(url: str, stored_at: float, settings: Dict[str, Any]) -> bool:
+    """Check whether a month page was fetched after its month became final (index pages never are)"""
+    code = url_month_code(url)
+    return code is not None and stored_at >= month_final_since(code, settings['mutable_months']).timestamp()
+
+
+def is_fresh(url: str, stored_at: float, settings: Dict[str, Any]) -> bool:
+    """Check whether a copy of url cached at stored_at can be used without fetching it again
+
+    Final copies of a month never expire (unless past_month_ttl is set). Copies taken while
+    the month could still change expire after current_month_ttl, index pages after index_ttl,
+    and both right away when refresh is set.
+    """
+    age = time.time() - stored_at
+    if is_final_copy(url, stored_at, settings):
+        return not settings['past_month_ttl'] or age < settings['past_month_ttl']
+    if settings['refresh']:
+        return False
+    return age < (settings['index_ttl'] if url_month_code(url) is None else settings['current_month_ttl'])
+
+
+class PageCache:
+    """Compressed pages in one SQLite file, evicting the least recently used beyond max_size_mb"""
+
+    def __init__(self, path: str, max_size_mb: float = 256):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        # Shared by the reactor thread and browser worker threads; all access holds _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        # Incremental auto-vacuum only takes effect on a new file, letting eviction shrink it
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[int], Optional[bytes], bytes, float]]:
+        """(url, status, headers, body, stored_at) of a cached page, marking it recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, stored_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        url, status, headers, body, stored_at = row
+        return url, status, headers, zlib.decompress(body), stored_at
+
+    def put(self, key: str, url: str, body: bytes, status: int = None, headers: bytes = None) -> None:
+        compressed = zlib.compress(body, 6)
+        size = len(compressed) + len(headers or b'')
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, status, headers, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, headers, compressed, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used pages until the cache is back under EVICTION_TARGET of its budget"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_size:
+            return
+        target = self.max_size * EVICTION_TARGET
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall():
+            if total <= target:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE key = ?", evicted)
+        self._conn.execute("PRAGMA incremental_vacuum")
+        logging.info(f"Page cache over {self.max_size // (1024 * 1024)} MB, evicted {len(evicted)} pages")
+
+    def get_rendered(self, url: str, settings: Dict[str, Any]) -> Optional[str]:
+        """Rendered page source of url if a final copy is cached
+
+        Pages of months that can still change are always rendered again: unlike HTTP
+        responses they can't be revalidated, and a new-data probe must see the live page.
+        """
+        entry = self.get(RENDERED_KEY_PREFIX + url)
+        page_url = url.split('#')[0]
+        if entry is None or not is_final_copy(page_url, entry[4], settings) or not is_fresh(page_url, entry[4], settings):
+            return None
+        return entry[3].decode('utf-8')
+
+    def put_rendered(self, url: str, page_source: str, settings: Dict[str, Any]) -> bool:
+        """Cache a rendered page if its month is final; returns whether it was stored"""
+        if not is_final_copy(url.split('#')[0], time.time(), settings):
+            return False
+        self.put(RENDERED_KEY_PREFIX + url, url, page_source.encode('utf-8'))
+        return True
+
+    def clear(self, url_prefix: str = None) -> int:
+        """Delete every page (or those whose URL starts with url_prefix); returns how many"""
+        with self._lock:
+            if url_prefix:
+                cursor = self._conn.execute("DELETE FROM pages WHERE substr(url, 1, ?) = ?",
+                                            (len(url_prefix), url_prefix))
+            else:
+                cursor = self._conn.execute("DELETE FROM pages")
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pages, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            rendered = self._conn.execute("SELECT COUNT(*) FROM pages WHERE key LIKE ?",
+                                          (RENDERED_KEY_PREFIX + '%',)).fetchone()[0]
+        return {'pages': pages, 'rendered_pages': rendered, 'bytes': size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Global cache instance shared by the HTTP cache storage and the Selenium spiders
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_page_cache() -> PageCache:
+    """Get the process-wide page cache configured from the http_cache config section"""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            from config_manager import get_config
+            settings = get_config().get_http_cache_settings()
+            _cache_instance = PageCache(settings['path'], settings['max_size_mb'])
+        return _cache_instance
+
+
+def load_rendered_page(url: str) -> Optional[str]:
+    """Fresh cached page source of url if rendered page caching is enabled, logging (not raising) failures"""
+    from config_manager import get_config
+    from metrics import get_registry
+    settings = get_config().get_http_cache_settings()
+    if not settings['cache_rendered_pages']:
+        return None
+    try:
+        page_source = get_page_cache().get_rendered(url, settings)
+    except Exception as e:
+        logging.error(f"Error reading {url} from page cache: {e}")
+        return None
+    get_registry().inc('rendered_page_cache_lookups', help_text="Rendered page cache lookups by result",
+                       result='hit' if page_source is not None else 'miss')
+    if page_source is not None:
+        logging.info(f"Using cached rendered page for {url}")
+    return page_source
+
+
+def save_rendered_page(url: str, page_source) -> None:
+    """Cache a final month's rendered page source (or a callable returning it) if enabled, logging (not raising) failures"""
+    from config_manager import get_config
+    settings = get_config().get_http_cache_settings()
+    if not settings['cache_rendered_pages']:
+        return
+    try:
+        get_page_cache().put_rendered(url, page_source() if callable(page_source) else page_source, settings)
+    except Exception as e:
+        logging.error(f"Error writing {url} to page cache: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the SF6 page cache")
+    parser.add_argument('--path', help="SQLite file (default: http_cache.path from config)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help="Show page count and compressed size")
+    clear_parser = subparsers.add_parser('clear', help="Delete cached pages")
+    clear_parser.add_argument('--url-prefix', help="Only delete pages whose URL starts with this")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from config_manager import get_config
+    settings = get_config().get_http_cache_settings()
+    cache = PageCache(args.path or settings['path'], settings['max_size_mb'])
+
+    if args.command == 'clear':
+        logging.info(f"Deleted {cache.clear(args.url_prefix)} cached pages")
+    print(json.dumps(cache.stats()))
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Query helpers for the SF6 SQLite output
+Indexed lookups over the tables written by the 'sqlite' output backend
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional
+from urllib.request import pathname2url
+
+from manifest import month_code
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(path: str = None) -> sqlite3.Connection:
+    """Get a cached read-only connection to the SQLite output (default: output.sqlite_path from config)
+
+    Opening read-only makes a missing database an error rather than a new empty file.
+    """
+    if path is None:
+        from config_manager import get_config
+        path = get_config().get_sqlite_output_path()
+    with _connections_lock:
+        if path not in _connections:
+            conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            _connections[path] = conn
+        return _connections[path]
+
+
+def _fetch(sql: str, params: list, path: str = None) -> List[Dict[str, Any]]:
+    return [dict(row) for row in get_connection(path).execute(sql, params)]
+
+
+def matchup(character: str, opponent: str, league: str = None, path: str = None) -> List[Dict[str, Any]]:
+    """Value of character's row against opponent's column per month (and league), oldest first
+
+    e.g. matchup('Ken', 'Juri', league='Grand Master')
+    """
+    sql = ("SELECT month, month_code, league, value FROM fighting_stats "
+           "WHERE character_name = ? AND row_type = ?")
+    params = [opponent.upper(), character.upper()]
+    if league:
+        sql += " AND league = ?"
+        params.append(league)
+    return _fetch(sql + " ORDER BY month_code, league", params, path)
+
+
+def usage_trend(character: str, league: str = None, path: str = None) -> List[Dict[str, Any]]:
+    """Rank, usage and change rate of a character per month (and league), oldest first"""
+    sql = ("SELECT month, month_code, rank_name AS league, rank, usage_percentage, change_rate FROM usage_stats "
+           "WHERE character_name = ?")
+    params = [character.upper()]
+    if league:
+        sql += " AND rank_name = ?"
+        params.append(league)
+    return _fetch(sql + " ORDER BY month_code, div_index", params, path)
+
+
+def latest_month(path: str = None) -> Optional[str]:
+    """Newest month (YYYYMM) in the usage stats table"""
+    row = get_connection(path).execute("SELECT MAX(month_code) FROM usage_stats").fetchone()
+    return row[0] if row else None
+
+
+def top_n(n: int = 10, month: str = None, league: str = 'Master', path: str = None) -> List[Dict[str, Any]]:
+    """Most used characters of a month (MM/YYYY or YYYYMM, default: newest) in a league"""
+    code = month_code(month) if month else latest_month(path)
+    return _fetch(
+        "SELECT rank, character_name, usage_percentage, change_rate, month FROM usage_stats "
+        "WHERE month_code = ? AND rank_name = ? ORDER BY rank LIMIT ?",
+        [code, league, n], path
+    )
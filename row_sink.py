@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Streaming row sink for SF6 Analysis project
+Flushes each parsed (month, league) batch to disk immediately instead of holding a whole run in memory
+"""
+
+import csv
+import glob
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List, Iterable
+
+PARTIAL_SUFFIX = '.partial'
+CHANGES_PREFIX = 'changes_'
+
+
+def clean_month_label(month: str) -> str:
+    """Turn a month label like '06/2025' into a filename fragment like '062025'"""
+    clean_month = ''.join(c for c in month if c.isalnum() or c in (' ', '-', '_')).strip()
+    return clean_month.replace(' ', '_')
+
+
+class StreamingRowSink:
+    """Appends row batches to per-month and combined CSV files as they are parsed
+
+    Rows go to '<file>.partial' files that are renamed into place by commit(), so an
+    interrupted run leaves its progress on disk without clobbering complete outputs.
+    Each batch is also recorded in the partition manifest and sent to the columnar backends
+    and the time-series store.
+
+    With a checkpoint, batches written with a unit_key are marked complete; a resumed sink
+    reopens the partial files truncated to the last completed unit and appends to them.
+
+    With skip_unchanged, (month, league) partitions whose content hash matches the manifest
+    are not written again. A month with no changed league keeps its existing file, and commit()
+    writes a changes_<dataset>.json summary of changed and unchanged partitions.
+    """
+
+    def __init__(self, dataset: str, output_dir: str, file_prefix: str, fieldnames: List[str], league_field: str,
+                 checkpoint=None, resumed: bool = False, skip_unchanged: bool = False):
+        self.dataset = dataset
+        self.output_dir = output_dir
+        self.file_prefix = file_prefix
+        self.fieldnames = fieldnames
+        self.league_field = league_field
+        self.checkpoint = checkpoint
+        self.resumed = resumed
+        self.skip_unchanged = skip_unchanged
+        self.rows_written = 0
+        self.rows_scraped = 0
+        # Scrape units that raised or produced no rows; left unchecked in the checkpoint
+        self.failed_units = []
+        self.month_counts = defaultdict(int)
+        # 'MM/YYYY|League' -> 'changed' or 'unchanged'
+        self.partitions = {}
+        self._handles = {}
+        self._writers = {}
+        self._bytes_streamed = 0
+        self._committed = False
+
+        if resumed and checkpoint:
+            self.month_counts.update(checkpoint.month_counts)
+            self.partitions.update(checkpoint.partitions)
+            self.rows_written = sum(checkpoint.units.values())
+            for path in checkpoint.file_sizes:
+                self._writer(path)
+            self._bytes_streamed = sum(handle.tell() for handle in self._handles.values())
+
+    def is_done(self, unit_key: str) -> bool:
+        """Check whether a unit was completed by an earlier attempt of this run"""
+        return bool(self.checkpoint) and self.checkpoint.is_done(unit_key)
+
+    def month_path(self, month: str) -> str:
+        return os.path.join(self.output_dir, f"{self.file_prefix}_{clean_month_label(month)}.csv")
+
+    @property
+    def combined_path(self) -> str:
+        return os.path.join(self.output_dir, f"{self.file_prefix}_all_months.csv")
+
+    @property
+    def changes_path(self) -> str:
+        return os.path.join(self.output_dir, f"{CHANGES_PREFIX}{self.dataset}.json")
+
+    def _writer(self, path: str):
+        if path not in self._writers:
+            partial_path = f"{path}{PARTIAL_SUFFIX}"
+            resume_size = self.checkpoint.file_sizes.get(path) if (self.resumed and self.checkpoint) else None
+            if resume_size is not None and os.path.exists(partial_path):
+                # Drop anything written after the last completed unit
+                handle = open(partial_path, 'r+', newline='', encoding='utf-8')
+                handle.truncate(resume_size)
+                handle.seek(resume_size)
+                writer = csv.DictWriter(handle, fieldnames=self.fieldnames, extrasaction='raise')
+            else:
+                handle = open(partial_path, 'w', newline='', encoding='utf-8')
+                writer = csv.DictWriter(handle, fieldnames=self.fieldnames, extrasaction='raise')
+                writer.writeheader()
+            self._handles[path] = handle
+            self._writers[path] = writer
+        return self._writers[path]
+
+    def _flush(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            handle = self._handles[path]
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def write_batch(self, rows: List[Dict[str, Any]], unit_key: str = None) -> None:
+        """Write one parsed batch to its month file(s) and the combined file, then flush to disk
+
+        unit_key marks the batch's scrape unit complete in the checkpoint. Empty batches are not
+        marked: the spiders return no rows when a unit failed, and --resume must scrape it again.
+        """
+        if not rows:
+            if unit_key:
+                self.mark_failed(unit_key)
+            return
+
+        # A row key missing from fieldnames is a bug, not a column to drop; fail before writing anything
+        unknown = {key for row in rows for key in row} - set(self.fieldnames)
+        if unknown:
+            raise ValueError(f"{self.dataset} rows have fields missing from the CSV columns: {sorted(unknown)}")
+
+        self.rows_scraped += len(rows)
+        from instrumentation import get_run_report
+        with get_run_report(self.dataset).stage('write', unit=unit_key):
+            self._write_batch(rows, unit_key)
+
+    def mark_failed(self, unit_key: str) -> None:
+        """Record a unit that failed; it stays unchecked so --resume scrapes it again"""
+        self.failed_units.append(unit_key)
+        logging.warning(f"No {self.dataset} rows for {unit_key}, leaving it to be scraped again on resume")
+
+    def _write_batch(self, rows: List[Dict[str, Any]], unit_key: str = None) -> None:
+        from instrumentation import get_run_report
+        from manifest import get_manifest
+        from output_backends import write_to_backends
+        from timeseries_store import write_to_timeseries
+        manifest = get_manifest()
+        report = get_run_report(self.dataset)
+
+        by_month = defaultdict(list)
+        for row in rows:
+            by_month[row.get('month', 'unknown')].append(row)
+
+        touched = []
+        written = []
+        for month, month_rows in by_month.items():
+            by_league = defaultdict(list)
+            for row in month_rows:
+                by_league[str(row.get(self.league_field))].append(row)
+
+            # Hash each league partition before writing; unchanged ones stay where they are
+            changed_leagues = set()
+            for league, league_rows in sorted(by_league.items()):
+                if self.skip_unchanged and manifest.is_unchanged(self.dataset, month, league, league_rows):
+                    manifest.verify(self.dataset, month, league)
+                    self.partitions[f"{month}|{league}"] = 'unchanged'
+                else:
+                    changed_leagues.add(league)
+                    self.partitions[f"{month}|{league}"] = 'changed'
+            if not changed_leagues:
+                continue
+
+            if len(changed_leagues) < len(by_league):
+                month_rows = [row for row in month_rows if str(row.get(self.league_field)) in changed_leagues]
+            month_path = self.month_path(month)
+            self._writer(month_path).writerows(month_rows)
+            self._writer(self.combined_path).writerows(month_rows)
+            touched.append(month_path)
+            written.extend(month_rows)
+            self.month_counts[month] += len(month_rows)
+
+            # Record each league partition so later runs can skip final months
+            for league in sorted(changed_leagues):
+                manifest.record(self.dataset, month, league, by_league[league], month_path)
+
+        if touched:
+            bytes_before = self._bytes_streamed
+            self._flush(touched + [self.combined_path])
+            self._bytes_streamed = sum(handle.tell() for handle in self._handles.values())
+            report.count('bytes_written', self._bytes_streamed - bytes_before, unit=unit_key)
+        report.count('rows_written', len(written), unit=unit_key)
+        self.rows_written += len(written)
+        manifest.save()
+        self._mark_done(unit_key, len(written))
+        if len(written) < len(rows):
+            logging.info(f"Skipped {len(rows) - len(written)} {self.dataset} rows of unchanged partitions")
+        if not written:
+            return
+        logging.info(f"Flushed {len(written)} {self.dataset} rows ({self.rows_written} this run)")
+
+        # Typed, partitioned copies for Parquet/Arrow consumers, and the versioned time-series store
+        write_to_backends(self.dataset, written)
+        write_to_timeseries(self.dataset, written)
+
+    def _mark_done(self, unit_key: str, row_count: int) -> None:
+        if self.checkpoint and unit_key:
+            file_sizes = {path: handle.tell() for path, handle in self._handles.items()}
+            self.checkpoint.mark_done(unit_key, row_count, file_sizes, self.month_counts, self.partitions)
+
+    def _close_handles(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+
+    def commit(self) -> None:
+        """Carry over skipped months into the combined file and atomically move all files into place"""
+        if self._committed:
+            return
+        self._committed = True
+
+        if not self._writers:
+            if self.partitions:
+                logging.info(f"No {self.dataset} partitions changed, existing files left untouched")
+                self.write_change_summary()
+            else:
+                logging.warning(f"No {self.dataset} data to write")
+            if self.checkpoint:
+                self.checkpoint.clear()
+            self._finish_report()
+            return
+
+        from manifest import get_manifest
+        manifest = get_manifest()
+
+        # Rewritten months also need their unchanged leagues, copied from the files that hold them
+        carried_over = 0
+        combined_writer = self._writer(self.combined_path)
+        for key, status in sorted(self.partitions.items()):
+            month, league = key.split('|', 1)
+            if status != 'unchanged' or month not in self.month_counts:
+                continue
+            month_path = self.month_path(month)
+            month_writer = self._writer(month_path)
+            for row in manifest.iter_partition_rows(self.dataset, month, league, self.league_field):
+                month_writer.writerow(row)
+                combined_writer.writerow(row)
+                carried_over += 1
+            manifest.move(self.dataset, month, league, month_path)
+
+        # Months skipped by the incremental scrape (or entirely unchanged) still belong in the combined file
+        for row in manifest.iter_previous_rows(self.dataset, self.month_counts.keys()):
+            combined_writer.writerow(row)
+            carried_over += 1
+
+        from instrumentation import RUN_UNIT, get_run_report
+        report = get_run_report(self.dataset)
+        report.count('bytes_written', sum(handle.tell() for handle in self._handles.values()) - self._bytes_streamed,
+                     unit=RUN_UNIT)
+        report.count('rows_carried_over', carried_over, unit=RUN_UNIT)
+        self._close_handles()
+        for path in self._writers:
+            os.replace(f"{path}{PARTIAL_SUFFIX}", path)
+        manifest.save()
+        if self.checkpoint:
+            self.checkpoint.clear()
+
+        for month, count in self.month_counts.items():
+            logging.info(f"Written {count} {self.dataset} entries for {month} to {self.month_path(month)}")
+        logging.info(f"Written {self.rows_written + carried_over} total entries to {self.combined_path} "
+                     f"({carried_over} carried over from earlier runs)")
+        self.write_change_summary()
+        self._finish_report()
+
+    def write_change_summary(self) -> None:
+        """Log and save which (month, league) partitions changed in this run"""
+        changed = sorted(key for key, status in self.partitions.items() if status == 'changed')
+        unchanged = sorted(key for key, status in self.partitions.items() if status == 'unchanged')
+        summary = {
+            'dataset': self.dataset,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'rows_written': self.rows_written,
+            'changed': changed,
+            'unchanged': unchanged
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.changes_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp_path, self.changes_path)
+        logging.info(f"{self.dataset}: {len(changed)} changed partitions, {len(unchanged)} unchanged"
+                     + (f" ({', '.join(changed)})" if changed else ''))
+
+    def abort(self) -> None:
+        """Close files without renaming; partial files are left on disk"""
+        if not self._committed:
+            self._close_handles()
+            self._committed = True
+            logging.warning(f"{self.dataset} sink aborted after {self.rows_written} rows, partial files kept in {self.output_dir}")
+            self._finish_report(status='aborted')
+
+    def _finish_report(self, status: str = 'success') -> None:
+        """Save the run's stage timings next to its CSVs and publish freshness metrics"""
+        from instrumentation import finish_run_report
+        from manifest import month_code
+        from metrics import get_registry
+        months = [month_code(month) for month in self.month_counts if month_code(month).isdigit()]
+        if months:
+            get_registry().set('newest_month', int(max(months)), "Newest month (YYYYMM) written by the last run",
+                               dataset=self.dataset)
+        get_registry().set('changed_partitions', sum(1 for state in self.partitions.values() if state == 'changed'),
+                           "Partitions whose content changed in the last run", dataset=self.dataset)
+        finish_run_report(self.dataset, self.output_dir, status=status)
+
+
+def open_sink(dataset: str, default_prefix: str, fieldnames: List[str], league_field: str,
+              resume: bool = False) -> StreamingRowSink:
+    """Open a checkpointed streaming sink, resuming the latest interrupted run if asked"""
+    from checkpoint import load_checkpoint
+    from config_manager import get_config
+    config = get_config()
+    file_prefix = config.get('output', 'file_prefix', {}).get(dataset, default_prefix)
+    run = load_checkpoint(dataset, resume)
+    return StreamingRowSink(dataset, run['output_dir'], file_prefix, fieldnames, league_field,
+                            checkpoint=run['checkpoint'], resumed=run['resumed'],
+                            skip_unchanged=config.get_incremental_settings()['skip_unchanged'])
+
+
+def load_change_summaries(output_dir: str, since: str = None) -> List[Dict[str, Any]]:
+    """Read the changes_<dataset>.json summaries of a run, optionally only those finished after since"""
+    summaries = []
+    for path in sorted(glob.glob(os.path.join(output_dir, f"{CHANGES_PREFIX}*.json"))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+        except Exception as e:
+            logging.warning(f"Could not read change summary {path}: {e}")
+            continue
+        if since is None or summary.get('finished_at', '') >= since:
+            summaries.append(summary)
+    return summaries
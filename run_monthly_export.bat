@@ -10,22 +10,13 @@ cd /d "%~dp0"
 REM Create output directory if it doesn't exist
 if not exist "output" mkdir output
 
-REM Run all spiders
-echo Running fighting_stats spider...
-python -c "from spiders.fighting_stats_spider import FightingStatsSpider; spider = FightingStatsSpider(); spider.setup_selenium(None)" 2>&1
-echo Fighting stats spider exit code: %ERRORLEVEL%
+REM Run both spiders together in one Scrapy process
+echo Running fighting_stats and street_fighter_spider...
+python runner.py --status-file "output\runner_status.json" 2>&1
+echo Spider runner exit code: %ERRORLEVEL%
 
 if %ERRORLEVEL% NEQ 0 (
-    echo Error running fighting_stats spider with exit code %ERRORLEVEL%
-    goto :error
-)
-
-echo Running street_fighter_spider...
-python main.py 2>&1
-echo Street fighter spider exit code: %ERRORLEVEL%
-
-if %ERRORLEVEL% NEQ 0 (
-    echo Error running street_fighter_spider with exit code %ERRORLEVEL%
+    echo Error running spiders with exit code %ERRORLEVEL%, see output\runner_status.json
     goto :error
 )
 
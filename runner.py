@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unified spider runner for SF6 Analysis project
+Crawls the fighting stats and usage stats spiders together in one Scrapy process and reports a status per spider
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Any, List
+
+# Dataset -> (module, spider class)
+SPIDERS = {
+    'fighting_stats': ('spiders.fighting_stats_spider', 'FightingStatsSpider'),
+    'usage_stats': ('spiders.street_fighter_spider', 'StreetFighterSpider'),
+}
+
+
+def get_spider_class(dataset: str):
+    """Import a dataset's spider class only when it is about to be crawled"""
+    import importlib
+    module_name, class_name = SPIDERS[dataset]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def spider_status(dataset: str, crawler) -> Dict[str, Any]:
+    """Outcome of one finished crawl from its Scrapy stats and the spider's sink counts
+
+    'failed' means the crawl did not finish, a callback raised or a scrape unit failed, and
+    'no_data' that nothing was scraped. A run whose rows all matched the last run is a success
+    with rows_changed=0.
+    """
+    stats = crawler.stats.get_stats() if crawler.stats else {}
+    spider = getattr(crawler, 'spider', None)
+    finish_reason = stats.get('finish_reason')
+    # Newer Scrapy versions also keep a total next to the per-type counts
+    exceptions = stats.get('spider_exceptions/count', sum(
+        value for key, value in stats.items() if key.startswith('spider_exceptions/')))
+    rows_scraped = getattr(spider, 'rows_scraped', 0) if spider else 0
+    failed_units = list(getattr(spider, 'failed_units', [])) if spider else []
+
+    if finish_reason != 'finished' or exceptions or failed_units:
+        status = 'failed'
+    elif not rows_scraped:
+        status = 'no_data'
+    else:
+        status = 'success'
+    return {
+        'dataset': dataset,
+        'spider': spider.name if spider else None,
+        'status': status,
+        'finish_reason': finish_reason,
+        'rows_scraped': rows_scraped,
+        'rows_changed': getattr(spider, 'rows_written', 0) if spider else 0,
+        'failed_units': failed_units,
+        'errors': stats.get('log_count/ERROR', 0),
+        'spider_exceptions': exceptions,
+        'requests': stats.get('downloader/request_count', 0),
+        'elapsed_s': round(stats.get('elapsed_time_seconds', 0), 3),
+    }
+
+
+def run_crawl(datasets: List[str] = None, resume: bool = False) -> Dict[str, Any]:
+    """Crawl the given datasets (default: all) concurrently on one reactor and return their statuses
+
+    The reactor can only be started once per process, so call this at most once.
+    """
+    from scrapy.crawler import CrawlerProcess
+    from config import COMMON_SPIDER_SETTINGS
+    datasets = datasets or list(SPIDERS)
+
+    process = CrawlerProcess(settings=COMMON_SPIDER_SETTINGS)
+    crawlers = {}
+    for dataset in datasets:
+        crawler = process.create_crawler(get_spider_class(dataset))
+        process.crawl(crawler, resume=resume)
+        crawlers[dataset] = crawler
+
+    started_at = datetime.now().isoformat(timespec='seconds')
+    start = time.perf_counter()
+    logging.info(f"Crawling {', '.join(datasets)} in one process")
+    process.start()
+
+    spiders = {dataset: spider_status(dataset, crawler) for dataset, crawler in crawlers.items()}
+    return {
+        'started_at': started_at,
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'duration_s': round(time.perf_counter() - start, 3),
+        'status': 'success' if all(s['status'] == 'success' for s in spiders.values()) else 'failed',
+        'spiders': spiders
+    }
+
+
+def write_status(status: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--spider', action='append', choices=list(SPIDERS), dest='datasets',
+                        help="Dataset to crawl; repeat for several (default: all)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Resume the latest interrupted runs, skipping units recorded in their checkpoints")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Refetch index and still-changing months instead of using cached copies")
+    parser.add_argument('--status-file', help="Also write the run status as JSON to this file")
+
+
+def run(args: argparse.Namespace) -> int:
+    """Crawl, report and return the exit code (0 only if every spider succeeded)"""
+    from config import LOGGING_CONFIG
+    logging.basicConfig(**LOGGING_CONFIG)
+    if args.refresh:
+        from config_manager import get_config
+        get_config().config.setdefault('http_cache', {})['refresh'] = True
+
+    status = run_crawl(args.datasets, resume=args.resume)
+    if args.status_file:
+        write_status(status, args.status_file)
+    for result in status['spiders'].values():
+        logging.info(f"{result['dataset']}: {result['status']} ({result['finish_reason']}, "
+                     f"{result['rows_scraped']} rows scraped, {result['rows_changed']} changed, "
+                     f"{len(result['failed_units'])} failed units, {result['elapsed_s']:.1f}s)")
+    print(json.dumps(status, indent=2))
+    return 0 if status['status'] == 'success' else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the SF6 spiders together in one process")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -69,9 +69,9 @@ def main():
     print("\nNext steps:")
     print("1. Test the scrapers:")
     print("   run_monthly_export.bat")
-    print("2. Or run individually:")
-    print("   python -c \"from spiders.fighting_stats_spider import FightingStatsSpider; spider = FightingStatsSpider(); spider.setup_selenium(None)\"")
-    print("   python main.py")
+    print("2. Or run the spiders directly:")
+    print("   python runner.py                         # both spiders in one process")
+    print("   python runner.py --spider fighting_stats")
     print("3. Set up automated scheduling if desired (see setup_task_scheduler.md)")
 
 if __name__ == '__main__':
@@ -0,0 +1,3 @@
+@echo off
+REM sf6 command: scrape, export, query or schedule (see python sf6.py --help)
+python "%~dp0sf6.py" %*
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Command line entry point for SF6 Analysis project
+One command for scraping, exporting, querying and scheduling; Scrapy and Selenium load only when a subcommand needs them
+"""
+
+import argparse
+import sys
+
+
+def cmd_scrape(args):
+    from runner import run
+    return run(args)
+
+
+def cmd_export(args):
+    import monthly_scheduler
+    monthly_scheduler.setup_logging()
+    if args.when == 'new_data':
+        monthly_scheduler.poll_for_new_data()
+        return 0
+    status = monthly_scheduler.run_sf6_export(force=args.when == 'now')
+    print(status)
+    return 1 if status == 'failed' else 0
+
+
+def cmd_query(args):
+    import csv
+    import sqlite3
+    import queries
+    try:
+        if args.query == 'matchup':
+            rows = queries.matchup(args.character, args.opponent, league=args.league, path=args.db)
+        elif args.query == 'usage-trend':
+            rows = queries.usage_trend(args.character, league=args.league, path=args.db)
+        else:
+            rows = queries.top_n(args.n, month=args.month, league=args.league, path=args.db)
+    except sqlite3.OperationalError as e:
+        print(f"Cannot query the SQLite output ({e}). Add \"sqlite\" to output.backends in config.json "
+              "and run a scrape to create it.", file=sys.stderr)
+        return 1
+
+    if rows:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    return 0 if rows else 1
+
+
+def cmd_schedule(args):
+    import monthly_scheduler
+    if args.check:
+        # Date check only: no config, logging or scheduler loop
+        due = monthly_scheduler.is_second_friday()
+        print("Today is the 2nd Friday, the monthly export is due" if due else "Today is not the 2nd Friday")
+        return 0 if due else 1
+    monthly_scheduler.main(['--mode', args.mode] if args.mode else [])
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='sf6', description="Street Fighter 6 stats scraper")
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    scrape = commands.add_parser('scrape', help="Run the spiders (both by default) in one process")
+    # runner has no module-level imports beyond the standard library
+    from runner import add_arguments
+    add_arguments(scrape)
+    scrape.set_defaults(handler=cmd_scrape)
+
+    export = commands.add_parser('export', help="Run the monthly export: scrape, then the downstream refresh")
+    export.add_argument('--when', choices=['now', 'second_friday', 'new_data'], default='now',
+                        help="Export unconditionally (default), only on the 2nd Friday, or only if a probe finds new data")
+    export.set_defaults(handler=cmd_export)
+
+    query = commands.add_parser('query', help="Look up stats in the SQLite output as CSV")
+    query.add_argument('--db', help="SQLite file (default: output.sqlite_path from config)")
+    lookups = query.add_subparsers(dest='query', metavar='lookup', required=True)
+    matchup = lookups.add_parser('matchup', help="A character's value against an opponent per month")
+    matchup.add_argument('character')
+    matchup.add_argument('opponent')
+    matchup.add_argument('--league')
+    trend = lookups.add_parser('usage-trend', help="A character's rank and usage per month")
+    trend.add_argument('character')
+    trend.add_argument('--league')
+    top = lookups.add_parser('top-n', help="Most used characters of a month")
+    top.add_argument('n', type=int, nargs='?', default=10)
+    top.add_argument('--month', help="MM/YYYY or YYYYMM (default: newest)")
+    top.add_argument('--league', default='Master')
+    query.set_defaults(handler=cmd_query)
+
+    schedule = commands.add_parser('schedule', help="Run the export scheduler loop")
+    schedule.add_argument('--mode', choices=['second_friday', 'poll'],
+                          help="Fire on the 2nd Friday of each month, or poll for new data (default: from config)")
+    schedule.add_argument('--check', action='store_true',
+                          help="Only report whether today is the 2nd Friday (exit code 0 if so)")
+    schedule.set_defaults(handler=cmd_schedule)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
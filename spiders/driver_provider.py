@@ -0,0 +1,205 @@
+"""
+Shared Firefox driver provider
+Installs geckodriver once per process and hands out warm, lean-profile browser sessions to both spiders
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import threading
+from urllib.parse import quote
+
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.firefox.service import Service
+
+_geckodriver_path = None
+_geckodriver_checked = False
+_install_lock = threading.Lock()
+
+
+def install_geckodriver():
+    """Install and validate geckodriver once, returning its path (None lets Selenium locate it)"""
+    global _geckodriver_path, _geckodriver_checked
+    with _install_lock:
+        if _geckodriver_checked:
+            return _geckodriver_path
+        _geckodriver_checked = True
+
+        path = None
+        try:
+            import geckodriver_autoinstaller
+            path = geckodriver_autoinstaller.install()
+        except Exception as e:
+            logging.warning(f"geckodriver auto-install failed: {e}")
+        path = path or shutil.which('geckodriver')
+
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            _geckodriver_path = path
+            logging.info(f"Using geckodriver at {path}")
+        else:
+            logging.warning("No usable geckodriver found, leaving driver lookup to Selenium")
+        return _geckodriver_path
+
+
+def blocked_hosts_pac(blocked_hosts):
+    """Build a data: URL proxy auto-config script that sends blocked hosts to a dead proxy"""
+    conditions = ' || '.join(
+        f"host == '{host}' || dnsDomainIs(host, '.{host}')" for host in blocked_hosts
+    )
+    script = (
+        "function FindProxyForURL(url, host) {"
+        f" if ({conditions}) {{ return 'PROXY 127.0.0.1:9'; }}"
+        " return 'DIRECT'; }"
+    )
+    return f"data:text/javascript,{quote(script)}"
+
+
+def apply_profile(options, profile):
+    """Apply browser_profile settings (see ConfigManager.get_browser_profile) to Firefox options"""
+    if profile.get('block_images'):
+        # Character portraits are most of the bytes; header alt text is still in the DOM
+        options.set_preference('permissions.default.image', 2)
+    if profile.get('block_media'):
+        options.set_preference('media.autoplay.default', 5)
+        options.set_preference('media.autoplay.blocking_policy', 2)
+    if profile.get('block_fonts'):
+        options.set_preference('gfx.downloadable_fonts.enabled', False)
+    if profile.get('tracking_protection'):
+        options.set_preference('privacy.trackingprotection.enabled', True)
+        options.set_preference('privacy.trackingprotection.socialtracking.enabled', True)
+    if profile.get('blocked_hosts'):
+        options.set_preference('network.proxy.type', 2)
+        options.set_preference('network.proxy.autoconfig_url', blocked_hosts_pac(profile['blocked_hosts']))
+    if profile.get('cache'):
+        options.set_preference('browser.cache.disk.enable', True)
+        options.set_preference('browser.cache.memory.enable', True)
+    if profile.get('lean'):
+        # No background update, telemetry or prefetch traffic competing with the page
+        options.set_preference('app.update.auto', False)
+        options.set_preference('toolkit.telemetry.enabled', False)
+        options.set_preference('datareporting.healthreport.uploadEnabled', False)
+        options.set_preference('network.prefetch-next', False)
+    options.page_load_strategy = profile.get('page_load_strategy', 'normal')
+    return options
+
+
+class DriverProvider:
+    """Keeps idle Firefox sessions warm and hands them out per headless flag
+
+    acquire() returns an idle session when one exists, otherwise starts a new one.
+    release() resets cookies, storage and the current page before keeping the session
+    for the next caller; sessions beyond max_idle (or that fail to reset) are quit.
+    """
+
+    def __init__(self, window_width=1920, window_height=1080, reuse_sessions=True, max_idle=2, profile=None):
+        self.window_width = window_width
+        self.window_height = window_height
+        self.reuse_sessions = reuse_sessions
+        self.max_idle = max_idle
+        self.profile = profile or {}
+        self._idle = {True: [], False: []}
+        self._headless = {}
+        self._lock = threading.Lock()
+
+    def is_headless(self, headless=False):
+        """The lean profile runs every session headless regardless of what the caller asked for"""
+        return bool(headless or self.profile.get('headless'))
+
+    def build_options(self, headless=False):
+        options = Options()
+        options.add_argument(f"--width={self.window_width}")
+        options.add_argument(f"--height={self.window_height}")
+        if headless:
+            options.add_argument("--headless")
+        apply_profile(options, self.profile)
+        return options
+
+    def _start_driver(self, headless):
+        geckodriver_path = install_geckodriver()
+        options = self.build_options(headless)
+        if geckodriver_path:
+            driver = webdriver.Firefox(service=Service(geckodriver_path), options=options)
+        else:
+            driver = webdriver.Firefox(options=options)
+        logging.info(f"Started {'headless ' if headless else ''}Firefox session")
+        return driver
+
+    def acquire(self, headless=False):
+        """Get a ready Firefox session, reusing a warm one when available"""
+        headless = self.is_headless(headless)
+        with self._lock:
+            driver = self._idle[headless].pop() if self._idle[headless] else None
+        if driver is not None:
+            logging.info(f"Reusing warm {'headless ' if headless else ''}Firefox session")
+        else:
+            driver = self._start_driver(headless)
+        with self._lock:
+            self._headless[id(driver)] = headless
+        return driver
+
+    def reset(self, driver):
+        """Clear cookies, web storage and the loaded page so the next user starts clean"""
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # about:blank and some error pages have no storage
+            pass
+        driver.get("about:blank")
+
+    def release(self, driver):
+        """Return a session to the warm pool, or quit it if the pool is full or reset fails"""
+        if driver is None:
+            return
+        with self._lock:
+            headless = self._headless.pop(id(driver), False)
+            keep = self.reuse_sessions and len(self._idle[headless]) < self.max_idle
+        if keep:
+            try:
+                self.reset(driver)
+                with self._lock:
+                    self._idle[headless].append(driver)
+                return
+            except Exception as e:
+                logging.warning(f"Could not reset Firefox session, quitting it: {e}")
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting Firefox session: {e}")
+
+    def shutdown(self):
+        """Quit every idle session"""
+        with self._lock:
+            drivers = self._idle[True] + self._idle[False]
+            self._idle = {True: [], False: []}
+        for driver in drivers:
+            self._quit(driver)
+        if drivers:
+            logging.info(f"Closed {len(drivers)} warm Firefox sessions")
+
+
+# Global provider instance
+_provider_instance = None
+_provider_lock = threading.Lock()
+
+def get_driver_provider() -> DriverProvider:
+    """Get the process-wide driver provider configured from the selenium config section"""
+    global _provider_instance
+    with _provider_lock:
+        if _provider_instance is None:
+            from config_manager import get_config
+            settings = get_config().get_driver_settings()
+            _provider_instance = DriverProvider(
+                window_width=settings['window_width'],
+                window_height=settings['window_height'],
+                reuse_sessions=settings['reuse_sessions'],
+                max_idle=settings['max_idle_drivers'],
+                profile=get_config().get_browser_profile()
+            )
+            atexit.register(_provider_instance.shutdown)
+        return _provider_instance
@@ -1,25 +1,99 @@
 import scrapy
 import json
-import csv
-import os
 import re
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import logging
+from spiders import rate_controller, readiness
+
+# Verified character order from the fighting stats website span elements
+# Both rows and columns follow this same order
+DEFAULT_CHARACTER_ORDER = [
+    "elena", "e. honda", "dhalsim", "kimberly", "jp", "dee jay", "terry", "luke",
+    "marisa", "blanka", "lily", "a.k.i.", "chun-li", "m. bison", "rashid", "jamie",
+    "guile", "juri", "ken", "ryu", "cammy", "mai", "manon", "ed", "akuma", "zangief"
+]
+
+# Column order of the fighting stats CSV files
+FIGHTING_STATS_FIELDS = [
+    'character_name', 'month', 'league', 'row_type', 'value', 'row_index', 'column_index', 'source'
+]
+
+# Reads the whole matchup grid in a single WebDriver round-trip.
+# textContent is used instead of innerText so cells scrolled out of view are still read.
+TABLE_EXTRACTION_SCRIPT = """
+var table = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!table) {
+    return null;
+}
+var clean = function (node) {
+    return node ? (node.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+};
+var headers = [];
+var headRow = table.querySelector('thead tr');
+if (headRow) {
+    headRow.querySelectorAll('th').forEach(function (th) {
+        var img = th.querySelector('img');
+        headers.push(clean(th) || (img ? (img.getAttribute('alt') || '') : ''));
+    });
+}
+var rows = [];
+table.querySelectorAll('tbody tr').forEach(function (tr) {
+    var cells = [];
+    tr.querySelectorAll('td').forEach(function (td) {
+        cells.push(clean(td));
+    });
+    rows.push({name: clean(tr.querySelector('th div span')), cells: cells});
+});
+return {headers: headers, rows: rows};
+"""
+
+def table_grid_from_html(page_source, table_xpath):
+    """Build the same {headers, rows} grid as TABLE_EXTRACTION_SCRIPT from static HTML"""
+    from scrapy.selector import Selector
+    tables = Selector(text=page_source).xpath(table_xpath)
+    if not tables:
+        return None
+    table = tables[0]
+
+    def clean(nodes):
+        # Concatenate text nodes like textContent, then collapse whitespace
+        return ' '.join(''.join(nodes.xpath('.//text()').getall()).split()) if nodes else ''
+
+    headers = []
+    for th in table.xpath('(.//thead//tr)[1]//th'):
+        headers.append(clean(th) or (th.xpath('.//img/@alt').get() or ''))
+
+    rows = []
+    for tr in table.xpath('.//tbody//tr'):
+        rows.append({
+            'name': clean(tr.xpath('(.//th//div//span)[1]')),
+            'cells': [clean(td) for td in tr.xpath('.//td')]
+        })
+    return {'headers': headers, 'rows': rows}
 
 class FightingStatsSpider(scrapy.Spider):
     name = 'fighting_stats'
+    dataset = 'fighting_stats'
     allowed_domains = ['streetfighter.com']
     start_urls = ['https://www.streetfighter.com/6/buckler/stats/dia_master']
     
-    def __init__(self):
+    def __init__(self, resume=False):
         self.driver = None
-        self.base_url = "https://www.streetfighter.com/6/buckler/stats/dia_master"
+        self.displayed_league_index = None  # League li whose table is on screen, None if unknown
+        self.archive_dir = None  # Output folder whose page archive receives parsed pages
+        self.rows_scraped = 0
+        self.rows_written = 0  # Rows of changed partitions
+        self.failed_units = []
+        self.resume = resume in (True, 'true', 'True', '1', 1)  # Scrapy passes -a resume=1 as a string
+        from config_manager import get_config
+        from urllib.parse import urlparse
+        self.base_url = get_config().get_urls()['fighting_stats_base']
+        self.start_urls = [self.base_url]
+        self.allowed_domains = [urlparse(self.base_url).hostname]
+        self.table_xpath = "//*[@id='tableArea']/div[1]/table[1]"
         
         # Setup logging
         logging.basicConfig(
@@ -32,35 +106,68 @@ class FightingStatsSpider(scrapy.Spider):
         )
         self.custom_logger = logging.getLogger(__name__)
         
+    async def start(self):
+        # Scrapy 2.13+ entry point; start_requests() is kept for older versions
+        for request in self.start_requests():
+            yield request
+    
     def start_requests(self):
         yield scrapy.Request(
             url=self.start_urls[0],
-            callback=self.setup_selenium,
+            callback=self.parse,
             dont_filter=True
         )
     
+    async def parse(self, response):
+        """Run the browser scrape off the reactor thread, so a usage spider in the same process keeps crawling"""
+        from spiders.worker_pool import run_off_reactor
+        await run_off_reactor(self.setup_selenium, response)
+    
+    @property
+    def report(self):
+        """Run report receiving this spider's stage timings"""
+        from instrumentation import get_run_report
+        return get_run_report(self.dataset)
+    
+    def create_driver(self, headless=False):
+        """Get a Firefox WebDriver sized for the full matchup table from the shared provider"""
+        from spiders.driver_provider import get_driver_provider
+        with self.report.stage('driver_start'):
+            return get_driver_provider().acquire(headless=headless)
+    
+    def close_driver(self):
+        """Hand the WebDriver back to the shared provider for reuse"""
+        if self.driver:
+            from spiders.driver_provider import get_driver_provider
+            get_driver_provider().release(self.driver)
+            self.driver = None
+    
     def setup_selenium(self, response):
-        self.custom_logger.info("Setting up Selenium WebDriver")
+        from config_manager import get_config
+        from instrumentation import start_run_report
+        start_run_report(self.dataset)
+        if get_config().get_worker_pool_settings()['workers'] > 1:
+            # Pool workers start their own browsers
+            return self.scrape_all_months()
         
-        firefox_options = Options()
-        firefox_options.add_argument("--width=1920")
-        firefox_options.add_argument("--height=1080")
+        self.custom_logger.info("Setting up Selenium WebDriver")
         
         try:
-            self.driver = webdriver.Firefox(options=firefox_options)
-            self.driver.get(self.start_urls[0])
+            self.driver = self.create_driver()
+            rate_controller.navigate(self.driver, self.start_urls[0], self.report)
             
             # Wait for page to load
-            time.sleep(3.0)
+            with self.report.stage('readiness_wait'):
+                readiness.wait_for_document_ready(self.driver)
             
             self.custom_logger.info("Page loaded, proceeding with scraping...")
             return self.scrape_all_months()
             
         except Exception as e:
             self.custom_logger.error(f"Error setting up Selenium: {str(e)}")
-            if self.driver:
-                self.driver.quit()
-            return []
+            self.close_driver()
+            # Re-raised so the crawl is reported as failed rather than as finding no data
+            raise
     
     def discover_available_months(self):
         """Discover available months from the page"""
@@ -95,11 +202,12 @@ class FightingStatsSpider(scrapy.Spider):
             return []
     
     def scrape_all_months(self):
-        """Scrape data from multiple months using correct YYYYMM URL format"""
+        """Scrape data from multiple months using correct YYYYMM URL format
+
+        Each (month, league) batch is streamed to disk as soon as it is parsed.
+        """
         self.custom_logger.info("Scraping from multiple months with correct URL format")
         
-        all_data = []
-        
         # Define months to scrape (YYYYMM format) - All available months
         months_to_scrape = [
             ("202502", "02/2025"),
@@ -117,55 +225,221 @@ class FightingStatsSpider(scrapy.Spider):
             (4, "Ultimate Master")
         ]
         
-        for month_code, month_name in months_to_scrape:
-            try:
-                self.custom_logger.info(f"Scraping {month_name}")
-                
-                # Construct URL with correct YYYYMM format
-                month_url = f"{self.base_url}/{month_code}"
-                self.custom_logger.info(f"Navigating to: {month_url}")
-                
-                # Navigate to the month-specific URL
-                self.driver.get(month_url)
-                time.sleep(5)  # Wait for page to load
-                
-                # Check that we're on the right page
-                current_url = self.driver.current_url
-                self.custom_logger.info(f"Current URL after navigation: {current_url}")
-                
-                # Scrape all leagues for this month
-                for league_index, league_name in leagues_to_scrape:
+        # Pick up months published since the list above was written
+        if self.driver:
+            for month in self.discover_available_months():
+                month_parts = month['text'].split('/')
+                if len(month_parts) == 2 and all(part.isdigit() for part in month_parts):
+                    discovered = (f"{month_parts[1]}{month_parts[0]}", month['text'])
+                    if discovered not in months_to_scrape:
+                        months_to_scrape.append(discovered)
+            months_to_scrape.sort()
+        
+        # Only fetch new months, the still-changing newest month and months due for re-verification
+        from manifest import get_manifest
+        months_to_scrape = get_manifest().months_to_scrape(
+            'fighting_stats', months_to_scrape, [league_name for _, league_name in leagues_to_scrape]
+        )
+        
+        from config_manager import get_config
+        pool_settings = get_config().get_worker_pool_settings()
+        sink = self.open_sink()
+        self.archive_dir = sink.output_dir
+        try:
+            if pool_settings['workers'] > 1:
+                self.scrape_with_worker_pool(months_to_scrape, leagues_to_scrape, pool_settings, sink=sink)
+            else:
+                for month_code, month_name in months_to_scrape:
                     try:
-                        self.custom_logger.info(f"Scraping {league_name} for {month_name}")
+                        # Units finished by an interrupted earlier attempt are skipped on resume
+                        pending_leagues = [
+                            (league_index, league_name) for league_index, league_name in leagues_to_scrape
+                            if not sink.is_done(self.unit_key(month_name, league_name))
+                        ]
+                        if not pending_leagues:
+                            self.custom_logger.info(f"Skipping {month_name}: all leagues completed in checkpoint")
+                            continue
                         
-                        # Click on the league selection
-                        self.select_league(league_index, league_name)
+                        # Leagues of a finished month with a rendered copy in the page cache don't need the browser
+                        uncached_leagues = []
+                        for league_index, league_name in pending_leagues:
+                            cached_data = self.scrape_cached_league(month_name, league_name)
+                            if cached_data:
+                                sink.write_batch(cached_data, unit_key=self.unit_key(month_name, league_name))
+                            else:
+                                uncached_leagues.append((league_index, league_name))
+                        pending_leagues = uncached_leagues
+                        if not pending_leagues:
+                            continue
                         
-                        # Parse data from this month and league
-                        month_league_data = self.parse_fighting_stats_data(month_name, league_name)
-                        all_data.extend(month_league_data)
+                        self.custom_logger.info(f"Scraping {month_name}")
+                        with self.report.unit(month_name):
+                            self.navigate_to_month(month_code)
                         
-                        self.custom_logger.info(f"Extracted {len(month_league_data)} entries from {month_name} {league_name}")
+                        # Scrape all leagues for this month
+                        for league_index, league_name in pending_leagues:
+                            try:
+                                sink.write_batch(self.scrape_league(month_name, league_index, league_name),
+                                                 unit_key=self.unit_key(month_name, league_name))
+                            except Exception as e:
+                                self.custom_logger.error(f"Error scraping {league_name} for {month_name}: {str(e)}")
+                                sink.mark_failed(self.unit_key(month_name, league_name))
+                                continue
                         
                     except Exception as e:
-                        self.custom_logger.error(f"Error scraping {league_name} for {month_name}: {str(e)}")
+                        self.custom_logger.error(f"Error scraping {month_name}: {str(e)}")
+                        for league_index, league_name in pending_leagues:
+                            if not sink.is_done(self.unit_key(month_name, league_name)):
+                                sink.mark_failed(self.unit_key(month_name, league_name))
                         continue
-                
-            except Exception as e:
-                self.custom_logger.error(f"Error scraping {month_name}: {str(e)}")
-                continue
+            
+            # Move the streamed CSV files into place
+            sink.commit()
+        except BaseException:
+            sink.abort()
+            raise
+        finally:
+            self.close_driver()
+        
+        self.rows_scraped = sink.rows_scraped
+        self.rows_written = sink.rows_written
+        self.failed_units = list(sink.failed_units)
+        self.custom_logger.info(f"Streamed {sink.rows_written} entries to {sink.output_dir}")
+        # Rows were written batch by batch, so there is nothing left to hand back
+        return []
+    
+    def open_sink(self):
+        """Open a streaming sink for fighting stats rows, resuming an interrupted run if requested"""
+        from row_sink import open_sink
+        return open_sink('fighting_stats', 'fighting_stats', FIGHTING_STATS_FIELDS, 'league', resume=self.resume)
+    
+    @staticmethod
+    def unit_key(month_name, league_name):
+        """Checkpoint key of one (month, league) scrape unit"""
+        return f"{month_name}|{league_name}"
+    
+    def navigate_to_month(self, month_code):
+        """Load the month-specific page and wait for the table to render"""
+        # Construct URL with correct YYYYMM format
+        month_url = f"{self.base_url}/{month_code}"
+        self.custom_logger.info(f"Navigating to: {month_url}")
         
-        # Write CSV files
-        self.write_csv_files(all_data)
+        # Navigate to the month-specific URL
+        rate_controller.navigate(self.driver, month_url, self.report)
+        with self.report.stage('readiness_wait'):
+            readiness.wait_for_document_ready(self.driver)
+            readiness.wait_for_stable_count(self.driver, f"{self.table_xpath}/tbody/tr")
+        # A freshly loaded month page shows the first league
+        self.displayed_league_index = 1
         
-        if self.driver:
-            self.driver.quit()
+        # Check that we're on the right page
+        current_url = self.driver.current_url
+        self.custom_logger.info(f"Current URL after navigation: {current_url}")
+    
+    def scrape_league(self, month_name, league_index, league_name):
+        """Select a league on the current month page and parse its table"""
+        self.custom_logger.info(f"Scraping {league_name} for {month_name}")
+        
+        with self.report.unit(month_name, league_name):
+            # Click on the league selection
+            with self.report.stage('league_click'):
+                self.select_league(league_index, league_name)
+            
+            # Parse data from this month and league
+            month_league_data = self.parse_fighting_stats_data(month_name, league_name)
+            self.custom_logger.info(f"Extracted {len(month_league_data)} entries from {month_name} {league_name}")
+            self.report.count('rows_extracted', len(month_league_data))
+            
+            # Keep the rendered table for later runs, offline parser runs and backfills when enabled
+            if month_league_data:
+                from fixtures import snapshot_page
+                from page_cache import save_rendered_page
+                page_source = self.driver.page_source
+                with self.report.stage('archive'):
+                    snapshot_page('fighting_stats', month_name, league_name, page_source,
+                                  self.driver.current_url, output_dir=self.archive_dir)
+                with self.report.stage('cache'):
+                    save_rendered_page(self.rendered_page_url(month_name, league_name), page_source)
+        return month_league_data
+    
+    def rendered_page_url(self, month_name, league_name):
+        """Page cache key of one league's rendered table (the league is picked by a click, not the URL)"""
+        from manifest import month_code
+        return f"{self.base_url}/{month_code(month_name)}#{league_name}"
+    
+    def scrape_cached_league(self, month_name, league_name):
+        """Parse a league's table from a final rendered copy in the page cache, or return None"""
+        from page_cache import load_rendered_page
+        page_url = self.rendered_page_url(month_name, league_name)
+        page_source = load_rendered_page(page_url)
+        if page_source is None:
+            return None
+        
+        with self.report.unit(month_name, league_name):
+            from fixtures import snapshot_page
+            with self.report.stage('archive'):
+                snapshot_page('fighting_stats', month_name, league_name, page_source, page_url,
+                              output_dir=self.archive_dir)
+            with self.report.stage('extract'):
+                month_league_data = self.extract_table_data_html(page_source, month_name, league_name)
+            self.custom_logger.info(f"Extracted {len(month_league_data)} entries from cached {month_name} {league_name}")
+            self.report.count('rows_extracted', len(month_league_data))
+            self.report.count('cache_hits')
+        # An empty table is scraped again rather than trusted
+        return month_league_data or None
+    
+    def scrape_with_worker_pool(self, months_to_scrape, leagues_to_scrape, pool_settings, sink=None):
+        """Scrape every (month, league) pair across a pool of headless browsers
+
+        With a sink, completed units are skipped and each result is streamed to it as it arrives.
+        """
+        from spiders.worker_pool import BrowserWorkerPool, WorkItem
+        
+        work_items = []
+        for month_code, month_name in months_to_scrape:
+            for league_index, league_name in leagues_to_scrape:
+                if sink and sink.is_done(self.unit_key(month_name, league_name)):
+                    continue
+                work_items.append(WorkItem(
+                    index=len(work_items),
+                    url=f"{self.base_url}/{month_code}",
+                    month_code=month_code,
+                    month_name=month_name,
+                    league_index=league_index,
+                    league_name=league_name
+                ))
         
-        return all_data
+        def create_worker():
+            worker = FightingStatsSpider()
+            worker.archive_dir = sink.output_dir if sink else None
+            worker.driver = worker.create_driver(headless=pool_settings['headless'])
+            return worker
+        
+        def scrape_item(worker, item):
+            cached_data = worker.scrape_cached_league(item.month_name, item.league_name)
+            if cached_data:
+                return cached_data
+            with worker.report.unit(item.month_name):
+                worker.navigate_to_month(item.month_code)
+            return worker.scrape_league(item.month_name, item.league_index, item.league_name)
+        
+        pool = BrowserWorkerPool(
+            create_worker, scrape_item,
+            num_workers=pool_settings['workers']
+        )
+        if sink:
+            results = pool.run(work_items, on_result=lambda item, rows: sink.write_batch(
+                rows, unit_key=self.unit_key(item.month_name, item.league_name)))
+            for item in pool.failed_items:
+                sink.mark_failed(self.unit_key(item.month_name, item.league_name))
+            return results
+        return pool.run(work_items)
     
 
     def select_league(self, league_index, league_name):
         """Select a specific league from the aside navigation"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
         try:
             # Wait for the league selection area to be present
             aside_xpath = "/html/body/div/div/article[2]/aside[2]"
@@ -180,7 +454,10 @@ class FightingStatsSpider(scrapy.Spider):
             # Scroll to element to ensure it's visible
             league_element = self.driver.find_element(By.XPATH, league_li_xpath)
             self.driver.execute_script("arguments[0].scrollIntoView(true);", league_element)
-            time.sleep(1)
+            
+            # Remember the table contents and URL so we can tell when the new league has rendered
+            previous_text = readiness.get_text(self.driver, f"{self.table_xpath}/tbody")
+            previous_url = self.driver.current_url
             
             # Try to click the element, use JavaScript if normal click fails
             try:
@@ -189,13 +466,23 @@ class FightingStatsSpider(scrapy.Spider):
                 self.custom_logger.warning(f"Normal click failed, trying JavaScript click: {click_error}")
                 self.driver.execute_script("arguments[0].click();", league_element)
             
-            # Wait for the table to update after league selection
-            time.sleep(3)
+            # Wait for the table to update after league selection (or for the short
+            # option_change_timeout if the league was already shown), then for its rows to settle
+            tbody_xpath = f"{self.table_xpath}/tbody"
+            changed = readiness.wait_for_click_effect(self.driver, tbody_xpath, previous_text, previous_url)
+            # Every league has the same rows, so a table that never changed after switching
+            # leagues still holds the previous league's data; give it content_change_timeout more
+            if (not changed and league_index != self.displayed_league_index
+                    and not readiness.wait_for_text_change(self.driver, tbody_xpath, previous_text)):
+                raise TimeoutException(f"Table did not change after selecting {league_name}")
+            self.displayed_league_index = league_index
+            readiness.wait_for_stable_count(self.driver, f"{self.table_xpath}/tbody/tr")
             
             self.custom_logger.info(f"Successfully selected {league_name}")
             
         except Exception as e:
             self.custom_logger.error(f"Error selecting league {league_name}: {str(e)}")
+            self.displayed_league_index = None
             raise
     
     def scroll_to_load_full_table(self):
@@ -251,7 +538,7 @@ class FightingStatsSpider(scrapy.Spider):
                 self.custom_logger.warning(f"Single drag failed: {drag_error}")
             
             # Give time for content to fully load
-            time.sleep(1)
+            readiness.wait_for_stable_count(self.driver, f"{table_xpath}/tbody/tr/td")
             
             # Now position back to the very beginning to see early characters
             self.custom_logger.info("Positioning back to beginning to show early characters...")
@@ -281,20 +568,35 @@ class FightingStatsSpider(scrapy.Spider):
     
     def parse_fighting_stats_data(self, month, league="Master"):
         """Parse the tabular fighting stats data using two-pass approach"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
         try:
             # Wait for table to load with longer timeout - using correct table ID
             table_xpath = "//*[@id='tableArea']/div[1]/table[1]"
             self.custom_logger.info(f"Waiting for table to load: {table_xpath}")
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, table_xpath))
-            )
+            with self.report.stage('readiness_wait'):
+                WebDriverWait(self.driver, 20).until(
+                    EC.presence_of_element_located((By.XPATH, table_xpath))
+                )
+
+            # Fast path: read the whole grid with one script call
+            from config_manager import get_config
+            if get_config().get_table_extraction_mode() == 'script':
+                with self.report.stage('extract'):
+                    script_data = self.extract_table_data_script(table_xpath, month, league)
+                if script_data:
+                    self.custom_logger.info(f"Successfully extracted {len(script_data)} data points for {month} (single script call)")
+                    return script_data
+                self.custom_logger.warning("Script extraction returned no data, falling back to two-pass extraction")
+
             self.custom_logger.info("Table found, proceeding with two-pass data extraction")
-            
+
             # Initial setup - ensure we're positioned at the beginning
             table = self.driver.find_element(By.XPATH, table_xpath)
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", table)
-            self.driver.execute_script("arguments[0].scrollLeft = 0;", table)
-            time.sleep(1)
+            with self.report.stage('table_scroll'):
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", table)
+                self.driver.execute_script("arguments[0].scrollLeft = 0;", table)
+                readiness.wait_for_stable_count(self.driver, f"{table_xpath}/tbody/tr/td")
             
             # Extract character names from header images
             character_names = self.extract_character_names()
@@ -302,25 +604,29 @@ class FightingStatsSpider(scrapy.Spider):
             
             # FIRST PASS: Extract from initial position (early characters)
             self.custom_logger.info("FIRST PASS: Extracting early characters from initial position")
-            first_pass_data = self.extract_table_data(table_xpath, character_names, month, league, "first_pass")
+            with self.report.stage('extract'):
+                first_pass_data = self.extract_table_data(table_xpath, character_names, month, league, "first_pass")
             
             # Drag right to reveal late characters
             self.custom_logger.info("Dragging right to reveal late characters...")
             from selenium.webdriver.common.action_chains import ActionChains
             actions = ActionChains(self.driver)
             try:
-                actions.move_to_element(table).click_and_hold().move_by_offset(-850, 0).release().perform()
-                time.sleep(1)
+                with self.report.stage('table_scroll'):
+                    actions.move_to_element(table).click_and_hold().move_by_offset(-850, 0).release().perform()
+                    readiness.wait_for_stable_count(self.driver, f"{table_xpath}/tbody/tr/td")
                 self.custom_logger.info("Successfully dragged to show late characters")
             except Exception as drag_error:
                 self.custom_logger.warning(f"Drag failed: {drag_error}")
             
             # SECOND PASS: Extract from shifted position (late characters)
             self.custom_logger.info("SECOND PASS: Extracting late characters from shifted position")
-            second_pass_data = self.extract_table_data(table_xpath, character_names, month, league, "second_pass")
+            with self.report.stage('extract'):
+                second_pass_data = self.extract_table_data(table_xpath, character_names, month, league, "second_pass")
             
             # Combine and deduplicate data
-            combined_data = self.deduplicate_table_data(first_pass_data + second_pass_data)
+            with self.report.stage('dedupe'):
+                combined_data = self.deduplicate_table_data(first_pass_data + second_pass_data)
             
             self.custom_logger.info(f"Successfully extracted {len(combined_data)} data points for {month} (after deduplication)")
             return combined_data
@@ -357,55 +663,100 @@ class FightingStatsSpider(scrapy.Spider):
                     
                     # Get all td elements for this row
                     cells = row.find_elements(By.TAG_NAME, "td")
-                    
+                    cell_values = [cell.text.strip() for cell in cells]
+
                     # Extract data for each character
-                    for cell_index, cell in enumerate(cells):
-                        cell_value = cell.text.strip()
-                        
-                        if cell_index == 0:
-                            # First column is the character's total stats
-                            data.append({
-                                'character_name': 'TOTAL',
-                                'month': month,
-                                'league': league,
-                                'row_type': row_character,
-                                'value': cell_value,
-                                'row_index': row_index + 1,
-                                'column_index': cell_index + 1,
-                                'source': f'tabular_extraction_{pass_name}'
-                            })
-                        else:
-                            # Matchup columns start at index 1
-                            matchup_index = cell_index - 1
-                            if matchup_index < len(character_names):
-                                column_character = character_names[matchup_index]
-                                
-                                data.append({
-                                    'character_name': column_character.upper(),
-                                    'month': month,
-                                    'league': league,
-                                    'row_type': row_character,
-                                    'value': cell_value,
-                                    'row_index': row_index + 1,
-                                    'column_index': cell_index + 1,
-                                    'source': f'tabular_extraction_{pass_name}'
-                                })
-                    
+                    data.extend(self.build_row_entries(
+                        row_index, row_character, cell_values, character_names,
+                        month, league, f'tabular_extraction_{pass_name}'
+                    ))
+
                     # Log sample for first row
-                    if row_index == 0 and len(cells) > 0:
-                        self.custom_logger.info(f"{pass_name} - First row sample - {row_character}: {cells[0].text[:50]}...")
-                
+                    if row_index == 0 and len(cell_values) > 0:
+                        self.custom_logger.info(f"{pass_name} - First row sample - {row_character}: {cell_values[0][:50]}...")
+
                 except Exception as e:
                     self.custom_logger.warning(f"{pass_name}: Error processing row {row_index}: {str(e)}")
                     continue
-            
+
             self.custom_logger.info(f"{pass_name}: Extracted {len(data)} data points")
             return data
-            
+
         except Exception as e:
             self.custom_logger.error(f"{pass_name}: Error extracting table data: {str(e)}")
             return []
-    
+
+    def extract_table_data_script(self, table_xpath, month, league):
+        """Extract the full table (headers, row names and cells) with one execute_script call"""
+        try:
+            grid = self.driver.execute_script(TABLE_EXTRACTION_SCRIPT, table_xpath)
+            return self.parse_table_grid(grid, month, league)
+        except Exception as e:
+            self.custom_logger.error(f"script: Error extracting table data: {str(e)}")
+            return []
+
+    def extract_table_data_html(self, page_source, month, league):
+        """Extract the table from a saved page_source, mirroring TABLE_EXTRACTION_SCRIPT offline"""
+        return self.parse_table_grid(table_grid_from_html(page_source, self.table_xpath), month, league)
+
+    def parse_table_grid(self, grid, month, league):
+        """Convert the grid returned by TABLE_EXTRACTION_SCRIPT into row dicts"""
+        if not grid or not grid.get('rows'):
+            return []
+
+        rows = grid['rows']
+        character_names = [row.get('name', '').strip().lower() for row in rows]
+        if not all(character_names):
+            self.custom_logger.warning("Missing row names in script extraction, using verified character order")
+            character_names = list(DEFAULT_CHARACTER_ORDER)
+
+        # An empty grid means the table has not rendered its cells yet
+        if not any(value for row in rows for value in row.get('cells', [])):
+            return []
+
+        self.custom_logger.info(f"script: Found {len(rows)} rows, {len(grid.get('headers', []))} headers")
+
+        # One pass over the whole grid replaces the deduplicated two-pass result, so rows keep its source label
+        data = []
+        for row_index, row in enumerate(rows):
+            if row_index < len(character_names):
+                row_character = character_names[row_index].upper()
+            else:
+                row_character = f"ROW_{row_index + 1}"
+            data.extend(self.build_row_entries(
+                row_index, row_character, row.get('cells', []), character_names,
+                month, league, 'tabular_extraction_deduplicated'
+            ))
+
+        self.custom_logger.info(f"script: Extracted {len(data)} data points")
+        return data
+
+    def build_row_entries(self, row_index, row_character, cell_values, character_names, month, league, source):
+        """Build the per-cell row dicts for one table row"""
+        entries = []
+        for cell_index, cell_value in enumerate(cell_values):
+            if cell_index == 0:
+                # First column is the character's total stats
+                column_character = 'TOTAL'
+            else:
+                # Matchup columns start at index 1
+                matchup_index = cell_index - 1
+                if matchup_index >= len(character_names):
+                    continue
+                column_character = character_names[matchup_index].upper()
+
+            entries.append({
+                'character_name': column_character,
+                'month': month,
+                'league': league,
+                'row_type': row_character,
+                'value': cell_value,
+                'row_index': row_index + 1,
+                'column_index': cell_index + 1,
+                'source': source
+            })
+        return entries
+
     def deduplicate_table_data(self, combined_data):
         """Remove duplicate entries and keep the one with non-empty value"""
         try:
@@ -447,7 +798,8 @@ class FightingStatsSpider(scrapy.Spider):
             
             # Ensure we scroll through table to load all rows before extraction
             self.custom_logger.info("Ensuring table is fully loaded before character extraction...")
-            self.scroll_to_load_full_table()
+            with self.report.stage('table_scroll'):
+                self.scroll_to_load_full_table()
             
             # Look for character names in row headers - specifically in th/div/span[1] elements
             tbody = table.find_element(By.TAG_NAME, "tbody")
@@ -479,82 +831,17 @@ class FightingStatsSpider(scrapy.Spider):
             # If no characters found from span elements, use the verified character order as fallback
             if not character_names:
                 self.custom_logger.warning("No characters found from span elements, using verified character order")
-                # This is the actual character order from the fighting stats website span elements
-                # Both rows and columns follow this same order
-                character_names = [
-                    "elena", "e. honda", "dhalsim", "kimberly", "jp", "dee jay", "terry", "luke", 
-                    "marisa", "blanka", "lily", "a.k.i.", "chun-li", "m. bison", "rashid", "jamie", 
-                    "guile", "juri", "ken", "ryu", "cammy", "mai", "manon", "ed", "akuma", "zangief"
-                ]
+                character_names = list(DEFAULT_CHARACTER_ORDER)
                 self.custom_logger.info(f"Using verified character order with {len(character_names)} characters")
         
         except Exception as e:
             self.custom_logger.error(f"Error extracting character names: {str(e)}")
             # Return fallback character list
-            character_names = [
-                "elena", "e. honda", "dhalsim", "kimberly", "jp", "dee jay", "terry", "luke", 
-                "marisa", "blanka", "lily", "a.k.i.", "chun-li", "m. bison", "rashid", "jamie", 
-                "guile", "juri", "ken", "ryu", "cammy", "mai", "manon", "ed", "akuma", "zangief"
-            ]
+            character_names = list(DEFAULT_CHARACTER_ORDER)
             self.custom_logger.info(f"Using fallback character order with {len(character_names)} characters")
         
         return character_names
     
-    def write_csv_files(self, all_data):
-        """Write data to CSV files"""
-        if not all_data:
-            self.custom_logger.warning("No data to write")
-            return
-        
-        # Group data by month only (all leagues combined per month)
-        months_data = {}
-        for item in all_data:
-            month = item['month']
-            if month not in months_data:
-                months_data[month] = []
-            months_data[month].append(item)
-        
-        # Write individual month files (containing all leagues)
-        for month, month_data in months_data.items():
-            month_clean = month.replace('/', '')
-            
-            # Use config manager for timestamped output directory
-            from config_manager import get_config
-            config = get_config()
-            output_dir = config.get_timestamped_output_dir()
-            filename = os.path.join(output_dir, f"fighting_stats_{month_clean}.csv")
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                if month_data:
-                    fieldnames = month_data[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(month_data)
-            
-            # Count entries per league for logging
-            league_counts = {}
-            for item in month_data:
-                league = item['league']
-                league_counts[league] = league_counts.get(league, 0) + 1
-            
-            league_summary = ", ".join([f"{league}: {count}" for league, count in league_counts.items()])
-            self.custom_logger.info(f"Written {len(month_data)} total entries to {filename} ({league_summary})")
-        
-        # Write combined file
-        from config_manager import get_config
-        config = get_config()
-        output_dir = config.get_timestamped_output_dir()
-        combined_filename = os.path.join(output_dir, "fighting_stats_all_months.csv")
-        with open(combined_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            if all_data:
-                fieldnames = all_data[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(all_data)
-        
-        self.custom_logger.info(f"Written {len(all_data)} total entries to {combined_filename}")
-    
     def closed(self, reason):
-        if self.driver:
-            self.driver.quit()
+        self.close_driver()
         self.custom_logger.info(f"Spider closed: {reason}")
\ No newline at end of file
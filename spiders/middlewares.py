@@ -13,14 +13,54 @@ class RandomUserAgentMiddleware(object):
     def process_request(self, request, spider):
         request.headers.setdefault('User-Agent', random.choice(self.agents))
 
+class RateControlMiddleware(object):
+    """Holds each request until the shared per-host token bucket allows it"""
+
+    async def process_request(self, request, spider=None):
+        from spiders.rate_controller import get_rate_controller
+        wait = get_rate_controller().reserve(request.url)
+        if wait:
+            from twisted.internet import reactor
+            from twisted.internet.task import deferLater
+            from scrapy.utils.defer import maybe_deferred_to_future
+            await maybe_deferred_to_future(deferLater(reactor, wait, lambda: None))
+
+def retry_after_seconds(response):
+    """Retry-After header in seconds (HTTP dates are ignored), or None"""
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
 class RetryChangeProxyMiddleware(RetryMiddleware):
     def __init__(self, settings):
         super().__init__(settings)
 
     def process_response(self, request, response, spider):
-        if response.status in [403, 401, 429, 405, 500]:
-            spider.consecutive_errors += 1  # Increment the error count
-            spider.adjust_delay()  # Adjust the delay based on the error count
-            return self._retry(request, f'{response.status} error', spider) or response
-        spider.consecutive_errors = 0  # Reset the error count if the page is successfully parsed
+        from spiders.rate_controller import get_rate_controller
+        if 'cached' not in response.flags:
+            # Latency and throttling statuses drive the shared rate controller
+            get_rate_controller().record(request.url, latency=request.meta.get('download_latency'),
+                                         status=response.status, retry_after=retry_after_seconds(response))
+        if response.status in [403, 401, 429, 405, 500, 503]:
+            from instrumentation import get_run_report
+            from metrics import get_registry
+            dataset = getattr(spider, 'dataset', spider.name)
+            get_run_report(dataset).count('retries', unit=request.cb_kwargs.get('month_display'))
+            get_registry().inc('error_responses', help_text="HTTP error responses that triggered a retry",
+                               dataset=dataset, status=response.status)
+            return self._retry_request(request, f'{response.status} error', spider) or response
         return response
+
+    def _retry_request(self, request, reason, spider):
+        # get_retry_request has the same signature from Scrapy 2.5 on, unlike _retry()
+        from scrapy.downloadermiddlewares.retry import get_retry_request
+        return get_retry_request(request, spider=spider, reason=reason,
+                                 max_retry_times=request.meta.get('max_retry_times', self.max_retry_times),
+                                 priority_adjust=request.meta.get('priority_adjust', self.priority_adjust))
+
+    def process_exception(self, request, exception, spider):
+        from spiders.rate_controller import get_rate_controller
+        get_rate_controller().record(request.url, error=True)
+        return super().process_exception(request, exception, spider)
@@ -0,0 +1,115 @@
+"""
+Helpers for the Next.js data payload embedded in Buckler stats pages
+Lets the usage stats be parsed from a plain HTTP response, without a browser
+"""
+
+import json
+import logging
+import re
+
+# Order of the league lists on the usage page (div[1] through div[4])
+LEAGUE_NAMES = ['Master', 'High Master', 'Grand Master', 'Ultimate Master']
+
+# The payload schema is not documented, so records are recognised by their keys
+NAME_KEYS = ('character_name', 'character_alpha', 'chara_name', 'character', 'name')
+USAGE_KEYS = ('usage_rate', 'play_rate', 'rate', 'ratio', 'percentage')
+CHANGE_KEYS = ('change_rate', 'rate_diff', 'diff', 'change')
+RANK_KEYS = ('rank', 'ranking', 'order')
+
+MONTH_URL_PATTERN = re.compile(r'/usagerate_master/(\d{6})')
+
+
+def load_next_data(response):
+    """Get the decoded __NEXT_DATA__ JSON from a response, or None if missing"""
+    raw = response.xpath('//script[@id="__NEXT_DATA__"]/text()').get()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        logging.warning(f"Could not decode __NEXT_DATA__ payload from {response.url}: {e}")
+        return None
+
+
+def discover_months(response):
+    """Find available months as (YYYYMM, MM/YYYY) tuples from links and text in a response"""
+    month_ids = set(MONTH_URL_PATTERN.findall(response.text))
+    for text in response.xpath('//article[2]/aside[1]//text()').getall():
+        for month, year in re.findall(r'(\d{2})/(\d{4})', text):
+            month_ids.add(f"{year}{month}")
+
+    return sorted(
+        ((month_id, f"{month_id[4:6]}/{month_id[:4]}") for month_id in month_ids),
+        key=lambda m: m[0],
+        reverse=True
+    )
+
+
+def _first_key(record, keys):
+    for key in keys:
+        if key in record and record[key] not in (None, ''):
+            return record[key]
+    return None
+
+
+def _is_usage_record(record):
+    if not isinstance(record, dict):
+        return False
+    name = _first_key(record, NAME_KEYS)
+    usage = _first_key(record, USAGE_KEYS)
+    if not isinstance(name, str) or usage is None:
+        return False
+    try:
+        float(str(usage).rstrip('%'))
+        return True
+    except ValueError:
+        return False
+
+
+def find_usage_lists(node):
+    """Recursively collect lists whose items all look like character usage records"""
+    found = []
+    if isinstance(node, list):
+        if node and all(_is_usage_record(item) for item in node):
+            found.append(node)
+            return found
+        for item in node:
+            found.extend(find_usage_lists(item))
+    elif isinstance(node, dict):
+        for value in node.values():
+            found.extend(find_usage_lists(value))
+    return found
+
+
+def _format_percentage(value):
+    text = str(value).strip()
+    return text if text.endswith('%') else f"{text}%"
+
+
+def parse_usage_payload(payload, month):
+    """Convert a __NEXT_DATA__ payload into usage rows matching the XPath parser output
+
+    Returns an empty list unless exactly one list per league is found.
+    """
+    usage_lists = find_usage_lists(payload) if payload else []
+    if len(usage_lists) != len(LEAGUE_NAMES):
+        if usage_lists:
+            logging.info(f"Found {len(usage_lists)} usage lists in payload for {month}, expected {len(LEAGUE_NAMES)}")
+        return []
+
+    rows = []
+    for div_index, (league_name, records) in enumerate(zip(LEAGUE_NAMES, usage_lists), start=1):
+        for position, record in enumerate(records, start=1):
+            rank = _first_key(record, RANK_KEYS) or position
+            change = _first_key(record, CHANGE_KEYS)
+            rows.append({
+                'rank': str(rank),
+                'character_name': _first_key(record, NAME_KEYS).upper(),
+                'usage_percentage': _format_percentage(_first_key(record, USAGE_KEYS)),
+                'change_rate': _format_percentage(change) if change is not None else "N/A",
+                'month': month,
+                'div_index': div_index,
+                'rank_name': league_name,
+                'source': 'next_data_extraction'
+            })
+    return rows
@@ -0,0 +1,172 @@
+"""
+Adaptive per-host rate control shared by Scrapy requests and Selenium navigations
+A token bucket per host whose rate follows AIMD: small steps up while responses are fast, halved on 429/403 or slow responses
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+# Responses telling us to slow down; their Retry-After header, if any, pauses the host
+THROTTLE_STATUSES = (429, 403, 503)
+
+# Responses needed after a latency-driven decrease before latency can decrease the rate again,
+# so one slow period halves the rate once instead of once per slow response
+LATENCY_DECREASE_SPACING = 3
+
+# HTTP status of the last navigation, where the browser exposes it (Firefox 109+)
+NAVIGATION_STATUS_SCRIPT = """
+var entry = performance.getEntriesByType('navigation')[0];
+return entry && entry.responseStatus ? entry.responseStatus : null;
+"""
+
+
+class HostBucket:
+    """Token bucket of one host
+
+    Tokens may go negative: each caller takes one and waits until the debt is paid back,
+    so concurrent callers queue up behind each other at the current rate.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.since_decrease = LATENCY_DECREASE_SPACING
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return the seconds to wait before using it"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate, self.paused_until - now)
+
+
+class RateController:
+    """Per-host token buckets whose rates adapt to how the server responds
+
+    Every response within the target latency adds increase_step requests/second to its
+    host's rate, up to max_rate. Throttling statuses, errors and responses slower than the
+    target latency multiply it by decrease_factor, down to min_rate.
+    """
+
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.05, max_rate: float = 5.0,
+                 burst: float = 1.0, increase_step: float = 0.1, decrease_factor: float = 0.5,
+                 target_latency: float = 2.0, browser_target_latency: float = 10.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.browser_target_latency = browser_target_latency
+        self._lock = threading.Lock()
+        self._buckets = {}
+        from metrics import get_registry
+        self.metrics = get_registry()
+
+    def _bucket(self, host: str) -> HostBucket:
+        if host not in self._buckets:
+            self._buckets[host] = HostBucket(self.initial_rate, self.burst)
+        return self._buckets[host]
+
+    def reserve(self, url: str) -> float:
+        """Take a token for url's host; returns how long the caller must wait (for async callers)"""
+        host = urlparse(url).netloc
+        with self._lock:
+            wait = self._bucket(host).reserve(time.monotonic())
+        if wait:
+            self.metrics.inc('rate_limit_wait_seconds', wait, "Time spent waiting for the rate limiter", host=host)
+        return wait
+
+    def acquire(self, url: str) -> float:
+        """Block the calling thread until url's host may be requested; returns the time waited"""
+        wait = self.reserve(url)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def record(self, url: str, latency: float = None, status: int = None, retry_after: float = None,
+               error: bool = False, browser: bool = False) -> float:
+        """Adjust the host's rate from one response (or failed request); returns the new rate"""
+        host = urlparse(url).netloc
+        target = self.browser_target_latency if browser else self.target_latency
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.since_decrease += 1
+            if status in THROTTLE_STATUSES or error:
+                reason = 'error' if error else f"status_{status}"
+                # Pause for Retry-After, or at least one interval at the new rate, and drop any burst
+                pause = retry_after if retry_after else 1 / max(self.min_rate, bucket.rate * self.decrease_factor)
+                bucket.paused_until = max(bucket.paused_until, now + pause)
+                bucket.tokens = min(bucket.tokens, 0.0)
+            elif latency is not None and latency > target:
+                # Slow responses never raise the rate; only the first of a slow period lowers it
+                reason = 'slow' if bucket.since_decrease > LATENCY_DECREASE_SPACING else None
+            else:
+                reason = None
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase_step)
+
+            if reason:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+                bucket.since_decrease = 0
+            rate = bucket.rate
+
+        self.metrics.set('rate_limit_requests_per_second', rate, "Current allowed request rate per host", host=host)
+        if reason:
+            self.metrics.inc('rate_limit_backoffs', help_text="Rate decreases by host and cause", host=host, reason=reason)
+            logging.info(f"Rate limit for {host} lowered to {rate:.2f} req/s ({reason}"
+                         + (f", latency {latency:.1f}s)" if latency is not None else ")"))
+        return rate
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(urlparse(url).netloc).rate
+
+
+def navigation_status(driver):
+    """HTTP status of the page the driver just loaded, or None if the browser doesn't report it"""
+    try:
+        status = driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+        return int(status) if status else None
+    except Exception:
+        return None
+
+
+def navigate(driver, url: str, report=None) -> None:
+    """driver.get(url) paced by the shared rate controller, feeding back load time and status
+
+    report, a RunReport, receives the time as 'rate_limit_wait' and 'navigate' stages.
+    """
+    from contextlib import nullcontext
+    controller = get_rate_controller()
+    with report.stage('rate_limit_wait') if report else nullcontext():
+        controller.acquire(url)
+
+    start = time.perf_counter()
+    try:
+        with report.stage('navigate') if report else nullcontext():
+            driver.get(url)
+    except Exception:
+        controller.record(url, latency=time.perf_counter() - start, error=True, browser=True)
+        raise
+    controller.record(url, latency=time.perf_counter() - start, status=navigation_status(driver), browser=True)
+
+
+# Global rate controller shared by every spider, browser worker and middleware in the process
+_controller_instance = None
+_controller_lock = threading.Lock()
+
+def get_rate_controller() -> RateController:
+    """Get the process-wide rate controller configured from the rate_limit config section"""
+    global _controller_instance
+    with _controller_lock:
+        if _controller_instance is None:
+            from config_manager import get_config
+            _controller_instance = RateController(**get_config().get_rate_limit_settings())
+        return _controller_instance
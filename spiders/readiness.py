@@ -0,0 +1,132 @@
+"""
+Readiness detection for Selenium-driven pages
+Waits on concrete DOM conditions instead of fixed sleeps, with ceilings from config_manager
+"""
+
+import logging
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+def get_wait_settings():
+    """Get readiness ceilings and polling interval from the global config"""
+    from config_manager import get_config
+    return get_config().get_wait_settings()
+
+
+def _wait(driver, condition, timeout, poll_interval):
+    # Imported here: support.ui pulls in the whole webdriver package, which parse-only callers don't need
+    from selenium.webdriver.support.ui import WebDriverWait
+    return WebDriverWait(driver, timeout, poll_frequency=poll_interval).until(condition)
+
+
+def wait_for_document_ready(driver, timeout=None):
+    """Wait until document.readyState is complete (or interactive with the eager load strategy)"""
+    settings = get_wait_settings()
+    timeout = timeout or settings['page_ready_timeout']
+    ready_states = settings.get('document_ready_states', ('complete',))
+    try:
+        _wait(
+            driver,
+            lambda d: d.execute_script("return document.readyState") in ready_states,
+            timeout, settings['poll_interval']
+        )
+        return True
+    except TimeoutException:
+        logging.warning(f"Document not ready after {timeout}s, continuing")
+        return False
+
+
+def wait_for_elements(driver, xpaths, timeout=None):
+    """Wait until every xpath in xpaths matches at least one element"""
+    settings = get_wait_settings()
+    timeout = timeout or settings['element_wait_timeout']
+
+    def all_present(d):
+        return all(d.find_elements(By.XPATH, xpath) for xpath in xpaths)
+
+    try:
+        _wait(driver, all_present, timeout, settings['poll_interval'])
+        return True
+    except TimeoutException:
+        logging.warning(f"Timed out after {timeout}s waiting for {len(xpaths)} element(s)")
+        return False
+
+
+def wait_for_stable_count(driver, xpath, timeout=None, min_count=1):
+    """Wait until the number of elements matching xpath stops changing
+
+    Returns the settled count, or the last observed count on timeout.
+    """
+    settings = get_wait_settings()
+    timeout = timeout or settings['element_wait_timeout']
+    required_checks = settings['stable_checks']
+    state = {'count': -1, 'checks': 0}
+
+    def count_is_stable(d):
+        count = len(d.find_elements(By.XPATH, xpath))
+        if count >= min_count and count == state['count']:
+            state['checks'] += 1
+        else:
+            state['checks'] = 0
+        state['count'] = count
+        return state['checks'] >= required_checks
+
+    try:
+        _wait(driver, count_is_stable, timeout, settings['poll_interval'])
+        logging.info(f"Element count settled at {state['count']} for {xpath}")
+    except TimeoutException:
+        logging.warning(f"Element count for {xpath} did not settle after {timeout}s (last: {state['count']})")
+    return max(state['count'], 0)
+
+
+def get_text(driver, xpath):
+    """Get the text of the first element matching xpath, or None if missing"""
+    try:
+        elements = driver.find_elements(By.XPATH, xpath)
+        return elements[0].text if elements else None
+    except WebDriverException:
+        return None
+
+
+def wait_for_text_change(driver, xpath, previous_text, timeout=None):
+    """Wait until the text of the element at xpath differs from previous_text"""
+    settings = get_wait_settings()
+    timeout = timeout or settings['content_change_timeout']
+
+    def text_changed(d):
+        current = get_text(d, xpath)
+        return current is not None and current != previous_text
+
+    try:
+        _wait(driver, text_changed, timeout, settings['poll_interval'])
+        return True
+    except TimeoutException:
+        logging.info(f"Text at {xpath} unchanged after {timeout}s")
+        return False
+
+
+def wait_for_click_effect(driver, xpath, previous_text, previous_url, timeout=None):
+    """Wait until a click changed the page: the text at xpath or the URL differs from before
+
+    Returns False if neither changed within option_change_timeout, e.g. because the clicked
+    option was already selected. Once only the URL has changed, the new content is still
+    loading, so the text gets up to content_change_timeout more.
+    """
+    settings = get_wait_settings()
+    timeout = timeout or settings['option_change_timeout']
+
+    def changed(d):
+        current = get_text(d, xpath)
+        if current is not None and current != previous_text:
+            return 'text'
+        return 'url' if d.current_url != previous_url else False
+
+    try:
+        change = _wait(driver, changed, timeout, settings['poll_interval'])
+    except TimeoutException:
+        logging.info(f"No change at {xpath} or in the URL after {timeout}s, option was likely already selected")
+        return False
+    if change == 'url' and previous_text is not None:
+        wait_for_text_change(driver, xpath, previous_text)
+    return True
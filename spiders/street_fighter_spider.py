@@ -1,75 +1,108 @@
 import logging
-import random
-import csv
-from collections import defaultdict
+import threading
 import scrapy
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
 from config import COMMON_SPIDER_SETTINGS
-import geckodriver_autoinstaller
+from spiders import rate_controller, readiness
 
-# Install geckodriver if not present
-geckodriver_autoinstaller.install()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("debug.log"),
-        logging.StreamHandler()
-    ]
-)
+# Column order of the usage stats CSV files
+USAGE_STATS_FIELDS = ['change_rate', 'character_name', 'div_index', 'month', 'rank', 'rank_name', 'source', 'usage_percentage']
 
 
 class StreetFighterSpider(scrapy.Spider):
     name = "street_fighter_spider"
+    dataset = "usage_stats"
     custom_settings = {**COMMON_SPIDER_SETTINGS}
 
     # Updated to target new stats endpoint
     stats_url = "https://www.streetfighter.com/6/buckler/stats/usagerate_master"
-    scraped_data = []
+    usage_list_xpath = '/html/body/div[2]/div/article[2]/section/div/div[{div_num}]/ul/li'
 
-    def __init__(self):
+    def __init__(self, resume=False):
         self.driver = None  # Initialize as None, create when needed
-        self.consecutive_errors = 0  # Keep track of consecutive errors
+        self.scraped_data = []  # Rows parsed since the last flush
+        self._browser_lock = threading.Lock()  # HTTP mode's Selenium fallbacks share one driver
+        self.resume = resume in (True, 'true', 'True', '1', 1)  # Scrapy passes -a resume=1 as a string
+        self.sink = None  # Streaming CSV sink, opened on first flush
+        self.archive_dir = None  # Output folder whose page archive receives parsed pages
+        self.rows_scraped = 0
+        self.rows_written = 0  # Rows of changed partitions
+        self.failed_units = []
+        from config_manager import get_config
+        config = get_config()
+        self.fetch_mode = config.get_fetch_mode()
+        self.stats_url = config.get_urls()['usage_stats_base']
+        
+        # Set up here rather than on import, so parse-only importers don't create debug.log
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s [%(levelname)s] %(message)s",
+            handlers=[
+                logging.FileHandler("debug.log"),
+                logging.StreamHandler()
+            ]
+        )
+
+    @classmethod
+    def update_settings(cls, settings):
+        super().update_settings(settings)
+        # The HTTP path has no shared browser, so real request concurrency is safe
+        from config_manager import get_config
+        config = get_config()
+        if config.get_fetch_mode() == 'http':
+            settings.set('CONCURRENT_REQUESTS', config.get('spider_settings', 'concurrent_requests', 1), priority='spider')
+        
+    @property
+    def report(self):
+        """Run report receiving this spider's stage timings"""
+        from instrumentation import get_run_report
+        return get_run_report(self.dataset)
         
-    def _init_driver(self):
-        """Initialize the Firefox driver only when needed"""
+    def _init_driver(self, headless=False):
+        """Get a Firefox driver from the shared provider only when needed"""
         if self.driver is None:
-            # Install geckodriver automatically
-            geckodriver_path = geckodriver_autoinstaller.install()
-            
-            # Setup Firefox options
-            options = Options()
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            
-            # Create service with geckodriver path
-            service = Service(geckodriver_path)
-            
-            # Initialize Firefox webdriver
-            self.driver = webdriver.Firefox(service=service, options=options)
+            from spiders.driver_provider import get_driver_provider
+            with self.report.stage('driver_start'):
+                self.driver = get_driver_provider().acquire(headless=headless)
             logging.info("Firefox driver initialized successfully")
 
-    def adjust_delay(self):
-        # Calculate exponential backoff
-        delay = min(0.5 * (2 ** self.consecutive_errors), 60)
-        # Add jitter: random value between 0 and delay
-        jitter = random.uniform(0, delay)
-        self.custom_settings['DOWNLOAD_DELAY'] = delay + jitter
+    def close_driver(self):
+        """Hand the Firefox driver back to the shared provider for reuse"""
+        if self.driver:
+            from spiders.driver_provider import get_driver_provider
+            get_driver_provider().release(self.driver)
+            self.driver = None
+
+    async def start(self):
+        # Scrapy 2.13+ entry point; start_requests() is kept for older versions
+        for request in self.start_requests():
+            yield request
 
     def start_requests(self):
+        from instrumentation import start_run_report
+        start_run_report(self.dataset)
+        if self.fetch_mode == 'http':
+            return iter([scrapy.Request(self.stats_url, callback=self.parse_index, dont_filter=True)])
+        # The browser does the fetching; this placeholder request only hands the session to a callback
+        return iter([scrapy.Request('data:,', callback=self.parse_with_selenium, dont_filter=True)])
+
+    async def parse_with_selenium(self, response):
+        """Selenium mode: run the browser scrape off the reactor thread, so other spiders keep crawling"""
+        from spiders.worker_pool import run_off_reactor
+        await run_off_reactor(self.scrape_with_selenium)
+
+    def scrape_with_selenium(self):
+        """Selenium mode: scrape every month in the browser and write the CSV files"""
         try:
             # Initialize the driver
             self._init_driver()
             
             logging.info("Navigating directly to Street Fighter stats page...")
-            self.driver.get(self.stats_url)
+            rate_controller.navigate(self.driver, self.stats_url, self.report)
             
             # Wait for initial page load
-            import time
-            time.sleep(5)
+            with self.report.stage('readiness_wait'):
+                readiness.wait_for_document_ready(self.driver)
             
             # Check if page loaded successfully
             current_url = self.driver.current_url
@@ -77,14 +110,14 @@ class StreetFighterSpider(scrapy.Spider):
             
             if "usagerate_master" not in current_url:
                 logging.warning("Stats page may not have loaded correctly. Trying again...")
-                self.driver.get(self.stats_url)
-                time.sleep(5)
+                rate_controller.navigate(self.driver, self.stats_url, self.report)
+                readiness.wait_for_document_ready(self.driver)
                 current_url = self.driver.current_url
                 logging.info(f"Retry URL: {current_url}")
             
             # Wait for dynamic content to load - this page uses JavaScript to load stats
             logging.info("Waiting for dynamic content to load...")
-            time.sleep(10)  # Give JavaScript time to load the actual character data
+            self.wait_for_usage_data()
             
             # Try to wait for specific elements that indicate data has loaded
             from selenium.webdriver.common.by import By
@@ -107,14 +140,13 @@ class StreetFighterSpider(scrapy.Spider):
             # Write CSV data after parsing all months
             self.write_to_csv()
             
-            # Important: yield an empty list to satisfy Scrapy's iterator requirement
-            return iter([])
-            
         except Exception as e:
-            logging.error(f"Error in start_requests: {e}")
-            if self.driver:
-                self.driver.quit()
-            return iter([])
+            logging.error(f"Error in Selenium scrape: {e}")
+            if self.sink:
+                self.sink.abort()
+            self.close_driver()
+            # Re-raised so the crawl is reported as failed rather than as finding no data
+            raise
 
     def scrape_all_months(self):
         """Hybrid approach: Dynamically discover available months, then navigate via URL"""
@@ -122,7 +154,6 @@ class StreetFighterSpider(scrapy.Spider):
             from selenium.webdriver.common.by import By
             from selenium.webdriver.support.ui import WebDriverWait
             from selenium.webdriver.support import expected_conditions as EC
-            import time
             import re
             
             logging.info("Starting hybrid month scraping: dynamic discovery + URL navigation...")
@@ -227,258 +258,353 @@ class StreetFighterSpider(scrapy.Spider):
             # Step 2: Navigate via URL to each discovered month
             if not discovered_months:
                 logging.warning("No months discovered, falling back to current page")
-                self.scrape_current_month_data("current")
+                self.scraped_data.extend(self.scrape_current_month_data("current"))
                 return
             
-            base_url = "https://www.streetfighter.com/6/buckler/stats/usagerate_master"
+            # Only fetch new months, the still-changing newest month and months due for re-verification
+            discovered_months = self.select_months_to_scrape(discovered_months)
+            
+            from config_manager import get_config
+            pool_settings = get_config().get_worker_pool_settings()
+            if pool_settings['workers'] > 1:
+                self.scrape_with_worker_pool(discovered_months, pool_settings, sink=self.get_sink())
+                return
             
             for month_id, month_display in discovered_months:
                 try:
-                    # Navigate to the specific month URL
-                    month_url = f"{base_url}/{month_id}"
-                    logging.info(f"Navigating to {month_display} data: {month_url}")
-                    
-                    self.driver.get(month_url)
-                    
-                    # Wait for page to load
-                    time.sleep(5)
-                    
-                    # Verify we're on the correct page
-                    current_url = self.driver.current_url
-                    logging.info(f"Current URL: {current_url}")
-                    
-                    # Wait for dynamic content to load
-                    logging.info(f"Waiting for {month_display} character data to load...")
-                    time.sleep(10)
-                    
-                    # Wait for character data to be present
-                    try:
-                        wait = WebDriverWait(self.driver, 20)
-                        # Wait for all 4 divs to be present
-                        wait.until(EC.presence_of_element_located((By.XPATH, '/html/body/div[2]/div/article[2]/section/div/div[1]/ul/li[1]')))
-                        wait.until(EC.presence_of_element_located((By.XPATH, '/html/body/div[2]/div/article[2]/section/div/div[4]/ul/li[1]')))
-                        logging.info(f"Character data loaded for {month_display}")
-                        
-                        # Get first character for verification
-                        first_char_element = self.driver.find_element(By.XPATH, '/html/body/div[2]/div/article[2]/section/div/div[1]/ul/li[1]')
-                        first_char_data = first_char_element.text
-                        logging.info(f"VERIFICATION - {month_display} first character data: {first_char_data}")
-                        
-                    except Exception as wait_e:
-                        logging.warning(f"Timeout waiting for {month_display} data: {wait_e}")
-                    
-                    # Scrape data for this month
-                    self.scrape_current_month_data(month_display)
-                    
-                    logging.info(f"Completed scraping for {month_display}")
-                    
+                    month_rows = self.scrape_month(month_id, month_display)
                 except Exception as e:
                     logging.error(f"Error processing month {month_display}: {e}")
+                    # A failed month is not checkpointed, so it gets scraped again
+                    self.get_sink().mark_failed(month_display)
                     continue
+                self.scraped_data.extend(month_rows)
+                # Each month is flushed to disk as soon as it is parsed
+                self.flush_scraped_data(unit_key=month_display)
                     
         except Exception as e:
             logging.error(f"Error in scrape_all_months: {e}")
+            self.get_sink().mark_failed('month discovery')
             # Fallback: scrape current month
-            self.scrape_current_month_data("fallback")
+            self.scraped_data.extend(self.scrape_current_month_data("fallback"))
 
-    def scrape_current_month_data(self, month_identifier):
-        """Scrape data for the currently displayed month across all 4 divs"""
+    def select_months_to_scrape(self, discovered_months):
+        """Drop months whose leagues are all final in the manifest or completed in the checkpoint"""
+        from manifest import get_manifest
+        from spiders.next_data import LEAGUE_NAMES
+        selected = get_manifest().months_to_scrape('usage_stats', discovered_months, LEAGUE_NAMES)
+        
+        # Months finished by an interrupted earlier attempt are skipped on resume
+        sink = self.get_sink()
+        pending = [(month_id, month_display) for month_id, month_display in selected if not sink.is_done(month_display)]
+        if len(pending) < len(selected):
+            logging.info(f"Resuming: {len(selected) - len(pending)} months already completed in checkpoint")
+        return pending
+
+    def scrape_month(self, month_id, month_display):
+        """Navigate to one month's URL, wait for its data and parse all 4 divs"""
+        with self.report.unit(month_display):
+            return self._scrape_month(month_id, month_display)
+
+    def _scrape_month(self, month_id, month_display):
+        month_url = f"{self.stats_url}/{month_id}"
+        
+        # A cached rendered copy of a finished month spares the browser round-trip
+        from page_cache import load_rendered_page
+        cached_page = load_rendered_page(month_url)
+        if cached_page is not None:
+            from fixtures import snapshot_page
+            with self.report.stage('archive'):
+                snapshot_page('usage_stats', month_display, 'all', cached_page, month_url, output_dir=self.archive_dir)
+            with self.report.stage('extract'):
+                month_rows = self.parse_rendered_page(cached_page, month_display)
+            self.report.count('rows_extracted', len(month_rows))
+            self.report.count('cache_hits')
+            return month_rows
+        
+        # Navigate to the specific month URL
+        logging.info(f"Navigating to {month_display} data: {month_url}")
+        
+        rate_controller.navigate(self.driver, month_url, self.report)
+        
+        # Wait for page to load
+        with self.report.stage('readiness_wait'):
+            readiness.wait_for_document_ready(self.driver)
+        
+        # Verify we're on the correct page
+        current_url = self.driver.current_url
+        logging.info(f"Current URL: {current_url}")
+        
+        # Wait for dynamic content to load
+        logging.info(f"Waiting for {month_display} character data to load...")
+        
+        # Wait for character data to be present
         try:
-            logging.info(f"Scraping data for month: {month_identifier}")
+            with self.report.stage('readiness_wait'):
+                data_loaded = self.wait_for_usage_data()
+            if data_loaded:
+                logging.info(f"Character data loaded for {month_display}")
             
-            # Get the current page source
-            page_source = self.driver.page_source
+            # Get first character for verification
+            first_char_data = readiness.get_text(self.driver, f"{self.usage_list_xpath.format(div_num=1)}[1]")
+            logging.info(f"VERIFICATION - {month_display} first character data: {first_char_data}")
             
-            # Create a scrapy Response object from the rendered page
-            from scrapy.http import HtmlResponse
-            rendered_response = HtmlResponse(
-                url=self.stats_url,
-                body=page_source.encode('utf-8'),
-                encoding='utf-8'
+        except Exception as wait_e:
+            logging.warning(f"Timeout waiting for {month_display} data: {wait_e}")
+        
+        # Scrape data for this month
+        month_rows = self.scrape_current_month_data(month_display, cache_url=month_url)
+        self.report.count('rows_extracted', len(month_rows))
+        
+        logging.info(f"Completed scraping for {month_display}")
+        return month_rows
+
+    def scrape_with_worker_pool(self, discovered_months, pool_settings, sink=None):
+        """Scrape every discovered month across a pool of headless browsers
+
+        With a sink, each month is streamed to it as soon as a worker finishes it.
+        """
+        from spiders.worker_pool import BrowserWorkerPool, WorkItem
+        
+        work_items = [
+            WorkItem(
+                index=index,
+                url=f"{self.stats_url}/{month_id}",
+                month_code=month_id,
+                month_name=month_display,
+                league_index=None,
+                league_name=None
             )
+            for index, (month_id, month_display) in enumerate(discovered_months)
+        ]
+        
+        def create_worker():
+            worker = StreetFighterSpider()
+            worker.archive_dir = sink.output_dir if sink else None
+            worker._init_driver(headless=pool_settings['headless'])
+            return worker
+        
+        def scrape_item(worker, item):
+            return worker.scrape_month(item.month_code, item.month_name)
+        
+        pool = BrowserWorkerPool(
+            create_worker, scrape_item,
+            num_workers=pool_settings['workers']
+        )
+        if sink:
+            results = pool.run(work_items, on_result=lambda item, rows: sink.write_batch(rows, unit_key=item.month_name))
+            for item in pool.failed_items:
+                sink.mark_failed(item.month_name)
+            return results
+        return pool.run(work_items)
+
+    def wait_for_usage_data(self):
+        """Wait until the first li of all 4 usage divs is present and the list length has settled"""
+        first_items = [f"{self.usage_list_xpath.format(div_num=div_num)}[1]" for div_num in range(1, 5)]
+        if not readiness.wait_for_elements(self.driver, first_items):
+            return False
+        readiness.wait_for_stable_count(self.driver, self.usage_list_xpath.format(div_num=1))
+        return True
+
+    async def parse_index(self, response):
+        """HTTP mode: discover months from the index page and request each one"""
+        from spiders.next_data import discover_months
+        discovered_months = discover_months(response)
+        logging.info(f"Discovered {len(discovered_months)} months over HTTP: {[m[1] for m in discovered_months]}")
+        
+        if not discovered_months:
+            logging.warning("No months discovered over HTTP, parsing the index page as current month")
+            await self.parse_month(response, month_id=None, month_display="current")
+            return
+        
+        for month_id, month_display in self.select_months_to_scrape(discovered_months):
+            yield scrapy.Request(
+                f"{self.stats_url}/{month_id}",
+                callback=self.parse_month,
+                cb_kwargs={'month_id': month_id, 'month_display': month_display}
+            )
+
+    async def parse_month(self, response, month_id, month_display):
+        """HTTP mode: parse a month page, falling back to Selenium off the reactor thread if the data is missing"""
+        from spiders.next_data import load_next_data, parse_usage_payload
+        report = self.report
+        report.count('bytes_downloaded', len(response.body), unit=month_display)
+        
+        # Server-rendered markup first, then the embedded Next.js payload
+        with report.stage('extract', unit=month_display):
+            month_rows = self.parse_usage_response(response, month_display)
+            if not month_rows:
+                month_rows = parse_usage_payload(load_next_data(response), month_display)
+                if month_rows:
+                    logging.info(f"Extracted {len(month_rows)} rows for {month_display} from __NEXT_DATA__ payload")
+        report.count('rows_extracted', len(month_rows), unit=month_display)
+        
+        if month_rows:
+            from fixtures import snapshot_page
+            with report.stage('archive', unit=month_display):
+                snapshot_page('usage_stats', month_display, 'all', response.text, response.url, output_dir=self.archive_dir)
+        
+        if not month_rows:
+            logging.warning(f"No usage payload in HTTP response for {month_display}, falling back to Selenium")
+            from spiders.worker_pool import run_off_reactor
+            month_rows = await run_off_reactor(self.scrape_month_fallback, month_id, month_display)
+        
+        self.scraped_data.extend(month_rows)
+        self.flush_scraped_data(unit_key=month_display if month_id else None)
+
+    def scrape_month_fallback(self, month_id, month_display):
+        """HTTP mode: scrape one month (or the current page) in the browser; returns its rows"""
+        with self._browser_lock:
+            self._init_driver()
+            if month_id:
+                return self.scrape_month(month_id, month_display)
+            rate_controller.navigate(self.driver, self.stats_url, self.report)
+            self.wait_for_usage_data()
+            return self.scrape_current_month_data(month_display)
+
+    def scrape_current_month_data(self, month_identifier, cache_url=None):
+        """Scrape data for the currently displayed month across all 4 divs
+
+        With cache_url, a page that yields rows is kept in the page cache under that URL.
+        """
+        try:
+            logging.info(f"Scraping data for month: {month_identifier}")
             
-            # Parse all 4 divs for this month
-            total_characters_found = 0
-            
-            for div_num in range(1, 5):  # div[1] through div[4]
-                xpath = f'/html/body/div[2]/div/article[2]/section/div/div[{div_num}]/ul/li'
-                character_lis = rendered_response.xpath(xpath)
-                
-                if character_lis:
-                    logging.info(f"Found {len(character_lis)} character list items in div[{div_num}] for month {month_identifier}")
-                    self.parse_character_ranking_data(character_lis, div_index=div_num, month=month_identifier)
-                    total_characters_found += len(character_lis)
-                else:
-                    logging.info(f"No character data found in div[{div_num}] for month {month_identifier}")
-            
-            if total_characters_found == 0:
-                logging.warning(f"No character data found for month {month_identifier}")
-            else:
-                logging.info(f"Total characters found for month {month_identifier}: {total_characters_found}")
+            # Get the current page source
+            with self.report.stage('extract'):
+                page_source = self.driver.page_source
+            
+            # Keep the rendered page for offline parser runs and backfills when enabled
+            from fixtures import snapshot_page
+            with self.report.stage('archive'):
+                snapshot_page('usage_stats', month_identifier, 'all', page_source, self.driver.current_url,
+                              output_dir=self.archive_dir)
+            
+            with self.report.stage('extract'):
+                month_rows = self.parse_rendered_page(page_source, month_identifier)
+            
+            if cache_url and month_rows:
+                from page_cache import save_rendered_page
+                with self.report.stage('cache'):
+                    save_rendered_page(cache_url, page_source)
+            return month_rows
                 
         except Exception as e:
             logging.error(f"Error scraping month data for {month_identifier}: {e}")
+            return []
+
+    def parse_rendered_page(self, page_source, month_identifier):
+        """Parse all 4 usage divs from a rendered page source"""
+        # Create a scrapy Response object from the rendered page
+        from scrapy.http import HtmlResponse
+        rendered_response = HtmlResponse(
+            url=self.stats_url,
+            body=page_source.encode('utf-8'),
+            encoding='utf-8'
+        )
+        return self.parse_usage_response(rendered_response, month_identifier)
+
+    def parse_usage_response(self, response, month_identifier):
+        """Parse all 4 usage divs from a rendered or server-side response"""
+        total_characters_found = 0
+        month_rows = []
+        
+        for div_num in range(1, 5):  # div[1] through div[4]
+            character_lis = response.xpath(self.usage_list_xpath.format(div_num=div_num))
+            
+            if character_lis:
+                logging.info(f"Found {len(character_lis)} character list items in div[{div_num}] for month {month_identifier}")
+                month_rows.extend(self.parse_character_ranking_data(character_lis, div_index=div_num, month=month_identifier))
+                total_characters_found += len(character_lis)
+            else:
+                logging.info(f"No character data found in div[{div_num}] for month {month_identifier}")
+        
+        if total_characters_found == 0:
+            logging.warning(f"No character data found for month {month_identifier}")
+        else:
+            logging.info(f"Total characters found for month {month_identifier}: {total_characters_found}")
+        return month_rows
 
             
     def parse_character_ranking_data(self, character_lis, div_index=None, month="unknown"):
         """Parse character ranking data from li elements containing dd values"""
+        from spiders.usage_parser import clean_tokens, parse_usage_item, entry_to_row
+        parsed_rows = []
         try:
-            # Map div indices to Master rank divisions
-            div_to_rank_mapping = {
-                1: 'Master',
-                2: 'High Master', 
-                3: 'Grand Master',
-                4: 'Ultimate Master'
-            }
-            
             for li in character_lis:
-                # Extract all text content from this li element
-                all_text = li.xpath('.//text()').getall()
-                # Clean up the data - remove empty strings and strip whitespace
-                cleaned_text = [text.strip() for text in all_text if text.strip()]
+                # Expected: rank and name, the usage rate and '%' in dd elements, then the change rate
+                # Example tokens: ['3', 'KEN', '5.855', '%', '-2.0%']
+                entry = parse_usage_item(li)
+                if entry is None:
+                    tokens = clean_tokens(li.xpath('.//text()').getall())
+                    if tokens:
+                        logging.debug(f"Could not parse character data from: {tokens}")
+                    continue
                 
-                if cleaned_text:
-                    logging.debug(f"Raw text from li: {cleaned_text}")
-                    
-                    # Parse the character data based on the expected structure
-                    # Expected pattern: [rank, character_name, usage_rate, %, change_rate]
-                    # Example: ['3', 'KEN', '5.855', '%', '-2.0%']
-                    
-                    rank = None
-                    character_name = None
-                    usage_percentage = None
-                    change_rate = None
-                    
-                    # Find rank (should be a digit)
-                    for text in cleaned_text:
-                        if text.isdigit():
-                            rank = text
-                            break
-                    
-                    # Find character name (usually all caps, appears after rank)
-                    for i, text in enumerate(cleaned_text):
-                        if text.isdigit() and i + 1 < len(cleaned_text):
-                            # Next text after rank should be character name
-                            potential_name = cleaned_text[i + 1]
-                            # Character names are typically all caps and may contain dots, dashes, or spaces
-                            if potential_name.isupper() and (potential_name.isalpha() or 
-                                                            '.' in potential_name or 
-                                                            '-' in potential_name or 
-                                                            ' ' in potential_name):
-                                character_name = potential_name
-                                break
-                    
-                    # Find usage percentage (decimal number before %)
-                    for i, text in enumerate(cleaned_text):
-                        if '.' in text and text.replace('.', '').isdigit():
-                            # This should be the usage rate
-                            usage_percentage = text + '%'  # Add % for clarity
-                            break
-                    
-                    # Find change rate (text with % that's not the main usage rate)
-                    # Note: First month (02/2025) may not have change rates
-                    for text in cleaned_text:
-                        if '%' in text and text != '%' and text != usage_percentage:
-                            change_rate = text
-                            break
-                    
-                    # If no change rate found, it might be the first month
-                    if not change_rate:
-                        change_rate = "N/A"  # Mark as N/A for first month
-                    
-                    # Create character data entry if we have minimum required data
-                    if rank and character_name and usage_percentage:
-                        # Map div_index to rank name
-                        rank_name = div_to_rank_mapping.get(div_index, f'Div {div_index}')
-                        
-                        character_data = {
-                            'rank': rank,
-                            'character_name': character_name,
-                            'usage_percentage': usage_percentage,
-                            'change_rate': change_rate,
-                            'month': month,  # Use the passed month parameter
-                            'div_index': div_index,  # Keep original div index
-                            'rank_name': rank_name,  # Add mapped rank name
-                            'source': 'xpath_extraction'
-                        }
-                        
-                        self.scraped_data.append(character_data)
-                        logging.info(f"Extracted from {rank_name} (div[{div_index}]) for {month}: Rank {rank}, {character_name}, {usage_percentage}, Change: {change_rate}")
-                        
-                        # Special logging for first few entries to verify data accuracy
-                        if int(rank) <= 3:
-                            logging.info(f"VERIFICATION - Month {month}, {rank_name}, Rank {rank}: {character_name} = {usage_percentage}, Change: {change_rate}")
-                    else:
-                        logging.debug(f"Could not parse character data from: {cleaned_text}")
-                        logging.debug(f"  Found - Rank: {rank}, Name: {character_name}, Usage: {usage_percentage}")
-                        
-            logging.info(f"Total character data extracted: {len(self.scraped_data)}")
+                character_data = entry_to_row(entry, div_index, month)
+                parsed_rows.append(character_data)
+                logging.debug(f"Extracted from {character_data['rank_name']} (div[{div_index}]) for {month}: "
+                              f"Rank {entry.rank}, {entry.character_name}, {character_data['usage_percentage']}, "
+                              f"Change: {character_data['change_rate']}")
+                
+                # Special logging for first few entries to verify data accuracy
+                if entry.rank <= 3:
+                    logging.info(f"VERIFICATION - Month {month}, {character_data['rank_name']}, Rank {entry.rank}: "
+                                 f"{entry.character_name} = {character_data['usage_percentage']}, Change: {character_data['change_rate']}")
+            
+            logging.info(f"Total character data extracted: {len(parsed_rows)}")
             
         except Exception as e:
             logging.error(f"Failed to parse character ranking data: {e}")
+        return parsed_rows
             
             
+    def get_sink(self):
+        """Get the streaming sink for this run, opening it on first use"""
+        if self.sink is None:
+            from row_sink import open_sink
+            self.sink = open_sink('usage_stats', 'master_usage_stats', USAGE_STATS_FIELDS, 'rank_name',
+                                  resume=self.resume)
+            self.archive_dir = self.sink.output_dir
+        return self.sink
+
+    def flush_scraped_data(self, unit_key=None):
+        """Stream rows parsed since the last flush to disk and drop them from memory
+
+        unit_key (the month label) marks that month complete in the run checkpoint if it has rows.
+        """
+        if self.scraped_data or unit_key:
+            self.get_sink().write_batch(list(self.scraped_data), unit_key=unit_key)
+            self.scraped_data.clear()
+
     def write_to_csv(self):
-        """Write scraped usage rate data to CSV, organized by month"""
-        if not self.scraped_data:
+        """Flush any pending usage rate rows and move the month and combined CSV files into place"""
+        self.flush_scraped_data()
+        if self.sink is None:
             logging.warning("No data to write to CSV")
             return
-            
-        # Group data by month
-        from collections import defaultdict
-        month_data = defaultdict(list)
         
-        for entry in self.scraped_data:
-            month = entry.get('month', 'unknown')
-            month_data[month].append(entry)
-        
-        # Get timestamped output directory
-        from config_manager import get_config
-        import os
-        config = get_config()
-        output_dir = config.get_timestamped_output_dir()
-        
-        # Write separate CSV files for each month
-        for month, data in month_data.items():
-            # Clean month name for filename
-            clean_month = ''.join(c for c in month if c.isalnum() or c in (' ', '-', '_')).strip()
-            clean_month = clean_month.replace(' ', '_')
-            
-            filename = os.path.join(output_dir, f"master_usage_stats_{clean_month}.csv")
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as file:
-                if data:
-                    # Ensure all entries have the same keys
-                    all_keys = set()
-                    for entry in data:
-                        all_keys.update(entry.keys())
-                    
-                    fieldnames = sorted(list(all_keys))
-                    writer = csv.DictWriter(file, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(data)
-                    logging.info(f"Written {len(data)} character stats for {month} to {filename}")
-        
-        # Also write a combined CSV with all months
-        combined_filename = os.path.join(output_dir, "master_usage_stats_all_months.csv")
-        with open(combined_filename, 'w', newline='', encoding='utf-8') as file:
-            if self.scraped_data:
-                # Get all unique fieldnames
-                all_keys = set()
-                for entry in self.scraped_data:
-                    all_keys.update(entry.keys())
-                
-                fieldnames = sorted(list(all_keys))
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.scraped_data)
-                logging.info(f"Written {len(self.scraped_data)} total character stats to {combined_filename}")
+        sink, self.sink = self.sink, None
+        try:
+            sink.commit()
+        except BaseException:
+            sink.abort()
+            raise
+        self.rows_scraped = sink.rows_scraped
+        self.rows_written = sink.rows_written
+        self.failed_units = list(sink.failed_units)
         
-        logging.info(f"Data organized by {len(month_data)} different months/periods")
+        logging.info(f"Data organized by {len(sink.month_counts)} different months/periods")
 
     def close_spider(self, spider):
         """Called when spider is closing - cleanup and final reporting"""
         if self.driver:
-            self.driver.quit()
+            self.close_driver()
             logging.info("Firefox driver closed")
-        logging.info(f"Spider closed. Total characters processed: {len(self.scraped_data)}") 
+        logging.info(f"Spider closed. Total characters processed: {self.rows_scraped + len(self.scraped_data)}")
+
+    def closed(self, reason):
+        """HTTP mode collects rows across callbacks, so write them once the crawl ends"""
+        if self.fetch_mode == 'http':
+            self.write_to_csv()
+        self.close_spider(self)
@@ -0,0 +1,129 @@
+"""
+Single-pass parser for usage rate list items
+Turns one li (its dd values, or else its text tokens) into a typed UsageEntry without rescanning the tokens
+"""
+
+import re
+from collections import namedtuple
+
+from spiders.next_data import LEAGUE_NAMES
+
+# div[1] through div[4] of the usage page, mapped to Master rank divisions
+RANK_NAMES = {index: name for index, name in enumerate(LEAGUE_NAMES, start=1)}
+
+# Digits and dots with at least one dot, e.g. '5.855'
+USAGE_TOKEN = re.compile(r'[0-9.]*\.[0-9.]*')
+NAME_PUNCTUATION = ('.', '-', ' ')
+
+# Typed values plus the original texts, which are what the CSV files keep
+UsageEntry = namedtuple('UsageEntry', ['rank', 'character_name', 'usage', 'change', 'usage_text', 'change_text'])
+
+
+def clean_tokens(texts):
+    """Strip text nodes and drop the empty ones"""
+    tokens = []
+    for text in texts:
+        text = text.strip()
+        if text:
+            tokens.append(text)
+    return tokens
+
+
+def is_character_name(token):
+    # Character names are all caps and may contain dots, dashes or spaces
+    return token.isupper() and (token.isalpha() or any(mark in token for mark in NAME_PUNCTUATION))
+
+
+def is_usage_token(token):
+    return USAGE_TOKEN.fullmatch(token) is not None and any(c.isdigit() for c in token)
+
+
+def to_float(text):
+    try:
+        return float(text.rstrip('%'))
+    except ValueError:
+        return None
+
+
+def _entry(rank_text, character_name, usage_text, change_text):
+    return UsageEntry(
+        rank=int(rank_text),
+        character_name=character_name,
+        usage=to_float(usage_text),
+        change=to_float(change_text) if change_text else None,
+        usage_text=usage_text,
+        change_text=change_text
+    )
+
+
+def parse_usage_tokens(tokens):
+    """Parse [rank, NAME, usage, '%', change] style tokens into a UsageEntry (None if incomplete)
+
+    The usual layout is checked positionally first; anything else goes through one scan that
+    keeps the original rules: rank is the first all-digit token, the name is the first
+    upper-case token directly after a digit token, usage is the first decimal token and the
+    change rate is the first other token containing '%'.
+    """
+    # Fast path: ['3', 'KEN', '5.855', '%'] optionally followed by the change rate
+    count = len(tokens)
+    if (count in (4, 5) and tokens[3] == '%' and tokens[0].isdigit()
+            and is_character_name(tokens[1]) and is_usage_token(tokens[2])):
+        change_text = tokens[4] if count == 5 and '%' in tokens[4] and tokens[4] != tokens[2] + '%' else None
+        return _entry(tokens[0], tokens[1], tokens[2], change_text)
+
+    rank_text = None
+    character_name = None
+    usage_text = None
+    percent_tokens = []
+    previous_is_digit = False
+    for token in tokens:
+        is_digit = token.isdigit()
+        if is_digit:
+            if rank_text is None:
+                rank_text = token
+        elif previous_is_digit and character_name is None and is_character_name(token):
+            character_name = token
+        if usage_text is None and is_usage_token(token):
+            usage_text = token
+        if token != '%' and '%' in token:
+            percent_tokens.append(token)
+        previous_is_digit = is_digit
+
+    if not (rank_text and character_name and usage_text):
+        return None
+
+    usage_percent = usage_text + '%'
+    change_text = next((token for token in percent_tokens if token != usage_percent), None)
+    return _entry(rank_text, character_name, usage_text, change_text)
+
+
+def parse_usage_item(li):
+    """Parse a usage rate li selector into a UsageEntry (None if incomplete)
+
+    Fast path: the usage rate is the li's first dd value (followed by a '%' dd), and the
+    text outside the dd elements is the rank, the name and an optional change rate.
+    Other markup falls back to parse_usage_tokens over all of the li's text.
+    """
+    dd_values = clean_tokens(li.xpath('.//dd/text()').getall())
+    if dd_values and dd_values[1:] in ([], ['%']) and is_usage_token(dd_values[0]):
+        others = clean_tokens(li.xpath('.//text()[not(ancestor::dd)]').getall())
+        count = len(others)
+        if (count in (2, 3) and others[0].isdigit() and is_character_name(others[1])
+                and (count == 2 or ('%' in others[2] and others[2] != dd_values[0] + '%'))):
+            return _entry(others[0], others[1], dd_values[0], others[2] if count == 3 else None)
+    return parse_usage_tokens(clean_tokens(li.xpath('.//text()').getall()))
+
+
+def entry_to_row(entry, div_index, month, source='xpath_extraction'):
+    """Build the usage stats row dict in the CSV's string format"""
+    return {
+        'rank': str(entry.rank),
+        'character_name': entry.character_name,
+        'usage_percentage': entry.usage_text + '%',
+        # First month (02/2025) has no change rates
+        'change_rate': entry.change_text or 'N/A',
+        'month': month,
+        'div_index': div_index,
+        'rank_name': RANK_NAMES.get(div_index, f'Div {div_index}'),
+        'source': source
+    }
@@ -0,0 +1,148 @@
+"""
+Worker pool for parallel month/league scraping
+Each worker owns one headless browser and pulls work items from a shared queue
+"""
+
+import logging
+import queue
+import threading
+from collections import namedtuple
+from urllib.parse import urlparse
+
+# One unit of scraping work: a month page, optionally narrowed to a single league
+WorkItem = namedtuple('WorkItem', ['index', 'url', 'month_code', 'month_name', 'league_index', 'league_name'])
+
+
+class HostConcurrencyLimiter:
+    """Caps the number of workers talking to the same host at once"""
+
+    def __init__(self, per_host_limit):
+        self.per_host_limit = max(1, per_host_limit)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url):
+        """Get the semaphore guarding the host of url"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._semaphores[host]
+
+
+# Global host limiter shared by every worker pool, so concurrent spiders split one per-host cap
+_limiter_instance = None
+_limiter_lock = threading.Lock()
+
+def get_host_limiter() -> HostConcurrencyLimiter:
+    """Get the process-wide host limiter configured from worker_pool.per_host_limit"""
+    global _limiter_instance
+    with _limiter_lock:
+        if _limiter_instance is None:
+            from config_manager import get_config
+            _limiter_instance = HostConcurrencyLimiter(get_config().get_worker_pool_settings()['per_host_limit'])
+        return _limiter_instance
+
+
+class BrowserWorkerPool:
+    """Runs work items across N browser workers and merges their results in item order
+
+    worker_factory() builds a worker (a spider instance holding its own driver) exposing close_driver().
+    handler(worker, item) scrapes one item and returns a list of row dicts.
+    Pools share the process-wide host limiter unless given their own.
+    """
+
+    def __init__(self, worker_factory, handler, num_workers, limiter=None):
+        self.worker_factory = worker_factory
+        self.handler = handler
+        self.num_workers = max(1, num_workers)
+        self.limiter = limiter or get_host_limiter()
+        self.failed_items = []
+
+    def run(self, work_items, on_result=None):
+        """Process all work items and return the merged rows
+
+        If on_result(item, rows) is given, each result is handed to it as soon as it is
+        ready (one call at a time) instead of being kept for the merged return value.
+        """
+        work_queue = queue.Queue()
+        for item in work_items:
+            work_queue.put(item)
+
+        results = {}
+        results_lock = threading.Lock()
+        num_workers = min(self.num_workers, len(work_items)) or 1
+        logging.info(f"Starting worker pool: {num_workers} workers, {len(work_items)} work items, "
+                     f"{self.limiter.per_host_limit} per host")
+
+        threads = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(worker_id, work_queue, results, results_lock, on_result),
+                name=f"sf6-worker-{worker_id}",
+                daemon=True
+            )
+            for worker_id in range(num_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Items left in the queue mean every worker died before finishing
+        while not work_queue.empty():
+            self.failed_items.append(work_queue.get_nowait())
+
+        if self.failed_items:
+            logging.error(f"Worker pool finished with {len(self.failed_items)} failed work items: "
+                          f"{[(item.month_name, item.league_name) for item in self.failed_items]}")
+
+        merged = []
+        for index in sorted(results):
+            merged.extend(results[index])
+        logging.info(f"Worker pool merged {len(merged)} rows from {len(results)} work items")
+        return merged
+
+    def _worker_loop(self, worker_id, work_queue, results, results_lock, on_result):
+        try:
+            worker = self.worker_factory()
+        except Exception as e:
+            logging.error(f"Worker {worker_id} failed to start: {e}")
+            return
+
+        try:
+            while True:
+                try:
+                    item = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                try:
+                    with self.limiter.slot(item.url):
+                        rows = self.handler(worker, item)
+                    with results_lock:
+                        if on_result:
+                            on_result(item, rows)
+                        else:
+                            results[item.index] = rows
+                    logging.info(f"Worker {worker_id} finished {item.month_name} {item.league_name or ''}: {len(rows)} rows")
+                except Exception as e:
+                    logging.error(f"Worker {worker_id} failed on {item.month_name} {item.league_name or ''}: {e}")
+                    with results_lock:
+                        self.failed_items.append(item)
+        finally:
+            try:
+                worker.close_driver()
+            except Exception as e:
+                logging.warning(f"Worker {worker_id} failed to close cleanly: {e}")
+
+
+async def run_off_reactor(func, *args, **kwargs):
+    """Await a blocking browser session from a Scrapy callback without stalling the reactor
+
+    The call runs in the reactor's thread pool, so other spiders crawled by the same
+    process keep making progress while it drives Firefox.
+    """
+    from twisted.internet import threads
+    from scrapy.utils.defer import maybe_deferred_to_future
+    return await maybe_deferred_to_future(threads.deferToThread(func, *args, **kwargs))
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Buckler stats pages
+Serves synthetic usagerate_master and dia_master pages with the DOM structure the spiders target
+"""
+
+import argparse
+import html
+import json
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from spiders.fighting_stats_spider import DEFAULT_CHARACTER_ORDER
+from spiders.next_data import LEAGUE_NAMES
+
+STATS_PATH = '/6/buckler/stats'
+PAGE_PATTERN = re.compile(rf'^{STATS_PATH}/(usagerate_master|dia_master)(?:/(\d{{6}}))?/?$')
+
+# Re-renders the matchup table when a league is clicked, like the real page
+LEAGUE_SWITCH_SCRIPT = """
+var LEAGUE_ROWS = %s;
+function renderLeague(index) {
+    var rows = LEAGUE_ROWS[index];
+    var html = '';
+    for (var i = 0; i < rows.length; i++) {
+        html += '<tr><th><div><span>' + rows[i].name + '</span></div></th>';
+        for (var j = 0; j < rows[i].cells.length; j++) {
+            html += '<td>' + rows[i].cells[j] + '</td>';
+        }
+        html += '</tr>';
+    }
+    document.querySelector('#tableArea table tbody').innerHTML = html;
+    var items = document.querySelectorAll('#leagues li');
+    for (var k = 0; k < items.length; k++) {
+        items[k].className = k === index ? 'active' : '';
+    }
+}
+document.querySelectorAll('#leagues li').forEach(function (li, index) {
+    li.addEventListener('click', function () { setTimeout(function () { renderLeague(index); }, %d); });
+});
+"""
+
+
+def character_names(count):
+    """Real roster first, then synthetic upper-case names the usage parser accepts"""
+    names = [name.upper() for name in DEFAULT_CHARACTER_ORDER[:count]]
+    names.extend(f"FIGHTER {index}" for index in range(len(names) + 1, count + 1))
+    return names
+
+
+def month_ids(count, newest=None):
+    """The `count` most recent YYYYMM ids ending at newest (default: the current month)"""
+    newest = newest or datetime.now().strftime('%Y%m')
+    year, month = int(newest[:4]), int(newest[4:])
+    ids = []
+    for _ in range(count):
+        ids.append(f"{year}{month:02d}")
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return ids
+
+
+class StubSite:
+    """Deterministic synthetic Buckler data plus latency and error injection"""
+
+    def __init__(self, months=5, characters=26, latency=0.0, jitter=0.0, error_rate=0.0,
+                 render_delay_ms=50, seed=6):
+        self.months = month_ids(months)
+        self.characters = character_names(characters)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.render_delay_ms = render_delay_ms
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.requests_served = 0
+        self.errors_served = 0
+
+    def delay(self):
+        if self.latency or self.jitter:
+            with self._random_lock:
+                extra = self._random.uniform(0, self.jitter)
+            time.sleep(self.latency + extra)
+
+    def should_fail(self):
+        """Count a request and decide whether it gets an injected error"""
+        with self._random_lock:
+            self.requests_served += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors_served += 1
+            return failed
+
+    @lru_cache(maxsize=None)
+    def usage_shares(self, month_id, league_index):
+        """Usage percentage per character, summing to 100"""
+        rng = random.Random(f"{self.seed}-usage-{month_id}-{league_index}")
+        weights = [rng.uniform(0.5, 3.0) for _ in self.characters]
+        total = sum(weights)
+        return {name: round(100 * weight / total, 3) for name, weight in zip(self.characters, weights)}
+
+    def usage_rows(self, month_id, league_index):
+        shares = self.usage_shares(month_id, league_index)
+        previous_index = self.months.index(month_id) + 1
+        previous = self.usage_shares(self.months[previous_index], league_index) if previous_index < len(self.months) else None
+
+        rows = []
+        for rank, (name, share) in enumerate(sorted(shares.items(), key=lambda item: -item[1]), start=1):
+            change = f"{share - previous[name]:+.1f}%" if previous else None
+            rows.append({'rank': rank, 'name': name, 'usage': f"{share:.3f}", 'change': change})
+        return rows
+
+    @lru_cache(maxsize=None)
+    def matchup_rows(self, month_id, league_index):
+        """Matchup table rows: total column, then one antisymmetric value per opponent"""
+        rng = random.Random(f"{self.seed}-matchup-{month_id}-{league_index}")
+        count = len(self.characters)
+        values = [[0.0] * count for _ in range(count)]
+        for i in range(count):
+            for j in range(i + 1, count):
+                values[i][j] = round(rng.uniform(-8, 8), 3)
+                values[j][i] = -values[i][j]
+
+        rows = []
+        for i, name in enumerate(self.characters):
+            cells = [f"{sum(values[i]) / max(1, count - 1):.3f}"]
+            cells.extend('-' if i == j else f"{values[i][j]:.3f}" for j in range(count))
+            rows.append({'name': name, 'cells': cells})
+        return rows
+
+    def month_aside(self, page):
+        links = ''.join(
+            f'<a href="{STATS_PATH}/{page}/{month_id}">{month_id[4:]}/{month_id[:4]}</a>'
+            for month_id in self.months
+        )
+        return f'<aside><div><section>{links}</section></div></aside>'
+
+    def layout(self, title, article_id, content):
+        # body > div[2] > div > article[2] is the path both spiders' XPaths walk
+        return (
+            f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(title)}</title></head>'
+            f'<body><div id="loader"></div><div id="__next"><div>'
+            f'<article><header>Buckler stub</header></article>'
+            f'<article id="{article_id}">{content}</article>'
+            f'</div></div></body></html>'
+        )
+
+    def usage_page(self, month_id):
+        divs = []
+        for league_index in range(len(LEAGUE_NAMES)):
+            items = ''.join(
+                f'<li><span>{row["rank"]}</span><span>{html.escape(row["name"])}</span>'
+                f'<dl><dd>{row["usage"]}</dd><dd>%</dd></dl>'
+                + (f'<span>{row["change"]}</span>' if row['change'] else '')
+                + '</li>'
+                for row in self.usage_rows(month_id, league_index)
+            )
+            divs.append(f'<div><h3>{LEAGUE_NAMES[league_index]}</h3><ul>{items}</ul></div>')
+        content = self.month_aside('usagerate_master') + f'<section><div>{"".join(divs)}</div></section>'
+        return self.layout(f"Usage rate {month_id}", 'usagerate', content)
+
+    def fighting_page(self, month_id):
+        league_rows = [self.matchup_rows(month_id, league_index) for league_index in range(len(LEAGUE_NAMES))]
+        leagues = ''.join(
+            ('<li class="active">' if index == 0 else '<li>') + f'{name}</li>'
+            for index, name in enumerate(LEAGUE_NAMES)
+        )
+        headers = '<th></th><th>TOTAL</th>' + ''.join(
+            f'<th><img alt="{html.escape(name)}" src=""></th>' for name in self.characters
+        )
+        body = ''.join(
+            f'<tr><th><div><span>{html.escape(row["name"])}</span></div></th>'
+            + ''.join(f'<td>{cell}</td>' for cell in row['cells'])
+            + '</tr>'
+            for row in league_rows[0]
+        )
+        script = LEAGUE_SWITCH_SCRIPT % (json.dumps(league_rows), self.render_delay_ms)
+        content = (
+            self.month_aside('dia_master')
+            + f'<aside id="leagues"><ul>{leagues}</ul></aside>'
+            + f'<div id="tableArea"><div><table><thead><tr>{headers}</tr></thead><tbody>{body}</tbody></table></div></div>'
+            + f'<script>{script}</script>'
+        )
+        return self.layout(f"Fighting stats {month_id}", 'dia', content)
+
+    def render(self, path):
+        """Get the page for a request path, or None if it is not a stats page"""
+        match = PAGE_PATTERN.match(path.split('?')[0])
+        if not match:
+            return None
+        page, month_id = match.groups()
+        month_id = month_id or self.months[0]
+        if month_id not in self.months:
+            return None
+        return self.usage_page(month_id) if page == 'usagerate_master' else self.fighting_page(month_id)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        site = self.server.site
+        site.delay()
+
+        if site.should_fail():
+            self.send_error(503, "Injected error")
+            return
+
+        page = site.render(self.path)
+        if page is None:
+            self.send_error(404, "Not a stats page")
+            return
+
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"stub {self.address_string()} {format % args}")
+
+
+def start_stub_server(site, host='127.0.0.1', port=0):
+    """Serve site from a background thread; port 0 picks a free port (see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.site = site
+    thread = threading.Thread(target=server.serve_forever, name='buckler-stub', daemon=True)
+    thread.start()
+    logging.info(f"Buckler stub serving {len(site.months)} months x {len(site.characters)} characters "
+                 f"on http://{server.server_address[0]}:{server.server_address[1]}")
+    return server
+
+
+def stub_urls(server):
+    """The config 'urls' section pointing the spiders at a running stub"""
+    host, port = server.server_address[:2]
+    base = f"http://{host}:{port}{STATS_PATH}"
+    return {
+        'fighting_stats_base': f"{base}/dia_master",
+        'usage_stats_base': f"{base}/usagerate_master"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Buckler stats pages for offline load testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8606)
+    parser.add_argument('--months', type=int, default=5, help="Number of months, ending at the current month")
+    parser.add_argument('--characters', type=int, default=26, help="Characters per league table and usage list")
+    parser.add_argument('--latency', type=float, default=0.0, help="Fixed response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument('--render-delay-ms', type=int, default=50, help="Delay before a league click re-renders the table")
+    parser.add_argument('--seed', type=int, default=6)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    site = StubSite(
+        months=args.months, characters=args.characters, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, render_delay_ms=args.render_delay_ms, seed=args.seed
+    )
+    server = start_stub_server(site, args.host, args.port)
+    print("Add this to config.json to point the spiders at the stub:")
+    print(json.dumps({'urls': stub_urls(server)}, indent=2))
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        logging.info(f"Stub stopped after {site.requests_served} requests ({site.errors_served} injected errors)")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Consolidated time-series store for SF6 Analysis project
+Keeps one versioned copy of every (dataset, month, league, character, opponent) value in SQLite
+"""
+
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from manifest import month_code, VOLATILE_FIELDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    dataset TEXT NOT NULL,
+    month_code TEXT NOT NULL,
+    league TEXT NOT NULL,
+    character TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (dataset, month_code, league, character, opponent, scraped_at)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS latest (
+    dataset TEXT NOT NULL,
+    month_code TEXT NOT NULL,
+    league TEXT NOT NULL,
+    character TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (dataset, month_code, league, character, opponent)
+) WITHOUT ROWID;
+"""
+
+KEY_COLUMNS = ('dataset', 'month_code', 'league', 'character', 'opponent')
+
+
+def row_key(dataset: str, row: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+    """(dataset, month_code, league, character, opponent) for a fighting stats or usage stats row"""
+    if dataset == 'fighting_stats':
+        # Rows of the matchup table are the character, columns the opponent (or TOTAL)
+        return (dataset, month_code(row.get('month', 'unknown')), str(row.get('league')),
+                str(row.get('row_type')), str(row.get('character_name')))
+    return (dataset, month_code(row.get('month', 'unknown')), str(row.get('rank_name')),
+            str(row.get('character_name')), '')
+
+
+def row_payload(row: Dict[str, Any]) -> str:
+    """Canonical JSON of a row's content (extraction details like 'source' don't make a new version)"""
+    return json.dumps({k: str(v) for k, v in row.items() if k not in VOLATILE_FIELDS}, sort_keys=True)
+
+
+class TimeSeriesStore:
+    """Versioned, deduplicated store of scraped values
+
+    upsert_rows() only adds a version when a key's content differs from its latest version,
+    so re-scraping unchanged months costs no space. latest() and as_of() read the data back
+    as row dicts with a scraped_at column.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Pool workers hand batches over from their own threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def upsert_rows(self, dataset: str, rows: List[Dict[str, Any]], scraped_at: str = None) -> Tuple[int, int]:
+        """Add a version for every row whose content changed; returns (new_versions, unchanged)"""
+        if not rows:
+            return 0, 0
+        scraped_at = scraped_at or datetime.now().isoformat(timespec='seconds')
+
+        incoming = {}
+        for row in rows:
+            incoming[row_key(dataset, row)] = row_payload(row)
+        partitions = sorted(set((key[1], key[2]) for key in incoming))
+
+        with self._lock, self._conn:
+            current = {}
+            for partition_month, league in partitions:
+                cursor = self._conn.execute(
+                    "SELECT dataset, month_code, league, character, opponent, payload FROM latest "
+                    "WHERE dataset = ? AND month_code = ? AND league = ?",
+                    (dataset, partition_month, league)
+                )
+                for *key, payload in cursor:
+                    current[tuple(key)] = payload
+
+            changed = [(*key, scraped_at, payload) for key, payload in incoming.items() if current.get(key) != payload]
+            if changed:
+                self._conn.executemany("INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?, ?, ?)", changed)
+                self._conn.executemany("INSERT OR REPLACE INTO latest VALUES (?, ?, ?, ?, ?, ?, ?)", changed)
+
+        logging.info(f"Time-series store: {len(changed)} new {dataset} versions, {len(incoming) - len(changed)} unchanged")
+        return len(changed), len(incoming) - len(changed)
+
+    def _filters(self, dataset: str, month: Optional[str], league: Optional[str], alias: str = ''):
+        clauses = [f"{alias}dataset = ?"]
+        params = [dataset]
+        if month:
+            clauses.append(f"{alias}month_code = ?")
+            params.append(month_code(month))
+        if league:
+            clauses.append(f"{alias}league = ?")
+            params.append(league)
+        return ' AND '.join(clauses), params
+
+    def _rows(self, cursor) -> List[Dict[str, Any]]:
+        return [{**json.loads(payload), 'scraped_at': scraped_at} for scraped_at, payload in cursor]
+
+    def latest(self, dataset: str, month: str = None, league: str = None) -> List[Dict[str, Any]]:
+        """Newest version of every value, optionally for one month (MM/YYYY or YYYYMM) and league"""
+        where, params = self._filters(dataset, month, league)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT scraped_at, payload FROM latest WHERE {where} "
+                "ORDER BY month_code, league, character, opponent", params
+            )
+            return self._rows(cursor)
+
+    def as_of(self, dataset: str, timestamp: str, month: str = None, league: str = None) -> List[Dict[str, Any]]:
+        """Every value as it was known at timestamp (ISO format)"""
+        where, params = self._filters(dataset, month, league)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"""
+                SELECT v.scraped_at, v.payload FROM versions v
+                JOIN (
+                    SELECT dataset, month_code, league, character, opponent, MAX(scraped_at) AS scraped_at
+                    FROM versions WHERE {where} AND scraped_at <= ?
+                    GROUP BY dataset, month_code, league, character, opponent
+                ) newest USING (dataset, month_code, league, character, opponent, scraped_at)
+                ORDER BY v.month_code, v.league, v.character, v.opponent
+                """, params + [timestamp]
+            )
+            return self._rows(cursor)
+
+    def history(self, dataset: str, month: str, league: str, character: str, opponent: str = '') -> List[Dict[str, Any]]:
+        """All versions of one value, oldest first"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT scraped_at, payload FROM versions WHERE dataset = ? AND month_code = ? AND league = ? "
+                "AND character = ? AND opponent = ? ORDER BY scraped_at",
+                (dataset, month_code(month), league, character, opponent)
+            )
+            return self._rows(cursor)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'versions': self._conn.execute("SELECT COUNT(*) FROM versions").fetchone()[0],
+                'latest': self._conn.execute("SELECT COUNT(*) FROM latest").fetchone()[0]
+            }
+
+
+# Global store instance
+_store_instance = None
+_store_lock = threading.Lock()
+
+def get_timeseries_store() -> Optional[TimeSeriesStore]:
+    """Get the global time-series store, or None when it is disabled in config"""
+    global _store_instance
+    from config_manager import get_config
+    settings = get_config().get_timeseries_settings()
+    if not settings['enabled']:
+        return None
+    with _store_lock:
+        if _store_instance is None:
+            _store_instance = TimeSeriesStore(settings['path'])
+        return _store_instance
+
+
+def write_to_timeseries(dataset: str, rows: List[Dict[str, Any]]) -> None:
+    """Upsert rows into the time-series store if enabled, logging (not raising) failures"""
+    try:
+        store = get_timeseries_store()
+        if store:
+            store.upsert_rows(dataset, rows)
+    except Exception as e:
+        logging.error(f"Error writing {dataset} to time-series store: {e}")
+
+
+def folder_timestamp(run_dir: str) -> str:
+    """scraped_at for a master_dataDDMonYYYY folder, falling back to its modification time"""
+    name = os.path.basename(os.path.normpath(run_dir))
+    try:
+        return datetime.strptime(name[len('master_data'):], '%d%b%Y').isoformat(timespec='seconds')
+    except ValueError:
+        return datetime.fromtimestamp(os.path.getmtime(run_dir)).isoformat(timespec='seconds')
+
+
+def import_output_folders(store: TimeSeriesStore, base_output_dir: str) -> None:
+    """Load every master_data* folder's combined CSVs, oldest first, keeping only changed values"""
+    from config_manager import get_config
+    prefixes = {'fighting_stats': 'fighting_stats', 'usage_stats': 'master_usage_stats'}
+    prefixes.update(get_config().get('output', 'file_prefix', {}))
+
+    runs = sorted(
+        (path for path in glob.glob(os.path.join(base_output_dir, 'master_data*')) if os.path.isdir(path)),
+        key=folder_timestamp
+    )
+    for run_dir in runs:
+        scraped_at = folder_timestamp(run_dir)
+        for dataset, prefix in prefixes.items():
+            path = os.path.join(run_dir, f"{prefix}_all_months.csv")
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            added, unchanged = store.upsert_rows(dataset, rows, scraped_at=scraped_at)
+            logging.info(f"Imported {path}: {added} new versions, {unchanged} unchanged")
+
+
+def export_latest(store: TimeSeriesStore, dataset: str, path: str) -> int:
+    """Write the latest version of a dataset to one CSV"""
+    rows = store.latest(dataset)
+    fieldnames = sorted(set(key for row in rows for key in row))
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidated, versioned store of SF6 scrape results")
+    parser.add_argument('--path', help="SQLite file (default: timeseries.path from config)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('import', help="Import every master_data* output folder, oldest first")
+    export_parser = subparsers.add_parser('export', help="Write the latest values of a dataset to CSV")
+    export_parser.add_argument('dataset', choices=['fighting_stats', 'usage_stats'])
+    export_parser.add_argument('output')
+    subparsers.add_parser('stats', help="Show version and key counts")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from config_manager import get_config
+    config = get_config()
+    store = TimeSeriesStore(args.path or config.get_timeseries_settings()['path'])
+
+    if args.command == 'import':
+        import_output_folders(store, config.get_output_dir())
+    elif args.command == 'export':
+        count = export_latest(store, args.dataset, args.output)
+        logging.info(f"Exported {count} latest {args.dataset} rows to {args.output}")
+    print(json.dumps(store.stats()))
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())